@@ -0,0 +1,22 @@
+"""
+Grid building in autotrade.get_result_pair.
+"""
+from binance_f import autotrade
+
+
+class TimeResultPair:
+    params = [4, 20, 100]
+
+    def time_get_result_pair(self, pair):
+        autotrade.get_result_pair(
+            entry_price=9700.0,
+            minimum_trades=20,
+            pair=pair,
+            last_price=9650.0,
+            _range=25,
+            leverage=125,
+            maximum_size=pair * 0.05 + 1,
+            current_size=0.2,
+            kind="long",
+            trade_size=0.05,
+        )
@@ -0,0 +1,46 @@
+"""
+Market data bus: publishing decoded updates into shared memory and reading them
+back on the consumer side.
+"""
+import os
+
+from binance_f.marketdatabus import MarketDataBus, MarketDataPublisher
+from binance_f.model import AggregateTradeEvent, SymbolBookTickerEvent
+
+
+class TimeMarketDataBus:
+    def setup(self):
+        self.publisher = MarketDataPublisher(
+            ["BTCUSDT", "ETHUSDT"], name="bench_bus_" + str(os.getpid()), ring_capacity=4096,
+            replace=True,
+        )
+        self.bus = MarketDataBus(self.publisher.name)
+        self.ticker = SymbolBookTickerEvent()
+        self.ticker.symbol = "BTCUSDT"
+        self.ticker.orderBookUpdateId = 400900217
+        self.ticker.bestBidPrice, self.ticker.bestBidQty = 25.3519, 31.21
+        self.ticker.bestAskPrice, self.ticker.bestAskQty = 25.3652, 40.66
+        self.trade = AggregateTradeEvent()
+        self.trade.symbol = "ETHUSDT"
+        self.trade.id, self.trade.firstId, self.trade.lastId = 5933014, 100, 105
+        self.trade.price, self.trade.qty = 0.001, 100.0
+        self.trade.time = self.trade.eventTime = 123456785
+        self.publisher.publish_book_ticker(self.ticker)
+
+    def teardown(self):
+        self.bus.close()
+        self.publisher.close()
+
+    def time_publish_book_ticker(self):
+        self.publisher.publish_book_ticker(self.ticker)
+
+    def time_read_book_ticker_values(self):
+        self.bus.book_ticker_values("BTCUSDT")
+
+    def time_read_book_ticker(self):
+        self.bus.book_ticker("BTCUSDT")
+
+    def time_publish_and_read_100_trades(self):
+        for _ in range(100):
+            self.publisher.publish_trade(self.trade)
+        self.bus.read_trades()
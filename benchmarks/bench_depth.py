@@ -0,0 +1,24 @@
+"""
+Depth event parsing at 20, 100 and 1000 levels per side.
+"""
+from binance_f.impl.utils import parse_json_from_string
+from binance_f.model import DiffDepthEvent, OrderBookEvent
+
+from benchmarks import payloads
+
+
+class TimeDepthEvent:
+    params = [20, 100, 1000]
+
+    def setup(self, levels):
+        self.text = payloads.depth_event(levels)
+        self.wrapper = parse_json_from_string(self.text)
+
+    def time_order_book_event(self, levels):
+        OrderBookEvent.json_parse(parse_json_from_string(self.text))
+
+    def time_diff_depth_event(self, levels):
+        DiffDepthEvent.json_parse(parse_json_from_string(self.text))
+
+    def time_model_only(self, levels):
+        DiffDepthEvent.json_parse(self.wrapper)
@@ -0,0 +1,88 @@
+"""
+WebsocketConnection.on_message dispatch: decode, parse and callback for one frame.
+"""
+import queue
+
+from binance_f.impl.websocketconnection import WebsocketConnection
+from binance_f.impl.websocketrequestimpl import WebsocketRequestImpl
+
+from benchmarks import payloads
+
+
+def noop(*args):
+    pass
+
+
+class TimeOnMessage:
+    params = ["aggregate_trade", "candlestick", "depth20"]
+
+    def setup(self, name):
+        impl = WebsocketRequestImpl("api-key")
+        requests = {
+            "aggregate_trade": (impl.subscribe_aggregate_trade_event("btcusdt", noop),
+                                payloads.AGGREGATE_TRADE_EVENT),
+            "candlestick": (impl.subscribe_candlestick_event("btcusdt", "1m", noop),
+                            payloads.CANDLESTICK_EVENT),
+            "depth20": (impl.subscribe_diff_depth_event("btcusdt", "", noop),
+                        payloads.depth_event(20)),
+        }
+        request, self.message = requests[name]
+        self.connection = WebsocketConnection(None, None, None, None, request)
+
+    def time_on_message(self, name):
+        self.connection.on_message(self.message)
+
+
+
+class TimeBatchDelivery:
+    """
+    100 aggTrade frames through on_message, one callback per frame against one per
+    batch of 100 (list or columns). The consumer either sums quantities in place
+    or hands its input to a strategy thread through a queue.Queue.
+    """
+    params = [
+        mode + ":" + consumer
+        for consumer in ("sum", "queue")
+        for mode in ("per_frame", "batch_list", "batch_columns")
+    ]
+
+    def setup(self, name):
+        mode, consumer = name.split(":")
+        self.total = 0.0
+        self.queue = queue.Queue()
+        impl = WebsocketRequestImpl("api-key")
+        callback = getattr(self, "on_" + ("event" if mode == "per_frame" else mode) + "_" + consumer)
+        request = impl.subscribe_aggregate_trade_event("btcusdt", callback)
+        if mode != "per_frame":
+            request.batch_size = 100
+            request.batch_interval_us = 10 ** 7
+            request.batch_columns = mode == "batch_columns"
+        self.connection = WebsocketConnection(None, None, None, None, request)
+        self.message = payloads.AGGREGATE_TRADE_EVENT
+
+    def teardown(self, name):
+        if self.connection.batcher is not None:
+            self.connection.batcher.close()
+
+    def on_event_sum(self, data_type, event):
+        self.total += event.qty
+
+    def on_batch_list_sum(self, data_type, events):
+        self.total += sum(event.qty for event in events)
+
+    def on_batch_columns_sum(self, data_type, columns):
+        self.total += sum(columns["qty"])
+
+    def on_event_queue(self, data_type, event):
+        self.queue.put(event)
+
+    on_batch_list_queue = on_batch_columns_queue = on_event_queue
+
+    def time_on_message_100(self, name):
+        on_message = self.connection.on_message
+        message = self.message
+        for _ in range(100):
+            on_message(message)
+        # Stand-in for the strategy thread.
+        while not self.queue.empty():
+            self.queue.get_nowait()
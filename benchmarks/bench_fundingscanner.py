@@ -0,0 +1,41 @@
+"""
+FundingScanner: one !markPrice@arr frame for 300 symbols written into the
+NumPy columns against a MarkPriceEvent per symbol, and screening queries.
+"""
+import json
+
+from binance_f.fundingscanner import FundingScanner
+from binance_f.impl.utils import parse_json_from_string
+from binance_f.model import MarkPriceEvent
+
+START = 1700000000000
+
+
+def mark_price_frame(count):
+    return json.dumps([
+        {"e": "markPriceUpdate", "E": START, "s": "S%03dUSDT" % i,
+         "p": "%.8f" % (100.0 + i), "i": "%.8f" % (100.0 + i * 0.999),
+         "P": "%.8f" % (100.0 + i), "r": "%.8f" % ((i % 41 - 20) * 0.00001),
+         "T": START + 28800000}
+        for i in range(count)
+    ])
+
+
+class TimeFundingScanner:
+    def setup(self):
+        self.wrapper = parse_json_from_string(mark_price_frame(300))
+        self.scanner = FundingScanner()
+        self.scanner.parse(self.wrapper)
+
+    def time_parse_into_scanner(self):
+        self.scanner.parse(self.wrapper)
+
+    def time_parse_event_objects(self):
+        for item in self.wrapper.convert_2_array().get_items():
+            MarkPriceEvent.json_parse(item)
+
+    def time_top_10_funding(self):
+        self.scanner.top(10, "annualized_funding", absolute=True)
+
+    def time_where_premium(self):
+        self.scanner.where("premium", above=0.0001)
@@ -0,0 +1,81 @@
+"""
+Compare the AsyncRequestClient transports against the local stand-in server:
+a new httpx client per call, the shared HTTP/1.1 pool and HTTP/2 multiplexing.
+
+    python -m benchmarks.bench_http2
+    python -m benchmarks.bench_http2 --requests 2000 --burst 50 --latency 0.02
+
+Each round fires `burst` signed GET /fapi/v1/openOrders calls with asyncio.gather,
+the way HelperMixin.create_bulk_trades fans out orders, and reports latency,
+throughput and how many TCP connections the transport opened.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.loadtest import report
+from binance_f import AsyncRequestClient
+from benchmarks.fakeserver import FakeBinanceServer
+from binance_f.impl.httpsession import AsyncHttpSession
+
+
+class PerCallSession(AsyncHttpSession):
+    """The transport before the shared pool: one AsyncClient per request."""
+
+    async def request(self, request, timeout):
+        self.stats.requests += 1
+        self.stats.connections_opened += 1
+        async with httpx.AsyncClient(base_url=request.host, timeout=timeout) as client:
+            response = await client.request(request.method, request.url, headers=request.header)
+        self.stats.http_versions[response.http_version] += 1
+        return response
+
+
+async def run_mode(server, session, requests, burst):
+    client = AsyncRequestClient(
+        api_key=server.api_key, secret_key=server.secret_key, url=server.url,
+        debug=False, session=session,
+    )
+    latencies = list()
+
+    async def one():
+        start = time.perf_counter()
+        await client.get_open_orders("BTCUSDT")
+        latencies.append(time.perf_counter() - start)
+
+    await one()
+    del latencies[:]
+    start = time.perf_counter()
+    for _ in range(max(1, requests // burst)):
+        await asyncio.gather(*[one() for _ in range(burst)])
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="seconds of artificial server latency per response")
+    args = parser.parse_args()
+
+    server = FakeBinanceServer(weight_limit=10 ** 9, latency=args.latency).start_in_thread()
+    modes = [("per-call client", PerCallSession()), ("HTTP/1.1 pool", AsyncHttpSession())]
+    try:
+        modes.append(("HTTP/2", AsyncHttpSession(http2=True)))
+    except Exception as e:
+        print("HTTP/2 skipped: " + str(e))
+    for name, session in modes:
+        latencies, elapsed = asyncio.run(run_mode(server, session, args.requests, args.burst))
+        report(name, "burst=" + str(args.burst), latencies, elapsed)
+        print("%-22s connections=%d versions=%s" % (
+            "", session.stats.connections_opened, dict(session.stats.http_versions)))
+    server.stop_thread()
+
+
+if __name__ == "__main__":
+    main()
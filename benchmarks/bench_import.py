@@ -0,0 +1,102 @@
+"""
+Cold start of the package, measured in a fresh interpreter with -X importtime.
+
+    python -m benchmarks.bench_import                  # report and check the budget
+    python -m benchmarks.bench_import --budget-ms 40
+
+The check fails (exit status 1) when an import goes over its budget or when a
+bare "import binance_f" loads one of the heavy optional dependencies again.
+"""
+import argparse
+import subprocess
+import sys
+
+STATEMENTS = {
+    "binance_f": "import binance_f",
+    "RequestClient": "from binance_f import RequestClient",
+    "AsyncRequestClient": "from binance_f import AsyncRequestClient",
+    "SubscriptionClient": "from binance_f import SubscriptionClient",
+}
+
+# Cumulative microseconds reported by -X importtime for the binance_f modules.
+BUDGETS_US = {
+    "binance_f": 10000,
+    "RequestClient": 60000,
+    "AsyncRequestClient": 100000,
+    "SubscriptionClient": 100000,
+}
+
+HEAVY_MODULES = ("requests", "httpx", "websocket", "apscheduler", "asyncio")
+
+
+def import_time(statement):
+    """
+    Sum of the top level cumulative times of every module imported by the
+    statement itself, leaving out what the interpreter loads at startup.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        stderr=subprocess.PIPE, check=True,
+    ).stderr.decode()
+    startup = {line.split("|")[2].strip() for line in output.splitlines() if "|" in line}
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE, check=True,
+    ).stderr.decode()
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or name.strip() in startup:
+            # Nested import (counted by its parent) or part of interpreter startup.
+            continue
+        if cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total
+
+
+def loaded_modules(statement):
+    code = statement + "; import sys; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    ).stdout.decode()
+    return set(output.split())
+
+
+class TimeColdImport:
+    params = sorted(STATEMENTS)
+
+    def time_import(self, name):
+        subprocess.run([sys.executable, "-c", STATEMENTS[name]], check=True)
+
+
+def check(budget_scale=1.0, binance_f_budget_ms=None):
+    failures = list()
+    for name, statement in STATEMENTS.items():
+        budget = BUDGETS_US[name] * budget_scale
+        if name == "binance_f" and binance_f_budget_ms is not None:
+            budget = binance_f_budget_ms * 1000
+        spent = min(import_time(statement) for _ in range(3))
+        status = "ok" if spent <= budget else "OVER"
+        print("%-20s %8.1fms budget %8.1fms %s" % (name, spent / 1000.0, budget / 1000.0, status))
+        if spent > budget:
+            failures.append(name)
+    heavy = [module for module in HEAVY_MODULES if module in loaded_modules("import binance_f")]
+    if heavy:
+        print("import binance_f loads " + ", ".join(heavy))
+        failures.append("heavy modules")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, help="budget for a bare import binance_f")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. 2 on a slow CI machine")
+    args = parser.parse_args()
+    return 1 if check(args.scale, args.budget_ms) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+IndicatorSet: seeding from history and the per-update cost, which should not
+grow with the history length.
+"""
+import random
+
+from binance_f.indicators import ATR, EMA, RSI, SMA, VWAP, IndicatorSet
+from binance_f.model.candlestickevent import Candlestick
+
+
+def candlesticks(count):
+    random.seed(count)
+    result = list()
+    price = 100.0
+    for i in range(count):
+        bar = Candlestick()
+        bar.symbol = "BTCUSDT"
+        bar.interval = "1m"
+        bar.startTime = i * 60000
+        bar.closeTime = bar.startTime + 59999
+        bar.open = price
+        price += random.gauss(0, 1)
+        bar.high = max(bar.open, price) + random.random()
+        bar.low = min(bar.open, price) - random.random()
+        bar.close = price
+        bar.volume = random.random() * 10
+        bar.isClosed = True
+        result.append(bar)
+    return result
+
+
+def indicator_set():
+    return IndicatorSet(
+        "BTCUSDT", "1m",
+        sma=SMA(50), ema=EMA(21), rsi=RSI(14), atr=ATR(14), vwap=VWAP(window=200),
+    )
+
+
+class TimeIndicators:
+    params = [100, 1000, 10000]
+
+    def setup(self, history):
+        self.history = candlesticks(history + 100)
+        self.seeded = indicator_set()
+        self.seeded.seed(self.history[:history], now=10 ** 15)
+        self.live = self.history[history:]
+
+    def time_seed(self, history):
+        indicator_set().seed(self.history, now=10 ** 15)
+
+    def time_update_100_bars(self, history):
+        for bar in self.live:
+            bar.isClosed = False
+            self.seeded.on_candlestick(bar)
+            bar.isClosed = True
+            self.seeded.on_candlestick(bar)
+        self.seeded.last_start = self.live[0].startTime - 1
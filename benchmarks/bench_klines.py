@@ -0,0 +1,63 @@
+"""
+KlineAggregator updates: one 1m kline or one aggregate trade folded into every
+higher interval.
+"""
+from binance_f.klineaggregator import KlineAggregator
+from binance_f.model import AggregateTradeEvent
+from binance_f.model.candlestickevent import Candlestick
+
+START = 1700000000000 - 1700000000000 % 60000
+
+
+def noop(candlestick):
+    pass
+
+
+def klines(count):
+    result = list()
+    for i in range(count):
+        for closed in (False, True):
+            bar = Candlestick()
+            bar.symbol = "BTCUSDT"
+            bar.interval = "1m"
+            bar.startTime = START + i * 60000
+            bar.closeTime = bar.startTime + 59999
+            bar.open, bar.high, bar.low, bar.close = 100.0, 101.0, 99.0, 100.5
+            bar.volume = 1.0
+            bar.numTrades = 10
+            bar.isClosed = closed
+            result.append(bar)
+    return result
+
+
+def trades(count):
+    result = list()
+    for i in range(count):
+        trade = AggregateTradeEvent()
+        trade.symbol = "BTCUSDT"
+        trade.time = START + i * 250
+        trade.price = 100.0 + i % 13
+        trade.qty = 0.5
+        trade.firstId = trade.lastId = i
+        trade.isBuyerMaker = i % 2 == 0
+        result.append(trade)
+    return result
+
+
+class TimeKlineAggregator:
+    params = ["kline", "kline_updates", "aggregate_trade"]
+
+    def setup(self, source):
+        self.klines = klines(1000)
+        self.trades = trades(2000)
+
+    def time_aggregate(self, source):
+        if source == "aggregate_trade":
+            aggregator = KlineAggregator(on_close=noop)
+            for trade in self.trades:
+                aggregator.on_aggregate_trade(trade)
+        else:
+            on_update = noop if source == "kline_updates" else None
+            aggregator = KlineAggregator(on_close=noop, on_update=on_update)
+            for bar in self.klines:
+                aggregator.on_candlestick(bar)
@@ -0,0 +1,37 @@
+"""
+LiquidationFlow: recording a forceOrder frame into the rolling windows against
+building a LiquidationOrderEvent, and ranking symbols by liquidated notional.
+"""
+import json
+
+from binance_f.impl.utils import parse_json_from_string
+from binance_f.liquidationflow import LiquidationFlow
+from binance_f.model import LiquidationOrderEvent
+
+START = 1700000000000
+
+
+def force_order_frame(symbol, event_time):
+    return json.dumps({
+        "e": "forceOrder", "E": event_time,
+        "o": {"s": symbol, "S": "SELL", "o": "LIMIT", "f": "IOC", "q": "0.014",
+              "p": "9910", "ap": "9910", "X": "FILLED", "l": "0.014", "z": "0.014",
+              "T": event_time},
+    })
+
+
+class TimeLiquidationFlow:
+    def setup(self):
+        self.flow = LiquidationFlow(thresholds={1: 1e6, 10: 5e6, 60: 2e7})
+        for i in range(20000):
+            self.flow.add("S%02dUSDT" % (i % 50), ("BUY", "SELL")[i % 2], START + i * 5, 0.1, 1000.0)
+        self.wrapper = parse_json_from_string(force_order_frame("BTCUSDT", START + 100000))
+
+    def time_parse_into_flow(self):
+        self.flow.parse(self.wrapper)
+
+    def time_parse_event_object(self):
+        LiquidationOrderEvent.json_parse(self.wrapper)
+
+    def time_top_10_60s(self):
+        self.flow.top(60)
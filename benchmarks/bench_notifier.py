@@ -0,0 +1,29 @@
+"""
+Controller notifications: queueing on the persistent WebsocketPublisher against
+opening, sending on and closing a new websocket per message.
+"""
+from websocket import create_connection
+
+from benchmarks.fakeserver import FakeBinanceServer
+from binance_f.notifier import WebsocketPublisher
+
+MESSAGE = {"action": "trade_completed", "price": 9700.5}
+
+
+class TimeNotifier:
+    def setup(self):
+        self.server = FakeBinanceServer().start_in_thread()
+        self.url = "ws://127.0.0.1:" + str(self.server.port) + "/config"
+        self.publisher = WebsocketPublisher(self.url, max_queue=10 ** 6)
+
+    def teardown(self):
+        self.publisher.close()
+        self.server.stop_thread()
+
+    def time_publish(self):
+        self.publisher.publish(MESSAGE)
+
+    def time_connect_per_message(self):
+        ws = create_connection(self.url)
+        ws.send('{"action": "trade_completed", "price": 9700.5}')
+        ws.close()
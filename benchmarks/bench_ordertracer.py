@@ -0,0 +1,40 @@
+"""
+OrderTracer: the bookkeeping added to each order stage and to each user data update.
+"""
+from binance_f.model.order import Order
+from binance_f.model.orderupdate import OrderUpdate
+from binance_f.ordertracer import LatencyHistogram, OrderTracer
+
+
+class TimeOrderTracer:
+    def setup(self):
+        self.tracer = OrderTracer(max_orders=1000)
+        self.client_order_id = self.tracer.on_submit("BTCUSDT")
+        self.order = Order()
+        self.order.clientOrderId = self.client_order_id
+        self.order.orderId = 1
+        self.order.updateTime = self.tracer.now()
+        self.update = OrderUpdate()
+        self.update.eventType = "ORDER_TRADE_UPDATE"
+        self.update.clientOrderId = self.client_order_id
+        self.update.eventTime = self.update.transactionTime = self.order.updateTime
+        self.update.executionType = "TRADE"
+        self.update.orderStatus = "PARTIALLY_FILLED"
+        self.histogram = LatencyHistogram()
+        for i in range(10000):
+            self.histogram.add(i * 0.37 % 250)
+
+    def time_on_submit(self):
+        self.tracer.on_submit("BTCUSDT")
+
+    def time_on_ack(self):
+        self.tracer.on_ack(self.order)
+
+    def time_on_order_update(self):
+        self.tracer.on_order_update(self.update)
+
+    def time_histogram_add(self):
+        self.histogram.add(12.5)
+
+    def time_histogram_p99(self):
+        self.histogram.percentile(99)
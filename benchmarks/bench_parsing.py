@@ -0,0 +1,61 @@
+"""
+JSON decoding and model parsing for every REST response and the hot websocket events.
+"""
+from binance_f.impl.restapirequestimpl import RestApiRequestImpl
+from binance_f.impl.utils import parse_json_from_string
+from binance_f.impl.websocketrequestimpl import WebsocketRequestImpl
+
+from benchmarks import payloads
+
+
+def noop(*args):
+    pass
+
+
+class TimeParseJson:
+    params = ["get_exchange_information", "get_order_book", "get_candlestick_data",
+              "get_ticker_price_change_statistics"]
+
+    def setup(self, name):
+        self.text = payloads.rest_payloads()[name][1]
+
+    def time_parse_json_from_string(self, name):
+        parse_json_from_string(self.text)
+
+
+class TimeRestModels:
+    params = sorted(payloads.rest_payloads())
+
+    def setup(self, name):
+        args, text = payloads.rest_payloads()[name]
+        request = getattr(RestApiRequestImpl("api-key", "secret-key", develop=False), name)(*args)
+        self.parser = request.json_parser
+        self.text = text
+
+    def time_json_parse(self, name):
+        self.parser(parse_json_from_string(self.text))
+
+
+class TimeEventModels:
+    params = ["aggregate_trade", "mark_price", "candlestick", "symbol_bookticker",
+              "user_data"]
+
+    def setup(self, name):
+        impl = WebsocketRequestImpl("api-key")
+        requests = {
+            "aggregate_trade": (impl.subscribe_aggregate_trade_event("btcusdt", noop),
+                                payloads.AGGREGATE_TRADE_EVENT),
+            "mark_price": (impl.subscribe_mark_price_event("btcusdt", noop),
+                           payloads.MARK_PRICE_EVENT),
+            "candlestick": (impl.subscribe_candlestick_event("btcusdt", "1m", noop),
+                            payloads.CANDLESTICK_EVENT),
+            "symbol_bookticker": (impl.subscribe_symbol_bookticker_event("btcusdt", noop),
+                                  payloads.BOOK_TICKER_EVENT),
+            "user_data": (impl.subscribe_user_data_event("listen-key", noop),
+                          payloads.ORDER_UPDATE_EVENT),
+        }
+        request, self.text = requests[name]
+        self.parser = request.json_parser
+
+    def time_json_parse(self, name):
+        self.parser(parse_json_from_string(self.text))
@@ -0,0 +1,86 @@
+"""
+Per-order signing overhead: the legacy create_signature path against the
+cached HmacSigner path used by RestApiRequestImpl.
+
+    python -m benchmarks.bench_signing
+"""
+import hashlib
+import hmac
+import timeit
+import urllib.parse
+
+from binance_f.impl.restapirequestimpl import RestApiRequestImpl
+from binance_f.impl.utils.apisignature import create_signature
+from binance_f.impl.utils.urlparamsbuilder import UrlParamsBuilder
+
+SECRET = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+ORDER = dict(
+    symbol="BTCUSDT",
+    side="BUY",
+    type="LIMIT",
+    timeInForce="GTC",
+    quantity=0.123,
+    price=9700.1,
+    recvWindow=5000,
+    timestamp="1591702613943",
+)
+
+
+def legacy_order():
+    param_map = dict()
+    for name, value in ORDER.items():
+        if isinstance(value, float):
+            param_map[name] = ("%.20f" % value)[slice(0, 16)].rstrip("0").rstrip(".")
+        else:
+            param_map[name] = str(value)
+    query = urllib.parse.urlencode(param_map)
+    signature = hmac.new(
+        SECRET.encode(), msg=query.encode(), digestmod=hashlib.sha256
+    ).hexdigest()
+    param_map["signature"] = signature
+    return urllib.parse.urlencode(param_map)
+
+
+request_impl = RestApiRequestImpl("api-key", SECRET, develop=False)
+
+
+def request_impl_order():
+    return request_impl.post_order(
+        "BTCUSDT", "BUY", "LIMIT", "GTC", 0.123, None, 9700.1, None, None, None
+    )
+
+
+def create_signature_order():
+    builder = UrlParamsBuilder()
+    for name, value in ORDER.items():
+        builder.put_url(name, value)
+    create_signature(SECRET, builder)
+    return builder.build_url()
+
+
+class TimeSigning:
+    def time_legacy_order(self):
+        legacy_order()
+
+    def time_create_signature(self):
+        create_signature_order()
+
+    def time_request_impl_order(self):
+        request_impl_order()
+
+
+def run(number=20000):
+    results = dict()
+    for name, func in (
+        ("legacy create_signature", legacy_order),
+        ("create_signature", create_signature_order),
+        ("RestApiRequestImpl.post_order", request_impl_order),
+    ):
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[name] = best / number * 1e6
+        print("%-32s %8.2f us/order" % (name, results[name]))
+    return results
+
+
+if __name__ == "__main__":
+    run()
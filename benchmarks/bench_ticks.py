@@ -0,0 +1,39 @@
+"""
+TickBuffer: filling the NumPy columns from aggTrade frames against building
+AggregateTradeEvent objects, and window queries over a full ring.
+"""
+from binance_f.impl.utils import parse_json_from_string
+from binance_f.model import AggregateTradeEvent
+from binance_f.tickbuffer import TickBuffer
+
+from benchmarks import payloads
+
+START = 1700000000000
+
+
+class TimeTickBuffer:
+    def setup(self):
+        self.wrapper = parse_json_from_string(payloads.AGGREGATE_TRADE_EVENT)
+        self.buffer = TickBuffer(capacity=100000)
+        self.ring = self.buffer.ring("ETHUSDT")
+        for i in range(150000):
+            self.ring.append(START + i * 10, 100.0 + i % 7, 0.5, i % 3 == 0, i)
+        self.now = START + 150000 * 10
+
+    def time_parse_into_buffer(self):
+        self.buffer.parse(self.wrapper)
+
+    def time_parse_event_object(self):
+        AggregateTradeEvent.json_parse(self.wrapper)
+
+    def time_volume_5s(self):
+        self.ring.volume(5, self.now)
+
+    def time_vwap_60s(self):
+        self.ring.vwap(60, self.now)
+
+    def time_imbalance_60s(self):
+        self.ring.imbalance(60, self.now)
+
+    def time_vwap_full_ring(self):
+        self.ring.vwap()
@@ -0,0 +1,1033 @@
+"""
+Local stand-in for the Binance futures REST and websocket API.
+
+Serves the /fapi/v1 endpoints used by RestApiRequestImpl with api key and
+signature checks and X-MBX-USED-WEIGHT-1M headers, plus websocket streams
+pushing synthetic depth, trade and kline frames at configurable rates. It is
+meant for load testing the clients without touching the exchange:
+
+    python -m benchmarks.fakeserver --port 8765
+
+then point RequestClient(url="http://127.0.0.1:8765") and
+SubscriptionClient(uri="ws://127.0.0.1:8765/ws") at it. Extra API keys can be
+added with add_account(); orders placed or cancelled through a key push
+ORDER_TRADE_UPDATE to that key's listen key stream. When the optional h2
+package is installed, REST also answers cleartext HTTP/2 with prior knowledge
+(AsyncRequestClient(http2=True) against an http:// url).
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import random
+import struct
+import threading
+import time
+import urllib.parse
+
+from binance_f.impl.endpoints import BY_ROUTE, NONE_SECURITY, SIGNED_SECURITY
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+HTTP2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+DEFAULT_STREAM_RATES = {
+    "depth": 10.0,
+    "trade": 20.0,
+    "kline": 4.0,
+    "markPrice": 1.0,
+    "bookTicker": 20.0,
+    "forceOrder": 2.0,
+}
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+}
+
+# Handler answering each endpoint of binance_f.impl.endpoints.ENDPOINTS, by name.
+HANDLERS = {
+    "get_servertime": "server_time",
+    "get_exchange_information": "exchange_information",
+    "get_order_book": "order_book",
+    "get_recent_trades_list": "recent_trades",
+    "get_old_trade_lookup": "recent_trades",
+    "get_aggregate_trades_list": "aggregate_trades",
+    "get_candlestick_data": "klines",
+    "get_mark_price": "mark_price",
+    "get_funding_rate": "funding_rate",
+    "get_ticker_price_change_statistics": "ticker_24hr",
+    "get_symbol_price_ticker": "ticker_price",
+    "get_symbol_orderbook_ticker": "book_ticker",
+    "get_open_interest": "open_interest",
+    "get_liquidation_orders": "force_orders",
+    "post_order": "new_order",
+    "get_order": "query_order",
+    "cancel_order": "cancel_order",
+    "cancel_all_orders": "cancel_all_orders",
+    "cancel_list_orders": "cancel_batch_orders",
+    "get_open_orders": "open_orders",
+    "get_all_orders": "all_orders",
+    "get_balance": "balance",
+    "get_account_information": "account",
+    "change_initial_leverage": "leverage",
+    "change_margin_type": "success",
+    "change_position_margin": "position_margin",
+    "get_position_margin_change_history": "position_margin_history",
+    "get_position": "position_risk",
+    "get_account_trades": "user_trades",
+    "get_income_history": "income",
+    "start_user_data_stream": "new_listen_key",
+    "keep_user_data_stream": "keep_listen_key",
+    "close_user_data_stream": "empty",
+}
+
+
+class FakeApiError(Exception):
+    def __init__(self, status, code, msg):
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+def current_ms():
+    return int(time.time() * 1000)
+
+
+class MarketState:
+    def __init__(self, symbol, price):
+        self.symbol = symbol
+        self.price = price
+        self.trade_id = 0
+        self.update_id = 1
+        self.funding_rate = 0.0001
+
+    def step(self):
+        self.price = max(0.01, self.price * (1 + random.gauss(0, 0.0002)))
+        return self.price
+
+    def step_funding(self):
+        self.funding_rate = min(0.003, max(-0.003, self.funding_rate + random.gauss(0, 0.00001)))
+        return self.funding_rate
+
+    def next_trade_id(self):
+        self.trade_id += 1
+        return self.trade_id
+
+    def next_update_id(self):
+        self.update_id += 1
+        return self.update_id
+
+    def levels(self, count, side):
+        direction = -1 if side == "bids" else 1
+        return [
+            [
+                "%.2f" % (self.price + direction * 0.1 * (i + 1)),
+                "%.3f" % random.uniform(0.001, 5),
+            ]
+            for i in range(count)
+        ]
+
+
+class FakeBinanceServer(object):
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        api_key="fake-api-key",
+        secret_key="fake-secret-key",
+        symbols=None,
+        stream_rates=None,
+        weight_limit=2400,
+        latency=0.0,
+    ):
+        """
+        :param port: 0 binds a free port, read it back from .port after start().
+        :param symbols: Mapping of symbol to starting price.
+        :param stream_rates: Frames per second for each stream family
+            (depth, trade, kline, markPrice, bookTicker, forceOrder).
+        :param weight_limit: Request weight allowed per minute before answering 429.
+        :param latency: Seconds added to every REST response.
+        """
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.weight_limit = weight_limit
+        self.latency = latency
+        self.stream_rates = dict(DEFAULT_STREAM_RATES)
+        if stream_rates:
+            self.stream_rates.update(stream_rates)
+        if symbols is None:
+            symbols = {"BTCUSDT": 9700.0, "ETHUSDT": 240.0}
+        self.markets = {
+            symbol: MarketState(symbol, price) for symbol, price in symbols.items()
+        }
+        self.orders = dict()
+        self.order_ids = itertools.count(1)
+        self.accounts = {api_key: secret_key}
+        # API key of the request being handled.
+        self.request_account = api_key
+        self.listen_keys = dict()
+        self.listen_key = None
+        self.keepalive_count = 0
+        self.inbound_messages = list()
+        self.__user_streams = dict()
+        self.request_count = 0
+        self.connection_count = 0
+        self.used_weight = 0
+        self.weight_window = 0
+        self.endpoints = dict()
+        self.__server = None
+        self.__connections = set()
+        self.__loop = None
+        self.__thread = None
+        self.__ready = threading.Event()
+        self.__register_endpoints()
+
+    def add_account(self, api_key, secret_key):
+        self.accounts[api_key] = secret_key
+        return self
+
+    @property
+    def url(self):
+        return "http://" + self.host + ":" + str(self.port)
+
+    @property
+    def uri(self):
+        return "ws://" + self.host + ":" + str(self.port) + "/ws"
+
+    # Lifecycle
+
+    async def start(self):
+        self.__server = await asyncio.start_server(
+            self.__handle_connection, self.host, self.port
+        )
+        self.port = self.__server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.__server is not None:
+            self.__server.close()
+            # Keep-alive connections of pooled clients would otherwise stay open.
+            for task in list(self.__connections):
+                task.cancel()
+            if self.__connections:
+                await asyncio.wait(list(self.__connections))
+            await self.__server.wait_closed()
+            self.__server = None
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread and return once bound."""
+
+        def run():
+            self.__loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.__loop)
+            self.__loop.run_until_complete(self.start())
+            self.__ready.set()
+            self.__loop.run_forever()
+
+        self.__thread = threading.Thread(target=run, name="fake-binance", daemon=True)
+        self.__thread.start()
+        self.__ready.wait()
+        return self
+
+    def stop_thread(self):
+        if self.__loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.stop(), self.__loop)
+        future.result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop = None
+
+    # HTTP
+
+    async def __handle_connection(self, reader, writer):
+        self.connection_count += 1
+        task = asyncio.current_task()
+        self.__connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if head.startswith(b"PRI * HTTP/2.0"):
+                    rest = await reader.readexactly(len(HTTP2_PREFACE) - len(head))
+                    await self.__handle_http2(reader, writer, head + rest)
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = dict()
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self.__handle_websocket(reader, writer, target, headers)
+                    break
+                await self.__handle_http(writer, method, target, headers, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except asyncio.CancelledError:
+            # stop() closing a keep-alive or websocket connection.
+            pass
+        finally:
+            self.__connections.discard(task)
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def __handle_http(self, writer, method, target, headers, body):
+        status, extra_headers, data = await self.__dispatch(method, target, headers, body)
+        head = "HTTP/1.1 " + str(status) + " " + STATUS_TEXT.get(status, "") + "\r\n"
+        head += "Content-Type: application/json\r\nContent-Length: " + str(len(data)) + "\r\n"
+        for name, value in extra_headers.items():
+            head += name + ": " + value + "\r\n"
+        writer.write(head.encode() + b"\r\n" + data)
+        await writer.drain()
+
+    async def __handle_http2(self, reader, writer, preface):
+        try:
+            import h2.config
+            import h2.connection
+            import h2.events
+        except ImportError:
+            return
+        connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        connection.initiate_connection()
+        window_updated = asyncio.Event()
+        streams = dict()
+        tasks = set()
+
+        async def answer(stream_id, headers, body):
+            status, extra_headers, data = await self.__dispatch(
+                headers[":method"], headers[":path"], headers, body
+            )
+            response_headers = [(":status", str(status)), ("content-type", "application/json"),
+                                ("content-length", str(len(data)))]
+            response_headers += [(name.lower(), value) for name, value in extra_headers.items()]
+            connection.send_headers(stream_id, response_headers)
+            while True:
+                size = min(connection.local_flow_control_window(stream_id),
+                           connection.max_outbound_frame_size, len(data))
+                if size == 0 and data:
+                    window_updated.clear()
+                    writer.write(connection.data_to_send())
+                    await window_updated.wait()
+                    continue
+                connection.send_data(stream_id, data[:size], end_stream=size == len(data))
+                data = data[size:]
+                if not data:
+                    break
+            writer.write(connection.data_to_send())
+
+        data = preface
+        while data:
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    streams[event.stream_id] = (dict(event.headers), bytearray())
+                elif isinstance(event, h2.events.DataReceived):
+                    streams[event.stream_id][1].extend(event.data)
+                    connection.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers, body = streams.pop(event.stream_id)
+                    task = asyncio.ensure_future(answer(event.stream_id, headers, bytes(body)))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.WindowUpdated):
+                    window_updated.set()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    data = b""
+            writer.write(connection.data_to_send())
+            await writer.drain()
+            if data:
+                try:
+                    data = await reader.read(65536)
+                except ConnectionError:
+                    break
+        for task in tasks:
+            task.cancel()
+
+    async def __dispatch(self, method, target, headers, body):
+        self.request_count += 1
+        path, _, query = target.partition("?")
+        extra_headers = dict()
+        try:
+            endpoint = self.endpoints.get((method, path))
+            if endpoint is None:
+                raise FakeApiError(404, -1000, "Unknown endpoint " + method + " " + path)
+            handler, endpoint = endpoint
+            if body:
+                query = query + "&" + body.decode() if query else body.decode()
+            params = dict(urllib.parse.parse_qsl(query, keep_blank_values=True))
+            weight = endpoint.wire_weight(params)
+            extra_headers["X-MBX-USED-WEIGHT-1M"] = str(self.__use_weight(weight))
+            if self.used_weight > self.weight_limit:
+                raise FakeApiError(429, -1003, "Too many requests; current limit is "
+                                   + str(self.weight_limit) + " request weight per 1 MINUTE.")
+            if endpoint.security != NONE_SECURITY:
+                self.request_account = self.__check_api_key(headers)
+            if endpoint.security == SIGNED_SECURITY:
+                self.__check_signature(query, params, self.accounts[self.request_account])
+            status, payload = 200, handler(params)
+        except FakeApiError as e:
+            status, payload = e.status, {"code": e.code, "msg": e.msg}
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return status, extra_headers, json.dumps(payload).encode()
+
+    def __use_weight(self, weight):
+        window = int(time.time() // 60)
+        if window != self.weight_window:
+            self.weight_window = window
+            self.used_weight = 0
+        self.used_weight += weight
+        return self.used_weight
+
+    def __check_api_key(self, headers):
+        api_key = headers.get("x-mbx-apikey")
+        if api_key not in self.accounts:
+            raise FakeApiError(401, -2015, "Invalid API-key, IP, or permissions for action.")
+        return api_key
+
+    def __check_signature(self, query, params, secret_key):
+        unsigned, _, signature = query.rpartition("&signature=")
+        expected = hmac.new(
+            secret_key.encode(), unsigned.encode(), hashlib.sha256
+        ).hexdigest()
+        if not signature or not hmac.compare_digest(signature, expected):
+            raise FakeApiError(400, -1022, "Signature for this request is not valid.")
+        timestamp = int(params.get("timestamp", 0))
+        recv_window = int(params.get("recvWindow", 5000))
+        now = current_ms()
+        if timestamp > now + 1000 or now - timestamp > recv_window:
+            raise FakeApiError(
+                400, -1021, "Timestamp for this request is outside of the recvWindow."
+            )
+
+    # Endpoints
+
+    def __register_endpoints(self):
+        for route, endpoint in BY_ROUTE.items():
+            self.endpoints[route] = (getattr(self, HANDLERS[endpoint.name]), endpoint)
+
+    def __market(self, params):
+        symbol = params.get("symbol")
+        if symbol is None:
+            raise FakeApiError(400, -1102, "Mandatory parameter 'symbol' was not sent.")
+        market = self.markets.get(symbol.upper())
+        if market is None:
+            raise FakeApiError(400, -1121, "Invalid symbol.")
+        return market
+
+    def __limit(self, params, default=500):
+        return min(int(params.get("limit", default)), 1000)
+
+    def server_time(self, params):
+        return {"serverTime": current_ms()}
+
+    def exchange_information(self, params):
+        symbols = list()
+        for symbol in self.markets:
+            symbols.append(
+                {
+                    "symbol": symbol,
+                    "status": "TRADING",
+                    "maintMarginPercent": "2.5000",
+                    "requiredMarginPercent": "5.0000",
+                    "baseAsset": symbol[:-4],
+                    "quoteAsset": "USDT",
+                    "pricePrecision": 2,
+                    "quantityPrecision": 3,
+                    "baseAssetPrecision": 8,
+                    "quotePrecision": 8,
+                    "orderTypes": ["LIMIT", "MARKET", "STOP", "STOP_MARKET",
+                                   "TAKE_PROFIT", "TAKE_PROFIT_MARKET"],
+                    "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "minPrice": "0.01",
+                         "maxPrice": "1000000", "tickSize": "0.01"},
+                        {"filterType": "LOT_SIZE", "minQty": "0.001",
+                         "maxQty": "1000", "stepSize": "0.001"},
+                        {"filterType": "MARKET_LOT_SIZE", "minQty": "0.001",
+                         "maxQty": "1000", "stepSize": "0.001"},
+                        {"filterType": "MIN_NOTIONAL", "notional": "5"},
+                    ],
+                }
+            )
+        return {
+            "timezone": "UTC",
+            "serverTime": current_ms(),
+            "rateLimits": [
+                {"rateLimitType": "REQUEST_WEIGHT", "interval": "MINUTE",
+                 "intervalNum": 1, "limit": self.weight_limit},
+            ],
+            "exchangeFilters": [],
+            "symbols": symbols,
+        }
+
+    def order_book(self, params):
+        market = self.__market(params)
+        limit = self.__limit(params, 500)
+        return {
+            "lastUpdateId": market.next_update_id(),
+            "bids": market.levels(limit, "bids"),
+            "asks": market.levels(limit, "asks"),
+        }
+
+    def recent_trades(self, params):
+        market = self.__market(params)
+        now = current_ms()
+        result = list()
+        for i in range(self.__limit(params, 500)):
+            price = market.step()
+            qty = random.uniform(0.001, 2)
+            result.append(
+                {"id": market.next_trade_id(), "price": "%.2f" % price,
+                 "qty": "%.3f" % qty, "quoteQty": "%.2f" % (price * qty),
+                 "time": now - i, "isBuyerMaker": random.random() < 0.5}
+            )
+        return result
+
+    def aggregate_trades(self, params):
+        market = self.__market(params)
+        start = int(params.get("startTime", current_ms() - 60000))
+        from_id = int(params.get("fromId", market.trade_id + 1))
+        result = list()
+        for i in range(self.__limit(params, 500)):
+            trade_id = from_id + i
+            result.append(
+                {"a": trade_id, "p": "%.2f" % market.step(),
+                 "q": "%.3f" % random.uniform(0.001, 2), "f": trade_id, "l": trade_id,
+                 "T": start + i, "m": random.random() < 0.5}
+            )
+        return result
+
+    def klines(self, params):
+        market = self.__market(params)
+        limit = self.__limit(params, 500)
+        end = int(params.get("endTime", current_ms()))
+        start = int(params.get("startTime", end - limit * 60000))
+        result = list()
+        for i in range(limit):
+            open_time = start + i * 60000
+            if open_time > end:
+                break
+            open_price = market.price
+            close = market.step()
+            result.append(
+                [open_time, "%.2f" % open_price, "%.2f" % (max(open_price, close) + 1),
+                 "%.2f" % (min(open_price, close) - 1), "%.2f" % close, "100.000",
+                 open_time + 59999, "970000.00", 1000, "50.000", "485000.00", "0"]
+            )
+        return result
+
+    def __premium(self, market):
+        return {
+            "symbol": market.symbol,
+            "markPrice": "%.8f" % market.price,
+            "indexPrice": "%.8f" % market.price,
+            "lastFundingRate": "%.8f" % market.funding_rate,
+            "nextFundingTime": (current_ms() // 28800000 + 1) * 28800000,
+            "time": current_ms(),
+        }
+
+    def mark_price(self, params):
+        if params.get("symbol"):
+            return self.__premium(self.__market(params))
+        return [self.__premium(market) for market in self.markets.values()]
+
+    def funding_rate(self, params):
+        market = self.__market(params)
+        now = current_ms()
+        return [
+            {"symbol": market.symbol, "fundingRate": "%.8f" % market.funding_rate,
+             "fundingTime": now - i * 28800000}
+            for i in range(self.__limit(params, 100))
+        ]
+
+    def __ticker(self, market):
+        now = current_ms()
+        return {
+            "symbol": market.symbol, "priceChange": "10.00", "priceChangePercent": "0.100",
+            "weightedAvgPrice": "%.2f" % market.price, "lastPrice": "%.2f" % market.price,
+            "lastQty": "0.010", "openPrice": "%.2f" % market.price,
+            "highPrice": "%.2f" % (market.price + 100), "lowPrice": "%.2f" % (market.price - 100),
+            "volume": "1000.000", "quoteVolume": "9700000.00", "openTime": now - 86400000,
+            "closeTime": now, "firstId": 1, "lastId": market.trade_id, "count": market.trade_id,
+        }
+
+    def __per_symbol(self, params, build):
+        if params.get("symbol"):
+            return build(self.__market(params))
+        return [build(market) for market in self.markets.values()]
+
+    def ticker_24hr(self, params):
+        return self.__per_symbol(params, self.__ticker)
+
+    def ticker_price(self, params):
+        return self.__per_symbol(
+            params, lambda market: {"symbol": market.symbol, "price": "%.2f" % market.price}
+        )
+
+    def book_ticker(self, params):
+        return self.__per_symbol(
+            params,
+            lambda market: {
+                "symbol": market.symbol,
+                "bidPrice": "%.2f" % (market.price - 0.1), "bidQty": "1.000",
+                "askPrice": "%.2f" % (market.price + 0.1), "askQty": "1.000",
+            },
+        )
+
+    def open_interest(self, params):
+        return {"symbol": self.__market(params).symbol, "openInterest": "10000.000"}
+
+    def force_orders(self, params):
+        return list()
+
+    def __order(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None:
+            raise FakeApiError(400, -2013, "Order does not exist.")
+        return order
+
+    def __find_order(self, params):
+        if params.get("orderId"):
+            return self.__order(int(params["orderId"]))
+        client_id = params.get("origClientOrderId")
+        for order in self.orders.values():
+            if client_id and order["clientOrderId"] == client_id:
+                return order
+        raise FakeApiError(400, -2013, "Order does not exist.")
+
+    def new_order(self, params):
+        market = self.__market(params)
+        for name in ("side", "type", "quantity"):
+            if not params.get(name):
+                raise FakeApiError(400, -1102, "Mandatory parameter '" + name + "' was not sent.")
+        order_id = next(self.order_ids)
+        market_order = params["type"] == "MARKET"
+        price = float(params.get("price", 0) or 0)
+        order = {
+            "clientOrderId": params.get("newClientOrderId") or "fake" + str(order_id),
+            "cumQuote": "0", "executedQty": params["quantity"] if market_order else "0",
+            "orderId": order_id, "origQty": params["quantity"],
+            "price": "%.2f" % price, "avgPrice": "%.2f" % (market.price if market_order else 0),
+            "reduceOnly": params.get("reduceOnly") == "true", "side": params["side"],
+            "status": "FILLED" if market_order else "NEW",
+            "stopPrice": params.get("stopPrice", "0"), "symbol": market.symbol,
+            "timeInForce": params.get("timeInForce", "GTC"), "type": params["type"],
+            "origType": params["type"], "updateTime": current_ms(),
+            "workingType": params.get("workingType", "CONTRACT_PRICE"),
+        }
+        self.orders[order_id] = order
+        self.__order_update(order, "TRADE" if market_order else "NEW")
+        return order
+
+    def query_order(self, params):
+        return self.__find_order(params)
+
+    def cancel_order(self, params):
+        order = self.__find_order(params)
+        order["status"] = "CANCELED"
+        self.__order_update(order, "CANCELED")
+        return order
+
+    def cancel_all_orders(self, params):
+        market = self.__market(params)
+        for order in self.orders.values():
+            if order["symbol"] == market.symbol and order["status"] == "NEW":
+                order["status"] = "CANCELED"
+        return {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+    def cancel_batch_orders(self, params):
+        result = list()
+        for order_id in json.loads(params.get("orderIdList", "[]")):
+            try:
+                order = self.__order(int(order_id))
+                order["status"] = "CANCELED"
+                result.append(order)
+            except FakeApiError as e:
+                result.append({"code": e.code, "msg": e.msg})
+        return result
+
+    def open_orders(self, params):
+        symbol = params.get("symbol")
+        return [
+            order for order in self.orders.values()
+            if order["status"] == "NEW" and (not symbol or order["symbol"] == symbol)
+        ]
+
+    def all_orders(self, params):
+        market = self.__market(params)
+        from_id = int(params.get("orderId", 0))
+        result = [
+            order for order in self.orders.values()
+            if order["symbol"] == market.symbol and order["orderId"] >= from_id
+        ]
+        return result[:self.__limit(params, 500)]
+
+    def balance(self, params):
+        return [{"asset": "USDT", "balance": "10000.00000000",
+                 "withdrawAvailable": "10000.00000000"}]
+
+    def account(self, params):
+        return {
+            "canDeposit": True, "canTrade": True, "canWithdraw": True, "feeTier": 0,
+            "maxWithdrawAmount": "10000", "totalInitialMargin": "0", "totalMaintMargin": "0",
+            "totalMarginBalance": "10000", "totalOpenOrderInitialMargin": "0",
+            "totalPositionInitialMargin": "0", "totalUnrealizedProfit": "0",
+            "totalWalletBalance": "10000", "updateTime": 0,
+            "assets": [
+                {"asset": "USDT", "initialMargin": "0", "maintMargin": "0",
+                 "marginBalance": "10000", "maxWithdrawAmount": "10000",
+                 "openOrderInitialMargin": "0", "positionInitialMargin": "0",
+                 "unrealizedProfit": "0"}
+            ],
+            "positions": [
+                {"symbol": symbol, "initialMargin": "0", "maintMargin": "0",
+                 "openOrderInitialMargin": "0", "positionInitialMargin": "0",
+                 "unrealizedProfit": "0", "isolated": False, "leverage": "20"}
+                for symbol in self.markets
+            ],
+        }
+
+    def leverage(self, params):
+        market = self.__market(params)
+        return {"leverage": int(params.get("leverage", 20)), "maxNotionalValue": "1000000",
+                "symbol": market.symbol}
+
+    def success(self, params):
+        return {"code": 200, "msg": "success"}
+
+    def position_margin(self, params):
+        return {"amount": float(params.get("amount", 0)), "code": 200,
+                "msg": "Successfully modify position margin.", "type": int(params.get("type", 1))}
+
+    def position_margin_history(self, params):
+        market = self.__market(params)
+        return [{"amount": "1.00", "asset": "USDT", "symbol": market.symbol,
+                 "time": current_ms(), "type": 1}]
+
+    def position_risk(self, params):
+        return [
+            {"entryPrice": "0.0", "marginType": "isolated", "isolatedMargin": "0.0",
+             "leverage": "20", "liquidationPrice": "0", "markPrice": "%.8f" % market.price,
+             "maxNotionalValue": "1000000", "positionAmt": "0.000", "symbol": market.symbol,
+             "unRealizedProfit": "0.00000000"}
+            for market in self.markets.values()
+        ]
+
+    def user_trades(self, params):
+        market = self.__market(params)
+        from_id = int(params.get("fromId", 1))
+        start = int(params.get("startTime", current_ms() - 3600000))
+        return [
+            {"buyer": False, "commission": "0.01", "commissionAsset": "USDT",
+             "id": from_id + i, "maker": False, "orderId": from_id + i,
+             "price": "%.2f" % market.price, "qty": "0.010",
+             "quoteQty": "%.2f" % (market.price * 0.01), "realizedPnl": "0",
+             "side": "SELL", "symbol": market.symbol, "time": start + i}
+            for i in range(self.__limit(params, 500))
+        ]
+
+    def income(self, params):
+        start = int(params.get("startTime", current_ms() - 86400000))
+        return [
+            {"symbol": params.get("symbol", "BTCUSDT"), "incomeType": "FUNDING_FEE",
+             "income": "-0.01", "asset": "USDT", "time": start + i * 1000,
+             "tranId": start + i}
+            for i in range(self.__limit(params, 100))
+        ]
+
+    def new_listen_key(self, params):
+        listen_key = self.listen_keys.get(self.request_account)
+        if listen_key is None:
+            # Alphanumeric like the real keys, so they can be joined into /stream paths.
+            listen_key = os.urandom(32).hex()
+            self.listen_keys[self.request_account] = listen_key
+        self.listen_key = listen_key
+        return {"listenKey": listen_key}
+
+    def keep_listen_key(self, params):
+        if self.request_account not in self.listen_keys:
+            raise FakeApiError(400, -1125, "This listenKey does not exist.")
+        self.keepalive_count += 1
+        return {}
+
+    def expire_listen_key(self, api_key=None):
+        """Drop an account's listen key and push listenKeyExpired, as Binance does an hour
+        after the last keepalive. Safe to call from outside the server thread."""
+        listen_key = self.listen_keys.pop(api_key or self.api_key, None)
+        if listen_key is None:
+            return
+        payload = {"e": "listenKeyExpired", "E": current_ms()}
+
+        def push():
+            for writer, combined in self.__user_streams.get(listen_key, ()):
+                frame = {"stream": listen_key, "data": payload} if combined else payload
+                self.__send_text(writer, json.dumps(frame))
+
+        if self.__loop is not None:
+            self.__loop.call_soon_threadsafe(push)
+        else:
+            push()
+
+    def empty(self, params):
+        return {}
+
+    # User data
+
+    def __order_update(self, order, execution_type):
+        listen_key = self.listen_keys.get(self.request_account)
+        subscribers = self.__user_streams.get(listen_key)
+        if not subscribers:
+            return
+        now = current_ms()
+        filled = execution_type == "TRADE"
+        payload = {
+            "e": "ORDER_TRADE_UPDATE", "E": now, "T": now,
+            "o": {"s": order["symbol"], "c": order["clientOrderId"], "S": order["side"],
+                  "o": order["type"], "f": order["timeInForce"], "q": order["origQty"],
+                  "p": order["price"], "ap": order["avgPrice"], "sp": order["stopPrice"],
+                  "x": execution_type, "X": order["status"], "i": order["orderId"],
+                  "l": order["origQty"] if filled else "0", "z": order["executedQty"],
+                  "L": order["avgPrice"] if filled else "0", "N": "USDT", "n": "0",
+                  "T": now, "t": 0, "b": "0", "a": "0", "m": False,
+                  "R": order["reduceOnly"], "wt": order["workingType"]},
+        }
+        for writer, combined in subscribers:
+            frame = {"stream": listen_key, "data": payload} if combined else payload
+            self.__send_text(writer, json.dumps(frame))
+
+    async def __user_stream(self, writer, listen_key, combined):
+        subscriber = (writer, combined)
+        self.__user_streams.setdefault(listen_key, list()).append(subscriber)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.__user_streams[listen_key].remove(subscriber)
+
+    # Websocket
+
+    async def __handle_websocket(self, reader, writer, target, headers):
+        accept = base64.b64encode(
+            hashlib.sha1((headers["sec-websocket-key"] + WEBSOCKET_GUID).encode()).digest()
+        ).decode()
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                "Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + "\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        path, _, query = target.partition("?")
+        combined = path.startswith("/stream")
+        streams = list()
+        if combined:
+            streams = dict(urllib.parse.parse_qsl(query)).get("streams", "").split("/")
+        elif path.startswith("/ws/"):
+            streams = path[len("/ws/"):].split("/")
+        tasks = dict()
+        for stream in streams:
+            if stream:
+                tasks[stream] = asyncio.ensure_future(self.__push(writer, stream, combined))
+        try:
+            while True:
+                opcode, payload = await self.__read_frame(reader)
+                if opcode == 0x8:
+                    self.__send_frame(writer, 0x8, payload[:2])
+                    break
+                if opcode == 0x9:
+                    self.__send_frame(writer, 0xA, payload)
+                elif opcode == 0x1:
+                    message = json.loads(payload)
+                    if isinstance(message, dict) and "method" in message:
+                        self.__on_ws_command(writer, message, tasks, combined)
+                    else:
+                        # Anything else, e.g. a bot notifying its controller, is only recorded.
+                        self.inbound_messages.append(message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def __on_ws_command(self, writer, command, tasks, combined):
+        method = command.get("method")
+        for stream in command.get("params", list()):
+            if method == "SUBSCRIBE" and stream not in tasks:
+                tasks[stream] = asyncio.ensure_future(self.__push(writer, stream, combined))
+            elif method == "UNSUBSCRIBE" and stream in tasks:
+                tasks.pop(stream).cancel()
+        self.__send_text(writer, json.dumps({"result": None, "id": command.get("id")}))
+
+    async def __read_frame(self, reader):
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return first & 0x0F, payload
+
+    def __send_frame(self, writer, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            head = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        writer.write(head + payload)
+
+    def __send_text(self, writer, text):
+        self.__send_frame(writer, 0x1, text.encode())
+
+    def __stream_family(self, name):
+        if "@depth" in name:
+            return "depth"
+        if "@aggTrade" in name or "@trade" in name:
+            return "trade"
+        if "@kline_" in name:
+            return "kline"
+        if "@markPrice" in name or name.startswith("!markPrice@arr"):
+            return "markPrice"
+        if "@bookTicker" in name:
+            return "bookTicker"
+        if "forceOrder" in name:
+            return "forceOrder"
+        return None
+
+    async def __push(self, writer, stream, combined):
+        if stream in self.listen_keys.values():
+            await self.__user_stream(writer, stream, combined)
+            return
+        family = self.__stream_family(stream)
+        if stream.startswith("!"):
+            # All-market streams carry every symbol in one array frame.
+            markets = list(self.markets.values())
+        else:
+            market = self.markets.get(stream.split("@")[0].upper())
+            markets = [market] if market is not None else None
+        if family is None or not markets:
+            # User data streams and unknown streams stay silent.
+            return
+        interval = 1.0 / self.stream_rates[family]
+        next_time = time.monotonic()
+        try:
+            while True:
+                if family == "forceOrder":
+                    # One liquidation per frame, of a random symbol on !forceOrder@arr.
+                    payload = self.__event(stream, family, random.choice(markets))
+                elif stream.startswith("!"):
+                    payload = [self.__event(stream, family, market) for market in markets]
+                else:
+                    payload = self.__event(stream, family, markets[0])
+                if combined:
+                    payload = {"stream": stream, "data": payload}
+                self.__send_text(writer, json.dumps(payload))
+                await writer.drain()
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    next_time = time.monotonic()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def __event(self, stream, family, market):
+        now = current_ms()
+        price = market.step()
+        symbol = market.symbol
+        if family == "trade":
+            trade_id = market.next_trade_id()
+            if "@aggTrade" in stream:
+                return {"e": "aggTrade", "E": now, "s": symbol, "a": trade_id,
+                        "p": "%.2f" % price, "q": "%.3f" % random.uniform(0.001, 2),
+                        "f": trade_id, "l": trade_id, "T": now, "m": random.random() < 0.5}
+            return {"e": "trade", "E": now, "T": now, "s": symbol, "t": trade_id,
+                    "p": "%.2f" % price, "q": "%.3f" % random.uniform(0.001, 2),
+                    "X": "MARKET", "m": random.random() < 0.5}
+        if family == "depth":
+            depth = stream.split("@")[1][len("depth"):]
+            levels = int(depth) if depth.isdigit() else 10
+            first = market.update_id + 1
+            last = market.next_update_id()
+            return {"e": "depthUpdate", "E": now, "T": now, "s": symbol, "U": first,
+                    "u": last, "pu": first - 1, "b": market.levels(levels, "bids"),
+                    "a": market.levels(levels, "asks")}
+        if family == "kline":
+            interval = stream.split("@kline_")[1]
+            start = now - now % 60000
+            return {"e": "kline", "E": now, "s": symbol,
+                    "k": {"t": start, "T": start + 59999, "s": symbol, "i": interval,
+                          "f": 1, "L": market.trade_id, "o": "%.2f" % price,
+                          "c": "%.2f" % price, "h": "%.2f" % (price + 1),
+                          "l": "%.2f" % (price - 1), "v": "10.000", "n": 10, "x": False,
+                          "q": "%.2f" % (price * 10), "V": "5.000",
+                          "Q": "%.2f" % (price * 5), "B": "0"}}
+        if family == "markPrice":
+            funding_rate = market.step_funding()
+            return {"e": "markPriceUpdate", "E": now, "s": symbol, "p": "%.8f" % price,
+                    "i": "%.8f" % (price * (1 - funding_rate)), "r": "%.8f" % funding_rate,
+                    "T": (now // 28800000 + 1) * 28800000}
+        if family == "forceOrder":
+            qty = "%.3f" % random.expovariate(1.0)
+            return {"e": "forceOrder", "E": now,
+                    "o": {"s": symbol, "S": random.choice(("BUY", "SELL")), "o": "LIMIT",
+                          "f": "IOC", "q": qty, "p": "%.2f" % price, "ap": "%.2f" % price,
+                          "X": "FILLED", "l": qty, "z": qty, "T": now}}
+        return {"e": "bookTicker", "u": market.next_update_id(), "E": now, "T": now,
+                "s": symbol, "b": "%.2f" % (price - 0.1), "B": "1.000",
+                "a": "%.2f" % (price + 0.1), "A": "1.000"}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Binance futures stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--api-key", default="fake-api-key")
+    parser.add_argument("--secret-key", default="fake-secret-key")
+    for family, rate in DEFAULT_STREAM_RATES.items():
+        parser.add_argument("--" + family + "-rate", type=float, default=rate,
+                            help="frames per second for " + family + " streams")
+    args = parser.parse_args()
+    rates = {family: getattr(args, family + "_rate") for family in DEFAULT_STREAM_RATES}
+    server = FakeBinanceServer(args.host, args.port, args.api_key, args.secret_key,
+                               stream_rates=rates)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    print("REST " + server.url + "  websocket " + server.uri)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        loop.run_until_complete(server.stop())
+
+
+if __name__ == "__main__":
+    main()
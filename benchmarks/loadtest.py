@@ -0,0 +1,228 @@
+"""
+Load test the request and subscription clients against the local stand-in server.
+
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --requests 2000 --concurrency 1 8 32 128 --rates 100 1000 5000
+
+Reports p50/p99 latency and the maximum sustained throughput for each client mode:
+sync RequestClient (sequential and thread pool), AsyncRequestClient (gather under a
+semaphore) and SubscriptionClient (kline frames pushed at increasing rates).
+With --accounts N, also N accounts of one AccountPool placing orders and receiving
+their ORDER_TRADE_UPDATE over the shared user data sockets.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from binance_f import AsyncRequestClient, RequestClient, SubscriptionClient
+from binance_f.accountpool import AccountPool
+from benchmarks.fakeserver import FakeBinanceServer
+from binance_f.model.constant import CandlestickInterval, SubscribeMessageType
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def report(mode, level, latencies, elapsed, unit="req/s"):
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    print(
+        "%-22s %-10s n=%-6d p50=%8.2fms p99=%8.2fms %10.1f %s"
+        % (mode, level, len(latencies), percentile(latencies, 50) * 1000,
+           percentile(latencies, 99) * 1000, throughput, unit)
+    )
+    return throughput
+
+
+def request_call(client, signed):
+    if signed:
+        return client.get_open_orders("BTCUSDT")
+    return client.get_symbol_price_ticker("BTCUSDT")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_sync(server, requests, concurrency, signed):
+    client = RequestClient(
+        api_key=server.api_key, secret_key=server.secret_key, url=server.url, debug=False
+    )
+    best = 0.0
+    for level in concurrency:
+        start = time.perf_counter()
+        if level == 1:
+            latencies = [timed(request_call, client, signed) for _ in range(requests)]
+        else:
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                latencies = list(
+                    pool.map(lambda _: timed(request_call, client, signed), range(requests))
+                )
+        elapsed = time.perf_counter() - start
+        mode = "sync sequential" if level == 1 else "sync threads"
+        best = max(best, report(mode, "c=" + str(level), latencies, elapsed))
+    return best
+
+
+async def run_async_level(client, requests, level, signed):
+    semaphore = asyncio.Semaphore(level)
+    latencies = list()
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await request_call(client, signed)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return latencies, elapsed
+
+
+def run_async(server, requests, concurrency, signed):
+    client = AsyncRequestClient(
+        api_key=server.api_key, secret_key=server.secret_key, url=server.url, debug=False
+    )
+    best = 0.0
+    for level in concurrency:
+        latencies, elapsed = asyncio.run(run_async_level(client, requests, level, signed))
+        best = max(best, report("async gather", "c=" + str(level), latencies, elapsed))
+    return best
+
+
+def run_subscription(server, rate, duration):
+    server.stream_rates["kline"] = rate
+    client = SubscriptionClient(uri=server.uri)
+    latencies = list()
+    deadline = [None]
+
+    def callback(data_type, event):
+        if data_type == SubscribeMessageType.PAYLOAD:
+            if deadline[0] is None:
+                deadline[0] = time.time() + duration
+            latencies.append(max(0.0, time.time() - event.eventTime / 1000.0))
+
+    def running_callback():
+        time.sleep(0.05)
+        if deadline[0] is not None and time.time() > deadline[0]:
+            raise KeyboardInterrupt()
+
+    thread = threading.Thread(
+        target=client.subscribe_candlestick_event,
+        args=("btcusdt", CandlestickInterval.MIN1, callback),
+        kwargs={"running_callback": running_callback},
+        daemon=True,
+    )
+    thread.start()
+    thread.join(duration + 30)
+    return latencies
+
+
+def run_websocket(server, rates, duration):
+    best = 0.0
+    for rate in rates:
+        latencies = run_subscription(server, rate, duration)
+        delivered = report("subscription", str(rate) + "/s", latencies, duration, "msg/s")
+        if delivered >= 0.95 * rate:
+            best = max(best, delivered)
+    return best
+
+
+async def run_accounts_async(server, accounts, orders):
+    sent = dict()
+    latencies = list()
+    done = asyncio.Event()
+    expected = accounts * orders
+
+    def on_event(account, event):
+        client_order_id = getattr(event, "clientOrderId", None)
+        start = sent.pop((account.name, client_order_id), None)
+        if start is not None:
+            latencies.append(time.perf_counter() - start)
+            if len(latencies) == expected:
+                done.set()
+
+    pool = AccountPool(uri=server.uri, url=server.url)
+    for i in range(accounts):
+        api_key, secret_key = "key-%d" % i, "secret-%d" % i
+        server.add_account(api_key, secret_key)
+        pool.add("account-%d" % i, api_key, secret_key, callback=on_event)
+    connections = server.connection_count
+    await pool.start()
+    while not all(group.connected for group in pool.groups):
+        await asyncio.sleep(0.01)
+
+    async def place(account):
+        for n in range(orders):
+            client_order_id = "%s-%d" % (account.name, n)
+            sent[(account.name, client_order_id)] = time.perf_counter()
+            await account.client.post_order(
+                symbol="BTCUSDT", side="BUY", ordertype="LIMIT", quantity=0.001,
+                price=9000, timeInForce="GTC", newClientOrderId=client_order_id,
+            )
+
+    start = time.perf_counter()
+    await pool.gather(place)
+    try:
+        await asyncio.wait_for(done.wait(), 10)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - start
+    keepalives = server.keepalive_count
+    await pool.keepalive_all()
+    print("account pool: %d accounts, %d user data sockets, %d new connections, "
+          "%d keepalives per round" % (accounts, len(pool.groups),
+                                       server.connection_count - connections,
+                                       server.keepalive_count - keepalives))
+    await pool.close()
+    return latencies, elapsed
+
+
+def run_accounts(server, accounts, orders):
+    latencies, elapsed = asyncio.run(run_accounts_async(server, accounts, orders))
+    return report("account pool", "n=" + str(accounts), latencies, elapsed, "upd/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rates", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--duration", type=float, default=3.0,
+                        help="seconds per websocket rate step")
+    parser.add_argument("--signed", action="store_true",
+                        help="use the signed GET /fapi/v1/openOrders instead of the price ticker")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds of artificial server latency per REST response")
+    parser.add_argument("--skip-websocket", action="store_true")
+    parser.add_argument("--accounts", type=int, default=0,
+                        help="accounts in one AccountPool, each placing --orders orders")
+    parser.add_argument("--orders", type=int, default=10)
+    args = parser.parse_args()
+
+    server = FakeBinanceServer(weight_limit=10 ** 9, latency=args.latency).start_in_thread()
+    summary = dict()
+    summary["sync"] = run_sync(server, args.requests, args.concurrency, args.signed)
+    summary["async"] = run_async(server, args.requests, args.concurrency, args.signed)
+    if not args.skip_websocket:
+        summary["subscription"] = run_websocket(server, args.rates, args.duration)
+    if args.accounts:
+        summary["accounts"] = run_accounts(server, args.accounts, args.orders)
+    server.stop_thread()
+    print("=== maximum sustained throughput ===")
+    for mode, throughput in summary.items():
+        print("%-14s %10.1f/s" % (mode, throughput))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Realistic payloads for the benchmarks. REST bodies come from the stand-in server
+handlers so they have the exact shape the exchange returns; websocket frames are
+taken from the Binance futures stream documentation.
+"""
+import json
+
+from benchmarks.fakeserver import FakeBinanceServer
+
+SYMBOLS = {
+    "BTCUSDT": 9700.0, "ETHUSDT": 240.0, "BCHUSDT": 250.0, "XRPUSDT": 0.2,
+    "EOSUSDT": 2.6, "LTCUSDT": 46.0, "TRXUSDT": 0.017, "ETCUSDT": 7.0,
+    "LINKUSDT": 4.5, "XLMUSDT": 0.07, "ADAUSDT": 0.08, "XMRUSDT": 65.0,
+}
+
+
+def server():
+    fake = FakeBinanceServer(symbols=SYMBOLS)
+    fake.new_order({"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT",
+                    "quantity": "0.100", "price": "9600.00", "timeInForce": "GTC"})
+    return fake
+
+
+def rest_payloads():
+    """Mapping of RestApiRequestImpl method name to (args, response text)."""
+    fake = server()
+    symbol = {"symbol": "BTCUSDT"}
+    limit = {"symbol": "BTCUSDT", "limit": "500"}
+    cases = {
+        "get_exchange_information": ((), fake.exchange_information({})),
+        "get_order_book": (("BTCUSDT", 500), fake.order_book(limit)),
+        "get_recent_trades_list": (("BTCUSDT", 500), fake.recent_trades(limit)),
+        "get_aggregate_trades_list": (
+            ("BTCUSDT", None, None, None, 500), fake.aggregate_trades(limit)),
+        "get_candlestick_data": (
+            ("BTCUSDT", "1m", None, None, 500), fake.klines(limit)),
+        "get_mark_price": (("BTCUSDT",), fake.mark_price(symbol)),
+        "get_funding_rate": (
+            ("BTCUSDT", None, None, 100), fake.funding_rate({"symbol": "BTCUSDT"})),
+        "get_ticker_price_change_statistics": ((None,), fake.ticker_24hr({})),
+        "get_symbol_price_ticker": ((None,), fake.ticker_price({})),
+        "get_symbol_orderbook_ticker": ((None,), fake.book_ticker({})),
+        "get_open_interest": (("BTCUSDT",), fake.open_interest(symbol)),
+        "post_order": (
+            ("BTCUSDT", "BUY", "LIMIT", "GTC", 0.1, None, 9600.0, None, None, None),
+            fake.orders[1]),
+        "get_open_orders": ((None,), fake.open_orders({})),
+        "get_balance": ((), fake.balance({})),
+        "get_account_information": ((), fake.account({})),
+        "change_initial_leverage": (("BTCUSDT", 20), fake.leverage(symbol)),
+        "get_position": ((), fake.position_risk({})),
+        "get_account_trades": (
+            ("BTCUSDT", None, None, None, 500), fake.user_trades(limit)),
+        "get_income_history": (
+            (None, None, None, None, 100), fake.income({"limit": "100"})),
+        "get_position_margin_change_history": (
+            ("BTCUSDT", None, None, None, None), fake.position_margin_history(symbol)),
+    }
+    return {name: (args, json.dumps(body)) for name, (args, body) in cases.items()}
+
+
+def depth_event(levels):
+    return json.dumps({
+        "e": "depthUpdate", "E": 1591702613943, "T": 1591702613940, "s": "BTCUSDT",
+        "U": 157, "u": 160, "pu": 149,
+        "b": [["%.2f" % (9700 - 0.1 * i), "%.3f" % (1 + i % 7)] for i in range(levels)],
+        "a": [["%.2f" % (9700.1 + 0.1 * i), "%.3f" % (1 + i % 5)] for i in range(levels)],
+    })
+
+
+AGGREGATE_TRADE_EVENT = json.dumps({
+    "e": "aggTrade", "E": 123456789, "s": "BTCUSDT", "a": 5933014, "p": "0.001",
+    "q": "100", "f": 100, "l": 105, "T": 123456785, "m": True,
+})
+
+MARK_PRICE_EVENT = json.dumps({
+    "e": "markPriceUpdate", "E": 1562305380000, "s": "BTCUSDT", "p": "11794.15000000",
+    "i": "11784.62659091", "r": "0.00038167", "T": 1562306400000,
+})
+
+CANDLESTICK_EVENT = json.dumps({
+    "e": "kline", "E": 123456789, "s": "BTCUSDT",
+    "k": {"t": 123400000, "T": 123460000, "s": "BTCUSDT", "i": "1m", "f": 100,
+          "L": 200, "o": "0.0010", "c": "0.0020", "h": "0.0025", "l": "0.0015",
+          "v": "1000", "n": 100, "x": False, "q": "1.0000", "V": "500",
+          "Q": "0.500", "B": "123456"},
+})
+
+BOOK_TICKER_EVENT = json.dumps({
+    "u": 400900217, "E": 1568014460893, "T": 1568014460891, "s": "BNBUSDT",
+    "b": "25.35190000", "B": "31.21000000", "a": "25.36520000", "A": "40.66000000",
+})
+
+ORDER_UPDATE_EVENT = json.dumps({
+    "e": "ORDER_TRADE_UPDATE", "E": 1568879465651, "T": 1568879465650,
+    "o": {"s": "BTCUSDT", "c": "TEST", "S": "SELL", "o": "TRAILING_STOP_MARKET",
+          "f": "GTC", "q": "0.001", "p": "0", "ap": "0", "sp": "7103.04", "x": "NEW",
+          "X": "NEW", "i": 8886774, "l": "0", "z": "0", "L": "0", "N": "USDT",
+          "n": "0", "T": 1568879465651, "t": 0, "b": "0", "a": "9.91", "m": False,
+          "R": False, "wt": "CONTRACT_PRICE"},
+})
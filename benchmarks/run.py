@@ -0,0 +1,174 @@
+"""
+Run the benchmark suite and track the results per commit.
+
+    python -m benchmarks.run                       # run everything, save, compare
+    python -m benchmarks.run -k depth              # only benchmarks matching "depth"
+    python -m benchmarks.run --against 1157583     # compare with a given commit
+    python -m benchmarks.run --threshold 0.2 --no-save
+
+Benchmarks follow the asv layout: every benchmarks/bench_*.py module holds classes
+with optional `params`, `setup` and `teardown`, and `time_*` methods that are
+timed. Results are written to benchmarks/results/<commit>.json; the previous
+result file (or the one given with --against) is used as the baseline and the run
+exits with status 1 when any benchmark got slower than the threshold, so it can
+gate a release.
+"""
+import argparse
+import datetime
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import timeit
+
+import benchmarks
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def git(*args):
+    try:
+        return subprocess.check_output(
+            ("git",) + args, cwd=os.path.dirname(RESULTS_DIR), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def discover(pattern=None):
+    """Yield (name, callable) for every time_* benchmark and parameter value."""
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module("benchmarks." + module_info.name)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [name for name in dir(cls) if name.startswith("time_")]
+            for param in getattr(cls, "params", [None]):
+                for method in methods:
+                    name = ".".join((module_info.name, class_name, method))
+                    if param is not None:
+                        name += "(" + str(param) + ")"
+                    if pattern and pattern not in name:
+                        continue
+                    yield name, cls, method, param
+
+
+def measure(cls, method, param, min_time=0.2, repeat=5):
+    """Best per-call time in seconds, asv style: calibrate then take the minimum."""
+    instance = cls()
+    args = () if param is None else (param,)
+    if hasattr(instance, "setup"):
+        instance.setup(*args)
+    func = getattr(instance, method)
+
+    def call():
+        func(*args)
+
+    try:
+        number = 1
+        while True:
+            elapsed = timeit.timeit(call, number=number)
+            if elapsed >= min_time / repeat or number >= 1 << 20:
+                break
+            number *= 2
+        return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown(*args)
+
+
+def load(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def previous_results(commit):
+    """Most recent saved run for another commit."""
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    candidates = list()
+    for file_name in os.listdir(RESULTS_DIR):
+        if file_name.endswith(".json") and file_name[:-5] != commit:
+            path = os.path.join(RESULTS_DIR, file_name)
+            candidates.append((load(path).get("date", ""), path))
+    if not candidates:
+        return None
+    return load(max(candidates)[1])
+
+
+def compare(results, baseline, threshold):
+    regressions = list()
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = seconds / before
+        if ratio > 1 + threshold:
+            regressions.append((name, before, seconds, ratio))
+    return regressions
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return "%8.2fus" % (seconds * 1e6)
+    return "%8.2fms" % (seconds * 1e3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks containing this")
+    parser.add_argument("--against", help="commit to compare with, defaults to the latest run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds spent timing each benchmark")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+
+    results = dict()
+    for name, cls, method, param in discover(args.pattern):
+        results[name] = measure(cls, method, param, args.min_time)
+        print("%-70s %s" % (name, format_time(results[name])))
+
+    if args.against:
+        path = os.path.join(RESULTS_DIR, args.against + ".json")
+        baseline = load(path) if os.path.exists(path) else None
+    else:
+        baseline = previous_results(commit)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        record = {
+            "commit": commit,
+            "date": datetime.datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "results": results,
+        }
+        with open(os.path.join(RESULTS_DIR, commit + ".json"), "w") as file:
+            json.dump(record, file, indent=1, sort_keys=True)
+
+    if baseline is None:
+        print("no baseline to compare with")
+        return 0
+    regressions = compare(results, baseline["results"], args.threshold)
+    print("=== compared with %s ===" % baseline["commit"])
+    for name, before, after, ratio in regressions:
+        print("%-70s %s -> %s  x%.2f" % (name, format_time(before), format_time(after), ratio))
+    if regressions:
+        print("%d regression(s) above %d%%" % (len(regressions), args.threshold * 100))
+        return 1
+    print("no regressions above %d%%" % (args.threshold * 100))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
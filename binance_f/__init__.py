@@ -1,3 +1,28 @@
-from binance_f.requstclient import RequestClient
-from binance_f.subscriptionclient import SubscriptionClient, HelperMixin
-from binance_f.async_requestclient import RequestClient as AsyncRequestClient
+"""
+The clients are imported on first attribute access (PEP 562): "import binance_f"
+loads nothing else, and binance_f.AsyncRequestClient does not pull in requests,
+websocket-client or apscheduler. Constants stay in binance_f.model.constant.
+"""
+import importlib
+
+_LAZY = {
+    "RequestClient": ("binance_f.requstclient", "RequestClient"),
+    "SubscriptionClient": ("binance_f.subscriptionclient", "SubscriptionClient"),
+    "HelperMixin": ("binance_f.subscriptionclient", "HelperMixin"),
+    "AsyncRequestClient": ("binance_f.async_requestclient", "RequestClient"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    target = _LAZY.get(name)
+    if target is None:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    value = getattr(importlib.import_module(target[0]), target[1])
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
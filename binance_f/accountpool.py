@@ -0,0 +1,318 @@
+import asyncio
+
+from binance_f.async_requestclient import RequestClient as AsyncRequestClient
+from binance_f.base.log import USER_DATA, get_logger
+from binance_f.constant.system import WebSocketDefine
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.httpsession import AsyncHttpSession
+from binance_f.impl.ratelimiter import WeightRateLimiter
+from binance_f.impl.utils.channels import combined_channel
+from binance_f.impl.utils.jsonwrapper import JsonWrapper
+from binance_f.impl.utils.timeservice import ServerTimeSync
+from binance_f.impl.websocketconnection import WebsocketConnection
+from binance_f.impl.websocketrequest import WebsocketRequest
+from binance_f.impl.websocketrequestimpl import parse_user_data_event
+from binance_f.listenkey import (
+    KEEPALIVE_INTERVAL,
+    combined_uri,
+    send_or_defer,
+    unsubscribe_channel,
+    user_data_watch_dog,
+)
+from binance_f.model.constant import SubscribeMessageType
+
+logger = get_logger(USER_DATA)
+
+# Streams one combined connection may carry.
+STREAMS_PER_CONNECTION = 200
+
+
+class Account(object):
+    def __init__(self, name, client, callback=None):
+        self.name = name
+        self.client = client
+        self.callback = callback
+        self.listen_key = None
+        self.group = None
+
+
+class StreamGroup(object):
+    def __init__(self, pool, uri, watch_dog):
+        """Up to STREAMS_PER_CONNECTION listen keys sharing one combined connection."""
+        self.pool = pool
+        self.accounts = dict()
+        request = WebsocketRequest()
+        request.name = "account_pool_user_data"
+        request.subscription_handler = self.subscription_handler
+        request.json_parser = self.json_parse
+        request.update_callback = self.update_callback
+        request.error_handler = pool.error_handler
+        self.connection = WebsocketConnection(None, None, uri, watch_dog, request)
+        self.started = False
+        self.connected = False
+
+    def start(self):
+        if not self.started:
+            self.started = True
+            self.connection.connect()
+
+    def subscription_handler(self, connection):
+        # Also runs after a watchdog reconnect, so it always sends the current keys.
+        self.connected = True
+        if self.accounts:
+            connection.send(combined_channel(list(self.accounts)))
+
+    def json_parse(self, json_wrapper):
+        stream = json_wrapper.get_string_or_default("stream", None)
+        account = self.accounts.get(stream)
+        if account is None:
+            return None
+        return account, parse_user_data_event(JsonWrapper(json_wrapper.json_object["data"]))
+
+    def update_callback(self, data_type, payload):
+        # RESPONSE carries the id of a SUBSCRIBE acknowledgement.
+        if data_type == SubscribeMessageType.PAYLOAD and payload is not None and payload[1] is not None:
+            self.pool.deliver(*payload)
+
+    def add(self, account):
+        self.accounts[account.listen_key] = account
+        account.group = self
+        if self.connected:
+            send_or_defer(self.connection, combined_channel([account.listen_key]))
+
+    def replace(self, account, old_key):
+        self.accounts.pop(old_key, None)
+        if self.connected and old_key:
+            send_or_defer(self.connection, unsubscribe_channel([old_key]))
+        self.add(account)
+
+
+class AccountPool(object):
+    def __init__(
+        self,
+        uri=None,
+        session=None,
+        http2=False,
+        rate_limiter=None,
+        streams_per_connection=STREAMS_PER_CONNECTION,
+        keepalive_interval=KEEPALIVE_INTERVAL,
+        concurrency=10,
+        error_handler=None,
+        retry_interval=5,
+        **client_kwargs
+    ):
+        """
+        Many accounts in one process on one event loop.
+
+        Every account's AsyncRequestClient shares one connection pool, one weight rate
+        limiter (limits are per IP) and one server clock offset. The user data streams
+        of all accounts are combined, up to streams_per_connection listen keys per
+        socket, and every listen key is kept alive from one timer.
+
+            pool = AccountPool(url=..., uri=...)
+            pool.add("alice", api_key, secret_key, callback=on_event)
+            await pool.start()
+
+        :param uri: Websocket base uri, defaults to WebSocketDefine.Uri.
+        :param session: AsyncHttpSession for every account, a new one by default.
+            close() leaves a session passed here open.
+        :param http2: Create that session with HTTP/2 multiplexing.
+        :param rate_limiter: WeightRateLimiter shared by the accounts, a new one by default.
+        :param keepalive_interval: Seconds between listen key keepalive rounds.
+        :param concurrency: Accounts served at once when starting or keeping alive.
+        :param error_handler: Called with BinanceApiException from the user data sockets
+            and from failed keepalives and listen key renewals.
+        :param retry_interval: Seconds before retrying a failed listen key renewal.
+        :param client_kwargs: Forwarded to each AsyncRequestClient, e.g. url or policies.
+        """
+        self.uri = combined_uri(uri or WebSocketDefine.Uri)
+        self.session = session or AsyncHttpSession(http2=http2)
+        self.__own_session = session is None
+        self.rate_limiter = rate_limiter or WeightRateLimiter()
+        self.time_sync = client_kwargs.pop("time_sync", None) or ServerTimeSync()
+        self.streams_per_connection = streams_per_connection
+        self.keepalive_interval = keepalive_interval
+        self.concurrency = concurrency
+        self.error_handler = error_handler
+        self.retry_interval = retry_interval
+        self.client_kwargs = client_kwargs
+        self.client_kwargs.setdefault("debug", False)
+        self.accounts = dict()
+        self.groups = list()
+        self.loop = None
+        self.keepalive_task = None
+        self.time_sync_task = None
+        # Account name to its renewal in progress, see renew_soon().
+        self.renewals = dict()
+        self.__watch_dog = None
+
+    def __getitem__(self, name):
+        return self.accounts[name]
+
+    def __iter__(self):
+        return iter(self.accounts.values())
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def add(self, name, api_key, secret_key, callback=None):
+        """
+        Register an account; its client can be used right away.
+
+        :param callback: Called on the pool's loop with (account, event) for every
+            OrderUpdate, AccountUpdate and ListenKeyExpired; may be a coroutine function.
+        """
+        if name in self.accounts:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR, "[Input] Account " + str(name) + " already added"
+            )
+        client = AsyncRequestClient(
+            api_key=api_key,
+            secret_key=secret_key,
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            time_sync=self.time_sync,
+            **self.client_kwargs
+        )
+        account = self.accounts[name] = Account(name, client, callback)
+        if self.loop is not None:
+            asyncio.ensure_future(self.__open_stream(account))
+        return account
+
+    async def gather(self, func, accounts=None):
+        """await func(account) for every account, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(account):
+            async with semaphore:
+                return await func(account)
+
+        accounts = list(self.accounts.values()) if accounts is None else accounts
+        return await asyncio.gather(*[run(account) for account in accounts], return_exceptions=True)
+
+    async def start(self, sync_time=True):
+        """Open every account's user data stream and start the keepalive timer."""
+        self.loop = asyncio.get_event_loop()
+        if sync_time and self.accounts:
+            first = next(iter(self.accounts.values()))
+            await self.time_sync.async_synchronize(first.client.get_servertime)
+            self.time_sync_task = asyncio.ensure_future(
+                self.time_sync.run_forever(first.client.get_servertime)
+            )
+        accounts = list(self.accounts.values())
+        results = await self.gather(self.__open_stream, accounts)
+        for account, result in zip(accounts, results):
+            if isinstance(result, Exception):
+                self.__failed(account, "user data stream not started", result)
+                self.renew_soon(account)
+        self.keepalive_task = asyncio.ensure_future(self.__keepalive_forever())
+        return self
+
+    def __group(self):
+        for group in self.groups:
+            if len(group.accounts) < self.streams_per_connection:
+                return group
+        if self.__watch_dog is None:
+            self.__watch_dog = user_data_watch_dog(self.keepalive_interval)
+        group = StreamGroup(self, self.uri, self.__watch_dog)
+        self.groups.append(group)
+        return group
+
+    async def __open_stream(self, account):
+        account.listen_key = await account.client.start_user_data_stream()
+        group = self.__group()
+        group.add(account)
+        group.start()
+
+    async def renew(self, account):
+        """Replace an expired listen key and move the stream to the new one."""
+        old_key = account.listen_key
+        account.listen_key = await account.client.start_user_data_stream()
+        if account.group is None:
+            group = self.__group()
+            group.add(account)
+            group.start()
+        elif account.listen_key != old_key:
+            account.group.replace(account, old_key)
+
+    def renew_soon(self, account):
+        """
+        renew() in a task retried every retry_interval until it succeeds; concurrent
+        calls for one account share it.
+        """
+        task = self.renewals.get(account.name)
+        if task is None or task.done():
+            task = self.renewals[account.name] = asyncio.ensure_future(self.__renew_until_done(account))
+        return task
+
+    async def __renew_until_done(self, account):
+        while True:
+            try:
+                await self.renew(account)
+                return
+            except Exception as e:
+                self.__failed(account, "listen key renewal failed, retrying in %ss" % self.retry_interval, e)
+            await asyncio.sleep(self.retry_interval)
+
+    def __failed(self, account, what, error):
+        logger.error("account %s: %s: %s", account.name, what, error)
+        if self.error_handler is not None and isinstance(error, BinanceApiException):
+            self.error_handler(error)
+
+    async def __keepalive(self, account):
+        if account.name in self.renewals and not self.renewals[account.name].done():
+            return
+        try:
+            await account.client.keep_user_data_stream()
+        except BinanceApiException as e:
+            logger.warning("account %s: keepalive failed, renewing listen key: %s", account.name, e)
+            self.renew_soon(account)
+
+    async def keepalive_all(self):
+        accounts = list(self.accounts.values())
+        results = await self.gather(self.__keepalive, accounts)
+        for account, result in zip(accounts, results):
+            if isinstance(result, Exception):
+                self.__failed(account, "keepalive failed", result)
+        return results
+
+    async def __keepalive_forever(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            await self.keepalive_all()
+
+    def deliver(self, account, event):
+        """Hand an event from a socket thread to the pool's loop."""
+        self.loop.call_soon_threadsafe(self.__dispatch, account, event)
+
+    def __dispatch(self, account, event):
+        if getattr(event, "eventType", None) == "listenKeyExpired":
+            self.renew_soon(account)
+        if account.callback is None:
+            return
+        try:
+            result = account.callback(account, event)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception:
+            logger.exception("account %s: callback failed", account.name)
+
+    async def close(self, close_streams=False):
+        """
+        Stop the timers and sockets and release the pooled connections.
+
+        :param close_streams: Also DELETE every listen key.
+        """
+        for task in [self.keepalive_task, self.time_sync_task] + list(self.renewals.values()):
+            if task is not None:
+                task.cancel()
+        self.renewals.clear()
+        if close_streams:
+            await self.gather(lambda account: account.client.close_user_data_stream())
+        for group in self.groups:
+            if group.connection.ws is not None:
+                group.connection.close()
+        if self.__watch_dog is not None:
+            self.__watch_dog.graceful_shutdown()
+        if self.__own_session:
+            await self.session.aclose()
@@ -1,36 +1,195 @@
+import asyncio
+
 from binance_f.constant.system import RestApiDefine
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.endpoints import ENDPOINTS, OneOrMany
 from binance_f.impl.restapirequestimpl import RestApiRequestImpl
+from binance_f.impl.httpsession import DEFAULT_SESSION, AsyncHttpSession
+from binance_f.impl.paginator import IdCursor, TimeCursor, paginate
 from binance_f.impl.restapiinvoker import call_async as call_sync
+from binance_f.impl.utils.timeservice import ServerTimeSync
 from binance_f.model.constant import *
 
+
+def fan_out_weights(method, symbol, kwargs):
+    """
+    Request weight of one call for a single symbol and of the call without a symbol,
+    None when the endpoint has no all-symbols form returning one item per symbol.
+    """
+    endpoint = ENDPOINTS.get(method)
+    if endpoint is None:
+        return 1, None
+    single_weight = endpoint.weight_of(dict(kwargs, symbol=symbol))
+    if not isinstance(endpoint.parser, OneOrMany):
+        return single_weight, None
+    return single_weight, endpoint.all_symbols_weight
+
+
 class RequestClient(object):
     def __init__(self, debug=True, **kwargs):
         """
         Create the request client instance.
+        :param debug: Log requests and responses on the "binance-futures.rest" logger
+            at DEBUG level; nothing is formatted unless that level is enabled.
         :param kwargs: The option of request connection.
             api_key: The public key applied from Binance.
             secret_key: The private key applied from Binance.
             server_url: The URL name like "https://api.binance.com".
+            time_sync: A ServerTimeSync used to timestamp signed requests, see sync_time().
+            recv_window: recvWindow sent with signed requests in milliseconds. Once the
+                clock offset is measured this can be tightened well below 60000.
+            recorder: A TrafficRecorder capturing every request/response pair.
+            transport: A ReplayTransport answering requests from a recording instead
+                of the network.
+            rate_limiter: A WeightRateLimiter shared by the clients of one IP; requests
+                wait for the next weight window instead of getting HTTP 429.
+            policies: A PolicySet with the timeouts, retries and hedging per endpoint,
+                defaults to binance_f.impl.requestpolicy.DEFAULT_POLICIES.
+            http2: Multiplex requests over one HTTP/2 connection per host. Needs the
+                optional h2 package (pip install httpx[http2]).
+            session: An AsyncHttpSession holding the pooled connections, shared by
+                default between every client of the process. close() leaves a session
+                passed here, or the shared one, open for the other clients.
+            response_cache: A ResponseCache coalescing identical GETs in flight and
+                caching market data for short per-endpoint TTLs.
         """
         api_key = None
         secret_key = None
         url = RestApiDefine.Url
+        time_sync = None
+        recv_window = 60000
         if "api_key" in kwargs:
             api_key = kwargs["api_key"]
         if "secret_key" in kwargs:
             secret_key = kwargs["secret_key"]
         if "url" in kwargs:
             url = kwargs["url"]
+        if "time_sync" in kwargs:
+            time_sync = kwargs["time_sync"]
+        if "recv_window" in kwargs:
+            recv_window = kwargs["recv_window"]
+        self.recorder = kwargs.get("recorder")
+        self.transport = kwargs.get("transport")
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.policies = kwargs.get("policies")
+        self.session = kwargs.get("session")
+        # Only a session created here is closed by close().
+        self.__own_session = False
+        if self.session is None and kwargs.get("http2"):
+            self.session = AsyncHttpSession(http2=True)
+            self.__own_session = True
+        self.response_cache = kwargs.get("response_cache")
         self.debug = debug
+        self.time_sync_task = None
         try:
             self.request_impl = RestApiRequestImpl(
-                api_key, secret_key, url, develop=debug
+                api_key,
+                secret_key,
+                url,
+                develop=debug,
+                time_sync=time_sync,
+                recv_window=recv_window,
             )
         except Exception:
             pass
 
     async def call_sync(self, coroutine):
-        return await call_sync(coroutine, debug=self.debug)
+        if self.response_cache is not None and coroutine.method == "GET":
+            return await self.response_cache.call(coroutine, self.send)
+        return await self.send(coroutine)
+
+    async def send(self, coroutine):
+        if self.transport is not None:
+            return await self.transport.call_async(coroutine)
+        return await call_sync(
+            coroutine,
+            debug=self.debug,
+            recorder=self.recorder,
+            rate_limiter=self.rate_limiter,
+            policies=self.policies,
+            session=self.session,
+        )
+
+    def pool_stats(self) -> dict:
+        """Requests, in-flight peak, connections opened and HTTP versions seen."""
+        return (self.session or DEFAULT_SESSION).stats.as_dict()
+
+    async def close(self):
+        """
+        Stop the sync_time() refresh and close the pooled connections of a session
+        this client created (http2=True) on the running loop.
+        """
+        if self.time_sync_task is not None:
+            self.time_sync_task.cancel()
+            self.time_sync_task = None
+        if self.__own_session:
+            await self.session.aclose()
+
+    async def sync_time(self, background=True, **kwargs) -> "ServerTimeSync":
+        """
+        Measure the local/server clock offset and use it for every signed request.
+
+        :param background: Keep refreshing the offset from a task on the running loop.
+        :param kwargs: samples and refresh_interval forwarded to ServerTimeSync.
+        """
+        time_sync = self.request_impl.time_sync
+        if time_sync is None:
+            time_sync = ServerTimeSync(**kwargs)
+            self.request_impl.time_sync = time_sync
+        await time_sync.async_synchronize(self.get_servertime)
+        if background and self.time_sync_task is None:
+            self.time_sync_task = asyncio.ensure_future(
+                time_sync.run_forever(self.get_servertime)
+            )
+        return time_sync
+
+    async def fan_out(
+        self, method, symbols, concurrency=10, return_exceptions=False, **kwargs
+    ) -> dict:
+        """
+        Call one market data endpoint for many symbols and merge the results.
+
+        When the endpoint has an all-symbols form that costs less weight than N
+        single calls (e.g. ticker/price: 2 against N), one unfiltered request is
+        made and filtered; otherwise the per-symbol calls run concurrently, at most
+        `concurrency` at a time.
+
+            prices = await client.fan_out("get_symbol_price_ticker", ["BTCUSDT", "ETHUSDT"])
+            prices["ETHUSDT"].price
+
+        :param method: Name of an AsyncRequestClient method taking symbol first.
+        :param return_exceptions: Map failed symbols to their exception instead of
+            raising the first error.
+        :param kwargs: Other arguments forwarded to every call.
+        :return: dict of symbol to result; single element lists from the ticker
+            endpoints are unwrapped. Symbols unknown to the exchange are left out
+            when the all-symbols form is used.
+        """
+        endpoint = getattr(self, method, None)
+        if endpoint is None:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR, "[Input] Unknown method " + str(method)
+            )
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        single_weight, all_weight = fan_out_weights(method, symbols[0] if symbols else None, kwargs)
+        if all_weight is not None and all_weight < single_weight * len(symbols):
+            wanted = set(symbols)
+            items = await endpoint(symbol=None, **kwargs)
+            return {item.symbol: item for item in items if item.symbol in wanted}
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(symbol):
+            async with semaphore:
+                value = await endpoint(symbol, **kwargs)
+            if all_weight is not None and isinstance(value, list) and len(value) == 1:
+                return value[0]
+            return value
+
+        values = await asyncio.gather(
+            *[one(symbol) for symbol in symbols], return_exceptions=return_exceptions
+        )
+        return dict(zip(symbols, values))
 
     async def get_servertime(self) -> any:
         """
@@ -456,6 +615,136 @@ class RequestClient(object):
             )
         )
 
+    def iter_account_trades(
+        self,
+        symbol: "str",
+        startTime: "long" = None,
+        endTime: "long" = None,
+        fromId: "long" = None,
+        limit: "int" = 1000,
+        prefetch: "bool" = True,
+    ):
+        """
+        Async iterator over GET /fapi/v1/userTrades, following fromId page by page.
+
+        async for trade in client.iter_account_trades("BTCUSDT", startTime=since):
+            ...
+
+        Pass rate_limiter= to the client to keep the paging under the weight limit.
+        """
+
+        async def fetch(params):
+            return await self.call_sync(
+                self.request_impl.get_account_trades(
+                    symbol, params["startTime"], params["endTime"], params["fromId"], limit
+                )
+            )
+
+        params = {"startTime": startTime, "endTime": endTime, "fromId": fromId}
+        if fromId is not None:
+            params["startTime"] = params["endTime"] = None
+        return paginate(
+            fetch, params, limit, IdCursor("id", "fromId"), prefetch,
+            end_time=endTime, time_of=lambda item: item.time,
+        )
+
+    def iter_aggregate_trades(
+        self,
+        symbol: "str",
+        fromId: "long" = None,
+        startTime: "long" = None,
+        endTime: "long" = None,
+        limit: "int" = 1000,
+        prefetch: "bool" = True,
+    ):
+        """
+        Async iterator over GET /fapi/v1/aggTrades, following fromId page by page.
+        """
+
+        async def fetch(params):
+            return await self.call_sync(
+                self.request_impl.get_aggregate_trades_list(
+                    symbol, params["fromId"], params["startTime"], params["endTime"], limit
+                )
+            )
+
+        params = {"fromId": fromId, "startTime": startTime, "endTime": endTime}
+        if fromId is not None:
+            params["startTime"] = params["endTime"] = None
+        return paginate(
+            fetch, params, limit, IdCursor("id", "fromId"), prefetch,
+            end_time=endTime, time_of=lambda item: item.time,
+        )
+
+    def iter_all_orders(
+        self,
+        symbol: "str",
+        orderId: "long" = None,
+        startTime: "long" = None,
+        endTime: "long" = None,
+        limit: "int" = 1000,
+        prefetch: "bool" = True,
+    ):
+        """
+        Async iterator over GET /fapi/v1/allOrders, following orderId page by page.
+        """
+
+        async def fetch(params):
+            return await self.call_sync(
+                self.request_impl.get_all_orders(
+                    symbol, params["orderId"], params["startTime"], params["endTime"], limit
+                )
+            )
+
+        params = {"orderId": orderId, "startTime": startTime, "endTime": endTime}
+        return paginate(
+            fetch, params, limit, IdCursor("orderId", "orderId", drop=("startTime",)), prefetch
+        )
+
+    def iter_income_history(
+        self,
+        symbol: "str" = None,
+        incomeType: "IncomeType" = IncomeType.INVALID,
+        startTime: "long" = None,
+        endTime: "long" = None,
+        limit: "int" = 1000,
+        prefetch: "bool" = True,
+    ):
+        """
+        Async iterator over GET /fapi/v1/income, following startTime page by page.
+        """
+
+        async def fetch(params):
+            return await self.call_sync(
+                self.request_impl.get_income_history(
+                    symbol, incomeType, params["startTime"], endTime, limit
+                )
+            )
+
+        return paginate(fetch, {"startTime": startTime}, limit, TimeCursor("tranId"), prefetch)
+
+    def iter_position_margin_change_history(
+        self,
+        symbol: "str",
+        type: "int" = None,
+        startTime: "int" = None,
+        endTime: "int" = None,
+        limit: "int" = 500,
+        prefetch: "bool" = True,
+    ):
+        """
+        Async iterator over GET /fapi/v1/positionMargin/history, following startTime.
+        """
+
+        async def fetch(params):
+            return await self.call_sync(
+                self.request_impl.get_position_margin_change_history(
+                    symbol, type, params["startTime"], endTime, limit
+                )
+            )
+
+        return paginate(fetch, {"startTime": startTime}, limit, TimeCursor(), prefetch)
+
     async def start_user_data_stream(self) -> any:
         """
         Start User Data Stream (USER_STREAM)
@@ -0,0 +1,115 @@
+import itertools
+import json
+import logging
+import sys
+import threading
+import time
+
+ROOT_LOGGER = "binance-futures"
+
+REST = ROOT_LOGGER + ".rest"
+WEBSOCKET = ROOT_LOGGER + ".websocket"
+USER_DATA = ROOT_LOGGER + ".userdata"
+TRADER = ROOT_LOGGER + ".trader"
+
+
+def get_logger(subsystem=None):
+    """
+    Logger for one subsystem, e.g. get_logger("rest") -> "binance-futures.rest".
+
+    Subsystem loggers propagate to "binance-futures", so a handler or level set
+    there still covers everything. Nothing is configured by the library: with no
+    handler and the default WARNING level, debug calls stop at isEnabledFor().
+    """
+    if not subsystem:
+        return logging.getLogger(ROOT_LOGGER)
+    if subsystem.startswith(ROOT_LOGGER):
+        return logging.getLogger(subsystem)
+    return logging.getLogger(ROOT_LOGGER + "." + subsystem)
+
+
+class SampleFilter(logging.Filter):
+    """
+    Keep one record out of `every` for each (logger, message template) pair, and
+    at most `per_second` of them when given. Warnings and errors always pass.
+    """
+
+    def __init__(self, every=1, per_second=None, level=logging.WARNING):
+        super(SampleFilter, self).__init__()
+        self.every = max(1, int(every))
+        self.per_second = per_second
+        self.level = level
+        self.__counters = dict()
+        self.__window = (0, 0)
+        self.__lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.level:
+            return True
+        key = (record.name, record.msg)
+        counter = self.__counters.get(key)
+        if counter is None:
+            with self.__lock:
+                counter = self.__counters.setdefault(key, itertools.count())
+        if next(counter) % self.every:
+            return False
+        if self.per_second is None:
+            return True
+        second = int(time.monotonic())
+        with self.__lock:
+            window, count = self.__window
+            if window != second:
+                window, count = second, 0
+            if count >= self.per_second:
+                return False
+            self.__window = (window, count + 1)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, plus any `extra`
+    fields passed to the logging call and the exception text when present.
+    """
+
+    RESERVED = frozenset(
+        logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+    ) | {"message", "asctime"}
+
+    def format(self, record):
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in record.__dict__.items():
+            if name not in self.RESERVED:
+                data[name] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, separators=(",", ":"))
+
+
+def setup_logging(level=logging.INFO, json_output=False, stream=None,
+                  sample_every=1, sample_per_second=None, subsystem=None):
+    """
+    Attach one stream handler to "binance-futures" (or to a single subsystem).
+
+    :param json_output: Emit JsonFormatter lines instead of plain text.
+    :param sample_every: Keep one debug/info record out of this many per template.
+    :param sample_per_second: Upper bound of debug/info records per second.
+    """
+    logger = get_logger(subsystem)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if json_output:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+        )
+    if sample_every > 1 or sample_per_second is not None:
+        handler.addFilter(SampleFilter(sample_every, sample_per_second))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return logger
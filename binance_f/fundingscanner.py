@@ -0,0 +1,207 @@
+import time
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model.constant import SubscribeMessageType
+from binance_f.tickbuffer import load_numpy
+
+# Columns kept per symbol, filled from markPriceUpdate frames.
+COLUMNS = ("mark_price", "index_price", "funding_rate", "next_funding_time", "event_time")
+# Values derived from the columns on every query.
+DERIVED = ("premium", "annualized_funding")
+
+
+class FundingScanner(object):
+    def __init__(self, capacity=512, funding_hours=8, on_update=None):
+        """
+        Funding rate, mark and index price and next funding time of every perpetual,
+        kept in NumPy columns from the all-market mark price stream so screening is
+        a vectorized query instead of one REST call per symbol:
+
+            scanner = FundingScanner()
+            sub_client.subscribe_funding_scanner_event(scanner)
+            scanner.top(10, "annualized_funding")
+            scanner.where("premium", above=0.001)
+
+        Rows are added as symbols first appear and never removed; pass max_age to
+        the queries to leave out symbols the stream stopped reporting (delisted).
+        Needs numpy (pip install binance-futures[numpy]).
+
+        :param capacity: Initial number of rows, doubled when full.
+        :param funding_hours: Hours between fundings, for annualized_funding.
+        :param on_update: Called with the scanner after each stream frame.
+        """
+        self.numpy = load_numpy("The funding scanner")
+        self.funding_hours = funding_hours
+        self.on_update = on_update
+        self.symbols = list()
+        self.rows = dict()
+        self.updates = 0
+        numpy = self.numpy
+        self.mark_price = numpy.zeros(capacity, dtype=numpy.float64)
+        self.index_price = numpy.zeros(capacity, dtype=numpy.float64)
+        self.funding_rate = numpy.zeros(capacity, dtype=numpy.float64)
+        self.next_funding_time = numpy.zeros(capacity, dtype=numpy.int64)
+        self.event_time = numpy.zeros(capacity, dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.rows
+
+    def __getitem__(self, symbol):
+        row = self.rows[symbol]
+        result = {"symbol": symbol}
+        for name in COLUMNS:
+            result[name] = getattr(self, name)[row].item()
+        for name in DERIVED:
+            result[name] = self.column(name)[row].item()
+        return result
+
+    def __row(self, symbol):
+        row = self.rows.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == len(self.mark_price):
+                self.__grow()
+            self.symbols.append(symbol)
+            self.rows[symbol] = row
+        return row
+
+    def __grow(self):
+        numpy = self.numpy
+        for name in COLUMNS:
+            values = getattr(self, name)
+            grown = numpy.zeros(len(values) * 2, dtype=values.dtype)
+            grown[:len(values)] = values
+            setattr(self, name, grown)
+
+    def update(self, items):
+        """Write markPriceUpdate dicts (as sent by the stream) into the columns."""
+        items = [item for item in items if item.get("e") == "markPriceUpdate"]
+        if not items:
+            return
+        numpy = self.numpy
+        rows = numpy.fromiter((self.__row(item["s"]) for item in items), numpy.intp, len(items))
+        self.mark_price[rows] = [float(item["p"]) for item in items]
+        self.index_price[rows] = [float(item.get("i") or 0) for item in items]
+        self.funding_rate[rows] = [float(item.get("r") or 0) for item in items]
+        self.next_funding_time[rows] = [item.get("T", 0) for item in items]
+        self.event_time[rows] = [item["E"] for item in items]
+        self.updates += 1
+
+    def parse(self, json_wrapper):
+        """json_parser for !markPrice@arr, or a <symbol>@markPrice stream: returns the scanner."""
+        data = json_wrapper.json_object
+        if isinstance(data, dict) and "data" in data:
+            data = data["data"]
+        self.update(data if isinstance(data, list) else [data])
+        return self
+
+    def on_event(self, event):
+        """Write a MarkPriceEvent from subscribe_mark_price_event."""
+        self.update([{
+            "e": "markPriceUpdate", "E": event.eventTime, "s": event.symbol,
+            "p": event.markPrice, "r": event.fundingRate, "T": event.nextFundingTime,
+        }])
+
+    def callback(self, data_type, event):
+        """
+        Subscription callback. Frames parsed by parse() arrive as the scanner itself;
+        MarkPriceEvent from subscribe_mark_price_event is written here.
+        """
+        if data_type != SubscribeMessageType.PAYLOAD or event is None:
+            return
+        if event is not self:
+            self.on_event(event)
+        if self.on_update is not None:
+            self.on_update(self)
+
+    def column(self, name):
+        """One column or derived value over all symbols, in the order of .symbols."""
+        count = len(self.symbols)
+        if name in COLUMNS:
+            return getattr(self, name)[:count]
+        numpy = self.numpy
+        if name == "premium":
+            mark, index = self.mark_price[:count], self.index_price[:count]
+            # nan where the index price is unknown, never selected by the queries.
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                return numpy.where(index > 0, (mark - index) / index, numpy.nan)
+        if name == "annualized_funding":
+            return self.funding_rate[:count] * (24.0 / self.funding_hours * 365)
+        raise BinanceApiException(
+            BinanceApiException.INPUT_ERROR,
+            "[Input] Unknown column " + str(name) + ", use one of " + ", ".join(COLUMNS + DERIVED),
+        )
+
+    def __fresh(self, max_age, now):
+        if max_age is None:
+            return None
+        if now is None:
+            now = int(time.time() * 1000)
+        return self.event_time[:len(self.symbols)] >= now - int(max_age * 1000)
+
+    def __keys(self, values, absolute):
+        keys = values.astype(self.numpy.float64)
+        return self.numpy.abs(keys) if absolute else keys
+
+    def __selected(self, rows, values):
+        return [(self.symbols[row], values[row].item()) for row in rows]
+
+    def top(self, n=10, by="funding_rate", ascending=False, absolute=False, max_age=None, now=None):
+        """
+        The n symbols with the highest (lowest if ascending) value as (symbol, value)
+        pairs, best first.
+
+        :param by: A column or derived value: funding_rate, annualized_funding,
+            premium, mark_price, index_price, next_funding_time, event_time.
+        :param absolute: Rank by magnitude, e.g. the largest funding either way.
+        :param max_age: Leave out symbols without an update for that many seconds.
+        """
+        numpy = self.numpy
+        values = self.column(by)
+        keys = self.__keys(values, absolute)
+        if not ascending:
+            keys = -keys
+        mask = ~numpy.isnan(keys)
+        fresh = self.__fresh(max_age, now)
+        if fresh is not None:
+            mask &= fresh
+        candidates = numpy.flatnonzero(mask)
+        if n <= 0:
+            return list()
+        if n < len(candidates):
+            candidates = candidates[numpy.argpartition(keys[candidates], n)[:n]]
+        rows = candidates[numpy.argsort(keys[candidates], kind="stable")]
+        return self.__selected(rows, values)
+
+    def where(self, by="funding_rate", above=None, below=None, absolute=False, max_age=None, now=None):
+        """
+        Symbols whose value is above and/or below the thresholds (exclusive) as
+        (symbol, value) pairs, largest first.
+        """
+        numpy = self.numpy
+        values = self.column(by)
+        keys = self.__keys(values, absolute)
+        mask = ~numpy.isnan(keys)
+        if above is not None:
+            mask &= keys > above
+        if below is not None:
+            mask &= keys < below
+        fresh = self.__fresh(max_age, now)
+        if fresh is not None:
+            mask &= fresh
+        rows = numpy.flatnonzero(mask)
+        rows = rows[numpy.argsort(-keys[rows], kind="stable")]
+        return self.__selected(rows, values)
+
+    def funding_within(self, seconds, now=None):
+        """Symbols whose next funding is at most seconds away, soonest first."""
+        numpy = self.numpy
+        if now is None:
+            now = int(time.time() * 1000)
+        remaining = self.next_funding_time[:len(self.symbols)] - now
+        rows = numpy.flatnonzero((remaining >= 0) & (remaining <= int(seconds * 1000)))
+        rows = rows[numpy.argsort(remaining[rows], kind="stable")]
+        return self.__selected(rows, self.funding_rate)
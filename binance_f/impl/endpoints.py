@@ -0,0 +1,334 @@
+"""
+Declarative table of the REST endpoints.
+
+Each Endpoint holds the HTTP method, path, security type, request weight,
+parameter schema and response parser of one RestApiRequestImpl method. The same
+table drives request construction, the rate limiter weights, the request
+policies and response cache, fan_out() and the fake server, so an endpoint is
+described once.
+"""
+import collections
+import json
+import re
+import urllib.parse
+import uuid
+
+from binance_f import model
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.utils.urlparamsbuilder import format_decimal
+
+NONE_SECURITY = "NONE"
+API_KEY_SECURITY = "API_KEY"
+SIGNED_SECURITY = "SIGNED"
+
+JSON_CONTENT = "application/json"
+FORM_CONTENT = "application/x-www-form-urlencoded"
+
+# Characters urlencode() leaves as they are; most values need no quoting at all.
+_is_safe = re.compile(r"[A-Za-z0-9_.\-~]*\Z").match
+
+
+def encode_value(value):
+    """Query text of one parameter value, as UrlParamsBuilder and urlencode() write it."""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, float):
+        text = format_decimal(value)
+    elif isinstance(value, list):
+        text = json.dumps(value)
+    else:
+        text = str(value)
+    if _is_safe(text):
+        return text
+    return urllib.parse.quote_plus(text)
+
+
+# Parsers. Models are looked up by name on first use so the table loads no model.
+
+
+class One(object):
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, json_wrapper):
+        return getattr(model, self.model_name).json_parse(json_wrapper)
+
+
+class Many(object):
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, json_wrapper):
+        parse = getattr(model, self.model_name).json_parse
+        return [parse(item) for item in json_wrapper.convert_2_array().get_items()]
+
+
+class OneOrMany(object):
+    def __init__(self, model_name):
+        """A list either way: one object for a symbol, an array for all symbols."""
+        self.model_name = model_name
+
+    def __call__(self, json_wrapper):
+        parse = getattr(model, self.model_name).json_parse
+        if isinstance(json_wrapper.json_object, list):
+            return [parse(item) for item in json_wrapper.convert_2_array().get_items()]
+        return [parse(json_wrapper)]
+
+
+class Field(object):
+    def __init__(self, name, getter="get_string"):
+        self.name = name
+        self.getter = getter
+
+    def __call__(self, json_wrapper):
+        return getattr(json_wrapper, self.getter)(self.name)
+
+
+def ok(json_wrapper):
+    return "OK"
+
+
+def orders_or_errors(json_wrapper):
+    """Batch answers mix orders with {"code", "msg"} for the ones that failed."""
+    result = list()
+    for item in json_wrapper.convert_2_array().get_items():
+        if item.contain_key("code"):
+            result.append(model.Msg.json_parse(item))
+        else:
+            result.append(model.Order.json_parse(item))
+    return result
+
+
+# Weights that depend on the parameters.
+
+
+def depth_weight(params):
+    limit = int(params.get("limit") or 500)
+    if limit <= 50:
+        return 2
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 10
+    return 20
+
+
+def klines_weight(params):
+    limit = int(params.get("limit") or 500)
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def new_client_order_id():
+    # A client id known before sending makes a timed out order safe to retry.
+    return uuid.uuid4().hex
+
+
+class Endpoint(object):
+    __slots__ = (
+        "name", "method", "path", "security", "weight", "all_symbols_weight",
+        "params", "wire_names", "required", "defaults", "parser", "content_type",
+        "market_data", "cache_ttl", "lookup", "prefixes",
+    )
+
+    def __init__(
+        self,
+        name,
+        method,
+        path,
+        security,
+        parser,
+        params=(),
+        required=(),
+        weight=1,
+        all_symbols_weight=None,
+        defaults=None,
+        market_data=False,
+        cache_ttl=None,
+        lookup=None,
+    ):
+        """
+        :param name: RestApiRequestImpl (and client) method name.
+        :param params: Argument names in call order; (argument, query name) where they differ.
+        :param required: Arguments that must not be None.
+        :param weight: Request weight, or a callable of the query params returning it.
+        :param all_symbols_weight: Weight when called without a symbol, None when the
+            endpoint has no all-symbols form.
+        :param defaults: Argument name to a callable producing the value when None.
+        :param market_data: Public market data, retried (and hedged if enabled) as such.
+        :param cache_ttl: Seconds ResponseCache keeps the parsed answer.
+        :param lookup: Callable (request_impl, arguments) returning the request that
+            finds this write on the exchange, see RestApiRequest.lookup.
+        """
+        self.name = name
+        self.method = method
+        self.path = path
+        self.security = security
+        self.parser = parser
+        self.params = tuple(param if isinstance(param, str) else param[0] for param in params)
+        self.wire_names = tuple(param if isinstance(param, str) else param[1] for param in params)
+        # "name=" ready to be joined with the encoded value.
+        self.prefixes = tuple(urllib.parse.quote_plus(name) + "=" for name in self.wire_names)
+        self.required = tuple(required)
+        self.weight = weight
+        self.all_symbols_weight = all_symbols_weight
+        self.defaults = dict(defaults or {})
+        self.market_data = market_data
+        self.cache_ttl = cache_ttl
+        self.lookup = lookup
+        self.content_type = FORM_CONTENT if method == "GET" and security == SIGNED_SECURITY else JSON_CONTENT
+
+    def __repr__(self):
+        return "Endpoint(" + self.method + " " + self.path + ")"
+
+    def arguments(self, args, kwargs):
+        """Bind positional and keyword arguments to the parameter names, checked."""
+        if len(args) > len(self.params):
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] " + self.name + " takes " + str(len(self.params)) + " arguments",
+            )
+        values = dict(zip(self.params, args))
+        for name, value in kwargs.items():
+            if name not in self.params:
+                raise BinanceApiException(
+                    BinanceApiException.INPUT_ERROR,
+                    "[Input] " + self.name + " has no parameter " + name,
+                )
+            values[name] = value
+        for name, default in self.defaults.items():
+            if values.get(name) is None:
+                values[name] = default()
+        for name in self.required:
+            if values.get(name) is None:
+                raise BinanceApiException(
+                    BinanceApiException.INPUT_ERROR, "[Input] " + name + " should not be null"
+                )
+        return values
+
+    def query(self, values):
+        """URL query of the non-None arguments in schema order, without signature."""
+        parts = list()
+        for name, prefix in zip(self.params, self.prefixes):
+            value = values.get(name)
+            if value is not None:
+                parts.append(prefix + encode_value(value))
+        return "&".join(parts)
+
+    def weight_of(self, values):
+        if self.all_symbols_weight is not None and values.get("symbol") is None:
+            return self.all_symbols_weight
+        weight = self.weight
+        if callable(weight):
+            return weight({
+                wire: values[name] for name, wire in zip(self.params, self.wire_names)
+                if values.get(name) is not None
+            })
+        return weight
+
+    def wire_weight(self, params):
+        """Weight of a request seen from the server side, by its query params."""
+        if self.all_symbols_weight is not None and not params.get("symbol"):
+            return self.all_symbols_weight
+        return self.weight(params) if callable(self.weight) else self.weight
+
+
+def lookup_order(request_impl, values):
+    return request_impl.get_order(values["symbol"], None, values["newClientOrderId"])
+
+
+ENDPOINTS = collections.OrderedDict(
+    (endpoint.name, endpoint)
+    for endpoint in (
+        # Market data
+        Endpoint("get_servertime", "GET", "/fapi/v1/time", NONE_SECURITY,
+                 Field("serverTime", "get_int")),
+        Endpoint("get_exchange_information", "GET", "/fapi/v1/exchangeInfo", NONE_SECURITY,
+                 One("ExchangeInformation"), market_data=True, cache_ttl=300.0),
+        Endpoint("get_order_book", "GET", "/fapi/v1/depth", NONE_SECURITY,
+                 One("OrderBook"), ("symbol", "limit"), ("symbol",), weight=depth_weight,
+                 market_data=True),
+        Endpoint("get_recent_trades_list", "GET", "/fapi/v1/trades", NONE_SECURITY,
+                 Many("Trade"), ("symbol", "limit"), ("symbol",), market_data=True),
+        Endpoint("get_old_trade_lookup", "GET", "/fapi/v1/historicalTrades", API_KEY_SECURITY,
+                 Many("Trade"), ("symbol", "limit", "fromId"), ("symbol",), weight=5),
+        Endpoint("get_aggregate_trades_list", "GET", "/fapi/v1/aggTrades", NONE_SECURITY,
+                 Many("AggregateTrade"), ("symbol", "fromId", "startTime", "endTime", "limit"),
+                 ("symbol",), weight=20, market_data=True),
+        Endpoint("get_candlestick_data", "GET", "/fapi/v1/klines", NONE_SECURITY,
+                 Many("Candlestick"), ("symbol", "interval", "startTime", "endTime", "limit"),
+                 ("symbol", "interval"), weight=klines_weight, market_data=True),
+        Endpoint("get_mark_price", "GET", "/fapi/v1/premiumIndex", NONE_SECURITY,
+                 One("MarkPrice"), ("symbol",), ("symbol",), market_data=True, cache_ttl=1.0),
+        Endpoint("get_funding_rate", "GET", "/fapi/v1/fundingRate", NONE_SECURITY,
+                 Many("FundingRate"), ("symbol", "startTime", "endTime", "limit"), ("symbol",),
+                 cache_ttl=60.0),
+        Endpoint("get_ticker_price_change_statistics", "GET", "/fapi/v1/ticker/24hr",
+                 NONE_SECURITY, OneOrMany("TickerPriceChangeStatistics"), ("symbol",),
+                 all_symbols_weight=40, market_data=True, cache_ttl=2.0),
+        Endpoint("get_symbol_price_ticker", "GET", "/fapi/v1/ticker/price", NONE_SECURITY,
+                 OneOrMany("SymbolPrice"), ("symbol",), all_symbols_weight=2,
+                 market_data=True, cache_ttl=1.0),
+        Endpoint("get_symbol_orderbook_ticker", "GET", "/fapi/v1/ticker/bookTicker",
+                 NONE_SECURITY, OneOrMany("SymbolOrderBook"), ("symbol",),
+                 all_symbols_weight=2, market_data=True, cache_ttl=0.5),
+        Endpoint("get_open_interest", "GET", "/fapi/v1/openInterest", NONE_SECURITY,
+                 One("OpenInterest"), ("symbol",), market_data=True, cache_ttl=1.0),
+        Endpoint("get_liquidation_orders", "GET", "/fapi/v1/allForceOrders", NONE_SECURITY,
+                 Many("LiquidationOrder"), ("symbol", "startTime", "endTime", "limit"), weight=5),
+        # Trade
+        Endpoint("post_order", "POST", "/fapi/v1/order", SIGNED_SECURITY, One("Order"),
+                 ("symbol", "side", ("ordertype", "type"), "timeInForce", "quantity",
+                  "reduceOnly", "price", "newClientOrderId", "stopPrice", "workingType"),
+                 ("symbol", "side", "ordertype"),
+                 defaults={"newClientOrderId": new_client_order_id}, lookup=lookup_order),
+        Endpoint("get_order", "GET", "/fapi/v1/order", SIGNED_SECURITY, One("Order"),
+                 ("symbol", "orderId", "origClientOrderId"), ("symbol",)),
+        Endpoint("cancel_order", "DELETE", "/fapi/v1/order", SIGNED_SECURITY, One("Order"),
+                 ("symbol", "orderId", "origClientOrderId"), ("symbol",)),
+        Endpoint("cancel_all_orders", "DELETE", "/fapi/v1/allOpenOrders", SIGNED_SECURITY,
+                 Many("Order"), ("symbol",), ("symbol",)),
+        Endpoint("cancel_list_orders", "DELETE", "/fapi/v1/batchOrders", SIGNED_SECURITY,
+                 orders_or_errors, ("symbol", "orderIdList", "origClientOrderIdList"),
+                 ("symbol",)),
+        Endpoint("get_open_orders", "GET", "/fapi/v1/openOrders", SIGNED_SECURITY,
+                 Many("Order"), ("symbol",), all_symbols_weight=40),
+        Endpoint("get_all_orders", "GET", "/fapi/v1/allOrders", SIGNED_SECURITY, Many("Order"),
+                 ("symbol", "orderId", "startTime", "endTime", "limit"), ("symbol",), weight=5),
+        # Account
+        Endpoint("get_balance", "GET", "/fapi/v1/balance", SIGNED_SECURITY, Many("Balance"),
+                 weight=5),
+        Endpoint("get_account_information", "GET", "/fapi/v1/account", SIGNED_SECURITY,
+                 One("AccountInformation"), weight=5),
+        Endpoint("change_initial_leverage", "POST", "/fapi/v1/leverage", SIGNED_SECURITY,
+                 One("Leverage"), ("symbol", "leverage"), ("symbol", "leverage")),
+        Endpoint("change_margin_type", "POST", "/fapi/v1/marginType", SIGNED_SECURITY,
+                 One("ChangeMarginType"), ("symbol", "marginType"), ("symbol", "marginType")),
+        Endpoint("change_position_margin", "POST", "/fapi/v1/positionMargin", SIGNED_SECURITY,
+                 One("PositionMargin"), ("symbol", "amount", "type"), ("symbol", "amount", "type")),
+        Endpoint("get_position_margin_change_history", "GET", "/fapi/v1/positionMargin/history",
+                 SIGNED_SECURITY, Many("PositionMarginHist"),
+                 ("symbol", "type", "startTime", "endTime", "limit"), ("symbol",)),
+        Endpoint("get_position", "GET", "/fapi/v1/positionRisk", SIGNED_SECURITY,
+                 Many("Position"), weight=5),
+        Endpoint("get_account_trades", "GET", "/fapi/v1/userTrades", SIGNED_SECURITY,
+                 Many("MyTrade"), ("symbol", "startTime", "endTime", "fromId", "limit"),
+                 ("symbol",), weight=5),
+        Endpoint("get_income_history", "GET", "/fapi/v1/income", SIGNED_SECURITY,
+                 Many("Income"), ("symbol", "incomeType", "startTime", "endTime", "limit"),
+                 weight=30),
+        # User data stream
+        Endpoint("start_user_data_stream", "POST", "/fapi/v1/listenKey", SIGNED_SECURITY,
+                 Field("listenKey")),
+        Endpoint("keep_user_data_stream", "PUT", "/fapi/v1/listenKey", SIGNED_SECURITY, ok),
+        Endpoint("close_user_data_stream", "DELETE", "/fapi/v1/listenKey", SIGNED_SECURITY, ok),
+    )
+)
+
+# (method, path) -> Endpoint, for the server side.
+BY_ROUTE = {(endpoint.method, endpoint.path): endpoint for endpoint in ENDPOINTS.values()}
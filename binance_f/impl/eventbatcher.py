@@ -0,0 +1,161 @@
+import collections
+import threading
+import time
+
+from binance_f.model.constant import SubscribeMessageType
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_INTERVAL_US = 1000
+
+
+def columns(events):
+    """Columnar form of model events: attribute name -> list of values, in event order."""
+    if not events:
+        return dict()
+    rows = [vars(event) for event in events]
+    return {name: [row[name] for row in rows] for name in rows[0]}
+
+
+class EventBatcher(object):
+    def __init__(self, callback, on_error, batch_size=None, batch_interval_us=None, columnar=False):
+        """
+        Collects the parsed events of a subscription and hands them to the callback
+        together, as callback(SubscribeMessageType.PAYLOAD, batch), after batch_size
+        messages or once the oldest pending message is batch_interval_us old.
+
+        Lists parsed from array streams (!ticker@arr, !miniTicker@arr) are flattened
+        into the batch, which is a list of events or, with columnar, a dict of
+        attribute name to list of values (see columns()).
+
+        Messages only check the batch size; a flusher thread delivers batches that
+        reach batch_interval_us first. The callback runs outside the batcher's lock,
+        so it may call flush() or close() (e.g. unsubscribe), and a slow callback does
+        not hold up add(): batches queue until the thread delivering catches up.
+        flush() and close() return once everything queued is delivered. Deliveries
+        are serialized and in order, the callback never runs twice at once.
+
+        This is not a general speed-up: benchmarks/bench_dispatch.py measures
+        per-frame callbacks as fast or faster, both for an in-place consumer and for
+        a queue hand-off. Use it when the consumer works on whole batches anyway.
+
+        :param on_error: Called with a message when the callback raises.
+        """
+        self.callback = callback
+        self.on_error = on_error
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.batch_interval = (batch_interval_us or DEFAULT_BATCH_INTERVAL_US) / 1e6
+        self.columnar = columnar
+        self.__events = list()
+        self.__messages = 0
+        # perf_counter() of the oldest pending message, None when nothing is pending.
+        self.__first = None
+        self.__condition = threading.Condition(threading.Lock())
+        # Batches taken under the condition, delivered in order by whoever holds
+        # the delivery lock.
+        self.__ready = collections.deque()
+        self.__delivery = threading.Lock()
+        # Thread ident inside the callback, so flush() from the callback does not wait
+        # for itself.
+        self.__deliverer = None
+        self.__thread = None
+        # Whether the flusher waits for a first message rather than for a deadline.
+        self.__idle = False
+        self.__closed = False
+
+    def __len__(self):
+        return len(self.__events)
+
+    def add(self, event):
+        """Add the parsed event of one message, delivering the batch when full."""
+        with self.__condition:
+            if event.__class__ is list:
+                self.__events.extend(event)
+            elif event is not None:
+                self.__events.append(event)
+            self.__messages += 1
+            if self.__first is None:
+                self.__first = time.perf_counter()
+                if self.__thread is None:
+                    self.__thread = threading.Thread(target=self.__run, name="ws-batcher", daemon=True)
+                    self.__thread.start()
+                elif self.__idle:
+                    self.__condition.notify()
+            if self.__messages < self.batch_size:
+                return
+            self.__take()
+        self.__deliver()
+
+    def flush(self):
+        """Deliver what is pending now, e.g. before a message that must stay in order."""
+        with self.__condition:
+            if self.__first is not None:
+                self.__take()
+        self.__deliver(wait=True)
+
+    def close(self):
+        with self.__condition:
+            if self.__first is not None:
+                self.__take()
+            self.__closed = True
+            self.__condition.notify()
+        self.__deliver(wait=True)
+
+    def __take(self):
+        # Called with the condition held.
+        events, self.__events = self.__events, list()
+        self.__messages = 0
+        self.__first = None
+        if events:
+            self.__ready.append(events)
+
+    def __deliver(self, wait=False):
+        # Called without the condition. When another thread is delivering, it also
+        # delivers what was just queued: it checks the queue again after releasing.
+        # With wait, the queue is drained before returning, unless this thread is the
+        # one delivering, in which case the delivery in progress drains it.
+        if wait and self.__deliverer != threading.get_ident():
+            with self.__delivery:
+                self.__drain()
+        ready = self.__ready
+        while ready and self.__delivery.acquire(False):
+            try:
+                self.__drain()
+            finally:
+                self.__delivery.release()
+
+    def __drain(self):
+        # Called with the delivery lock held.
+        self.__deliverer = threading.get_ident()
+        try:
+            ready = self.__ready
+            while ready:
+                self.__call(ready.popleft())
+        finally:
+            self.__deliverer = None
+
+    def __call(self, events):
+        try:
+            self.callback(SubscribeMessageType.PAYLOAD, columns(events) if self.columnar else events)
+        except Exception as e:
+            self.on_error(
+                "Process error: "
+                + str(e)
+                + " You should capture the exception in your error handler"
+            )
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                if self.__closed:
+                    return
+                if self.__first is None:
+                    self.__idle = True
+                    self.__condition.wait()
+                    self.__idle = False
+                    continue
+                remaining = self.__first + self.batch_interval - time.perf_counter()
+                if remaining > 0:
+                    self.__condition.wait(remaining)
+                    continue
+                self.__take()
+            self.__deliver()
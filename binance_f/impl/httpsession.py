@@ -0,0 +1,147 @@
+import asyncio
+import collections
+import weakref
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+
+
+class PoolStats(object):
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.http_versions = collections.Counter()
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "http_versions": dict(self.http_versions),
+        }
+
+
+class AsyncHttpSession(object):
+    def __init__(
+        self,
+        http2=False,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30.0,
+    ):
+        """
+        httpx.AsyncClient instances shared by every request to the same host, so TLS
+        handshakes and connections are reused instead of paid per call.
+
+        :param http2: Negotiate HTTP/2 (ALPN on https, prior knowledge on http), so a
+            burst of concurrent requests is multiplexed over one connection. Needs
+            the optional h2 package: pip install httpx[http2].
+        :param max_connections: Upper bound of open connections per host.
+        """
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise BinanceApiException(
+                    BinanceApiException.ENV_ERROR,
+                    "[Environment] http2=True needs the h2 package: pip install httpx[http2]",
+                )
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.stats = PoolStats()
+        # An AsyncClient is bound to the loop it first ran on; keep one per loop.
+        self.__clients = weakref.WeakKeyDictionary()
+        # Per loop, the task closing its clients when asyncio.run() ends, see __closer().
+        self.__closers = weakref.WeakKeyDictionary()
+
+    def __create(self, host):
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        cleartext_http2 = self.http2 and host.startswith("http://")
+        return httpx.AsyncClient(
+            base_url=host,
+            limits=limits,
+            http2=self.http2,
+            # httpx only negotiates HTTP/2 through TLS ALPN; plain http needs prior knowledge.
+            http1=not cleartext_http2,
+        )
+
+    def client(self, host):
+        loop = asyncio.get_event_loop()
+        clients = self.__clients.get(loop)
+        if clients is None:
+            clients = self.__clients[loop] = dict()
+            self.__closers[loop] = loop.create_task(self.__closer(loop))
+        client = clients.get(host)
+        if client is None:
+            client = clients[host] = self.__create(host)
+        return client
+
+    async def __trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats.tls_handshakes += 1
+
+    async def request(self, request, timeout):
+        client = self.client(request.host)
+        stats = self.stats
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            response = await client.request(
+                request.method,
+                request.url,
+                headers=request.header,
+                timeout=timeout,
+                extensions={"trace": self.__trace},
+            )
+        finally:
+            stats.in_flight -= 1
+        stats.http_versions[response.http_version] += 1
+        return response
+
+    async def __closer(self, loop):
+        # The clients hold connections referencing their loop, so neither would ever
+        # be collected. asyncio.run() cancels the tasks left at exit, which closes them.
+        try:
+            await loop.create_future()
+        finally:
+            await self.__close(loop)
+
+    async def __close(self, loop):
+        clients = self.__clients.pop(loop, None) or dict()
+        self.__closers.pop(loop, None)
+        for client in clients.values():
+            await client.aclose()
+
+    async def aclose(self):
+        """
+        Close the clients of the running loop. Requests of every RequestClient sharing
+        this session then fail, so only its owner closes it at shutdown.
+
+        The clients of a loop are also closed when asyncio.run() returns; a loop driven
+        by hand should await aclose() before loop.close().
+        """
+        loop = asyncio.get_event_loop()
+        closer = self.__closers.get(loop)
+        await self.__close(loop)
+        if closer is not None:
+            closer.cancel()
+
+
+# Process-global: every AsyncRequestClient created without session= or http2=True
+# shares these connections, on whatever loop it runs.
+DEFAULT_SESSION = AsyncHttpSession()
@@ -0,0 +1,130 @@
+import asyncio
+
+from binance_f.base.log import REST, get_logger
+
+logger = get_logger(REST)
+
+
+class IdCursor(object):
+    def __init__(self, attribute, param, drop=("startTime", "endTime")):
+        """
+        Page by ascending id: the next page starts at the last id + 1.
+
+        :param attribute: Model attribute holding the id, e.g. "id" for MyTrade.
+        :param param: Query parameter taking the id, e.g. "fromId".
+        :param drop: Parameters the endpoint rejects in combination with the id.
+        """
+        self.attribute = attribute
+        self.param = param
+        self.drop = drop
+
+    def accept(self, item):
+        return True
+
+    def next_params(self, page, params):
+        result = dict(params)
+        for name in self.drop:
+            result[name] = None
+        result[self.param] = getattr(page[-1], self.attribute) + 1
+        return result
+
+
+class TimeCursor(object):
+    def __init__(self, id_attribute=None, attribute="time", param="startTime"):
+        """
+        Page by time for endpoints without an id cursor.
+
+        The next page starts at the last timestamp again, not one millisecond later,
+        so records sharing that millisecond are not lost. The ones already yielded
+        are recognised by id_attribute (e.g. "tranId" for Income) when every record
+        at that millisecond has one; otherwise the first records of that millisecond
+        are skipped by count, so identical records, such as two equal funding fees,
+        are all kept.
+        """
+        self.id_attribute = id_attribute
+        self.attribute = attribute
+        self.param = param
+        self.boundary = None
+        # Ids yielded at the boundary, None to skip by count.
+        self.seen = None
+        # Records at the boundary still to skip on the current page.
+        self.skip = 0
+
+    def accept(self, item):
+        if getattr(item, self.attribute) != self.boundary:
+            return True
+        if self.seen is not None:
+            return getattr(item, self.id_attribute) not in self.seen
+        if self.skip > 0:
+            self.skip -= 1
+            return False
+        return True
+
+    def __ids(self, items):
+        if self.id_attribute is None:
+            return None
+        ids = [getattr(item, self.id_attribute, None) for item in items]
+        return None if None in ids else set(ids)
+
+    def next_params(self, page, params):
+        last = getattr(page[-1], self.attribute)
+        result = dict(params)
+        if last == self.boundary:
+            # A whole page inside one millisecond: the time cursor cannot split it.
+            logger.warning(
+                "more than %d records at %s=%s, skipping ahead", len(page), self.param, last
+            )
+            result[self.param] = last + 1
+            self.boundary = None
+            self.seen = None
+            self.skip = 0
+            return result
+        at_last = [item for item in page if getattr(item, self.attribute) == last]
+        self.boundary = last
+        self.seen = self.__ids(at_last)
+        self.skip = len(at_last)
+        result[self.param] = last
+        return result
+
+
+async def paginate(fetch, params, limit, cursor, prefetch=True, end_time=None, time_of=None):
+    """
+    Yield the items of a paged endpoint one by one.
+
+    :param fetch: Coroutine function taking the params dict and returning one page.
+    :param params: Query parameters of the first page.
+    :param limit: Page size asked for; a shorter page ends the iteration.
+    :param cursor: IdCursor or TimeCursor computing the next page's params.
+    :param prefetch: Request the next page before yielding the current one, so the
+        round trip overlaps with the consumer. At most two pages are held in memory.
+        Pages only wait for the weight limit when the client has a rate_limiter;
+        without one, a fast consumer walking a long history can get HTTP 429/418.
+    :param end_time: Stop at the first item with time_of(item) > end_time, for
+        cursors that had to drop endTime from the query.
+    """
+    pending = asyncio.ensure_future(fetch(params))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if not page:
+                return
+            # Filter against the previous boundary before the cursor moves on.
+            items = [item for item in page if cursor.accept(item)]
+            following = None
+            if len(page) >= limit:
+                following = cursor.next_params(page, params)
+                if prefetch:
+                    pending = asyncio.ensure_future(fetch(following))
+            for item in items:
+                if end_time is not None and time_of(item) > end_time:
+                    return
+                yield item
+            if following is None:
+                return
+            if pending is None:
+                pending = asyncio.ensure_future(fetch(following))
+            params = following
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
@@ -0,0 +1,83 @@
+import threading
+import time
+
+
+class WeightRateLimiter(object):
+    def __init__(self, weight_limit=2400, interval=60.0, safety=0.9):
+        """
+        Request weight budget over the exchange's fixed one minute windows.
+
+        Callers reserve the weight of a request before sending it and wait for the
+        next window when the budget is spent. The used weight reported by the server
+        in X-MBX-USED-WEIGHT-1M is folded back with observe(), so other processes
+        sharing the same IP are accounted for as well.
+
+        :param weight_limit: REQUEST_WEIGHT limit from exchangeInfo rateLimits.
+        :param interval: Window length in seconds.
+        :param safety: Fraction of the limit actually used, leaving headroom for
+            requests this limiter does not see.
+        """
+        self.weight_limit = weight_limit
+        self.interval = interval
+        self.budget = int(weight_limit * safety)
+        self.__window = 0
+        self.__used = 0
+        self.__lock = threading.Lock()
+
+    def __window_of(self, now):
+        return int(now // self.interval)
+
+    def reserve(self, weight=1):
+        """Book the weight and return the seconds to wait before sending."""
+        with self.__lock:
+            now = time.time()
+            window = self.__window_of(now)
+            if window > self.__window:
+                self.__window = window
+                self.__used = 0
+            if self.__used + weight <= self.budget or self.__used == 0:
+                self.__used += weight
+                if self.__window == window:
+                    return 0.0
+                return self.__window * self.interval - now
+            # Roll over to the next window, which may itself already be booked.
+            self.__window += 1
+            self.__used = weight
+            return max(0.0, self.__window * self.interval - now)
+
+    def acquire_sync(self, weight=1):
+        delay = self.reserve(weight)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self, weight=1):
+        delay = self.reserve(weight)
+        if delay:
+            import asyncio
+
+            await asyncio.sleep(delay)
+        return delay
+
+    def observe(self, used_weight):
+        """Fold in X-MBX-USED-WEIGHT-1M from a response of the current window."""
+        if used_weight is None:
+            return
+        try:
+            used_weight = int(used_weight)
+        except (TypeError, ValueError):
+            return
+        with self.__lock:
+            window = self.__window_of(time.time())
+            if window == self.__window:
+                self.__used = max(self.__used, used_weight)
+            elif window > self.__window:
+                self.__window = window
+                self.__used = used_weight
+
+    @property
+    def used_weight(self):
+        with self.__lock:
+            if self.__window_of(time.time()) != self.__window:
+                return 0
+            return self.__used
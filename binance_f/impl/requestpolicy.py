@@ -0,0 +1,127 @@
+import collections
+import random
+import threading
+
+from binance_f.impl.endpoints import ENDPOINTS
+
+# 429: rate limited, 418: IP banned for ignoring 429, 5xx: the exchange did not answer.
+# Binance documents 503 as "unknown status": the request may have been executed.
+RETRY_STATUSES = (418, 429, 500, 502, 503, 504)
+# The request was refused before execution, so even an order can be sent again.
+REJECTED_STATUSES = (418, 429)
+
+MARKET_DATA_PATHS = tuple(endpoint.path for endpoint in ENDPOINTS.values() if endpoint.market_data)
+
+
+class LatencyTracker(object):
+    def __init__(self, size=200):
+        """Recent round trips of one endpoint for the hedging delay."""
+        self.samples = collections.deque(maxlen=size)
+        self.__sorted = None
+        self.__lock = threading.Lock()
+
+    def add(self, seconds):
+        with self.__lock:
+            self.samples.append(seconds)
+            self.__sorted = None
+
+    def percentile(self, q):
+        with self.__lock:
+            if not self.samples:
+                return None
+            if self.__sorted is None:
+                self.__sorted = sorted(self.samples)
+            ordered = self.__sorted
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+
+class RequestPolicy(object):
+    def __init__(
+        self,
+        connect_timeout=3.05,
+        read_timeout=10.0,
+        retries=0,
+        backoff=0.1,
+        max_backoff=5.0,
+        hedge=False,
+        hedge_percentile=95,
+        hedge_min_samples=20,
+        hedge_min_delay=0.01,
+    ):
+        """
+        Timeouts, retries and hedging for one class of requests.
+
+        :param retries: Extra attempts after a timeout, connection error or a
+            RETRY_STATUSES answer. Only idempotent requests use them freely: a write
+            is sent again only when it was rejected before execution or, for orders,
+            after a lookup by newClientOrderId found nothing.
+        :param backoff: First retry delay in seconds, doubled per attempt with full
+            jitter and capped at max_backoff. Retry-After is honoured when longer.
+        :param hedge: Send a duplicate GET once the first one is slower than the
+            hedge_percentile of recent round trips, and use whichever answers first.
+            Only used by the async invoker.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.latency = collections.defaultdict(LatencyTracker)
+
+    def retry_delay(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def record(self, path, seconds):
+        if self.hedge:
+            self.latency[path].add(seconds)
+
+    def hedge_delay(self, path):
+        """Seconds to wait before the duplicate, None while too few samples exist."""
+        if not self.hedge:
+            return None
+        tracker = self.latency.get(path)
+        if tracker is None or len(tracker.samples) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, tracker.percentile(self.hedge_percentile))
+
+
+class PolicySet(object):
+    def __init__(self, read=None, write=None, market_data=None, endpoints=None):
+        """
+        Pick a RequestPolicy per request: an explicit endpoint entry first, then
+        market_data for the public GET paths, read for other GETs and write for
+        everything else.
+
+        :param market_data: Defaults to retries without hedging, since every duplicate
+            GET spends IP weight. Opt in with
+            PolicySet(market_data=RequestPolicy(retries=2, hedge=True)).
+        :param endpoints: Path to RequestPolicy, e.g. {"/fapi/v1/order": ...}.
+        """
+        self.read = read or RequestPolicy(retries=2)
+        self.write = write or RequestPolicy(retries=2)
+        self.market_data = market_data or RequestPolicy(retries=2)
+        self.endpoints = dict(endpoints or {})
+        for path in MARKET_DATA_PATHS:
+            self.endpoints.setdefault(path, self.market_data)
+
+    def for_request(self, request):
+        path = request.url.partition("?")[0]
+        policy = self.endpoints.get(path)
+        if policy is not None and (request.method == "GET" or policy is not self.market_data):
+            return path, policy
+        if request.method == "GET":
+            return path, self.read
+        return path, self.write
+
+
+DEFAULT_POLICIES = PolicySet()
@@ -0,0 +1,121 @@
+import asyncio
+import collections
+import time
+
+from binance_f.impl.endpoints import ENDPOINTS
+from binance_f.impl.trafficrecorder import normalize_url
+
+# Seconds a parsed response stays valid, by path. Only public market data is
+# cached (Endpoint.cache_ttl); every other GET is still coalesced while in flight.
+DEFAULT_TTLS = {
+    endpoint.path: endpoint.cache_ttl
+    for endpoint in ENDPOINTS.values()
+    if endpoint.cache_ttl is not None
+}
+
+
+class CacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ResponseCache(object):
+    def __init__(self, ttls=None, max_entries=512):
+        """
+        Single-flight GETs plus a short-TTL LRU cache of parsed market data.
+
+        Concurrent identical GETs (same host, path, query and API key, ignoring
+        timestamp and signature) share one HTTP call. Responses for the paths in
+        ttls are kept for that many seconds. Cached results are shared objects and
+        must be treated as read-only.
+
+        :param ttls: Path to seconds, defaults to DEFAULT_TTLS.
+        :param max_entries: Least recently used entries are evicted above this.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.stats = collections.defaultdict(CacheStats)
+        self.__entries = collections.OrderedDict()
+        self.__inflight = dict()
+
+    @staticmethod
+    def key(request):
+        return (
+            request.host,
+            normalize_url(request.url),
+            request.header.get("X-MBX-APIKEY"),
+        )
+
+    @staticmethod
+    def path_of(key):
+        return key[1].partition("?")[0]
+
+    def get(self, key):
+        entry = self.__entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self.__entries[key]
+            return False, None
+        self.__entries.move_to_end(key)
+        return True, value
+
+    def put(self, key, value, ttl):
+        self.__entries[key] = (time.monotonic() + ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            evicted = self.__entries.popitem(last=False)[0]
+            self.stats[self.path_of(evicted)].evictions += 1
+
+    def clear(self):
+        self.__entries.clear()
+
+    async def call(self, request, send):
+        """Answer a GET from the cache, an identical call in flight or send(request)."""
+        key = self.key(request)
+        path = self.path_of(key)
+        stats = self.stats[path]
+        ttl = self.ttls.get(path)
+        if ttl:
+            found, value = self.get(key)
+            if found:
+                stats.hits += 1
+                return value
+        task = self.__inflight.get(key)
+        if task is not None:
+            stats.coalesced += 1
+            # shield: a cancelled waiter must not cancel the call others share.
+            return await asyncio.shield(task)
+        stats.misses += 1
+        task = asyncio.ensure_future(send(request))
+        self.__inflight[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            if self.__inflight.get(key) is task:
+                del self.__inflight[key]
+        if ttl:
+            self.put(key, value, ttl)
+        return value
+
+    def hit_rates(self):
+        """Stats by path, e.g. {"/fapi/v1/premiumIndex": {"hits": 40, ...}}."""
+        return {path: stats.as_dict() for path, stats in self.stats.items()}
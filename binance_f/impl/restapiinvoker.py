@@ -1,10 +1,19 @@
-import requests
-import httpx
+import logging
+import time
+
+from binance_f.base.log import REST, get_logger
 from binance_f.exception.binanceapiexception import BinanceApiException
 from binance_f.impl.utils import *
+from binance_f.impl.requestpolicy import (
+    DEFAULT_POLICIES,
+    REJECTED_STATUSES,
+    RETRY_STATUSES,
+)
 from binance_f.impl.restapirequest import RestApiRequest
 
-# from binance_f.base.printobject import *
+logger = get_logger(REST)
+
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
 
 
 def check_response(json_wrapper):
@@ -31,39 +40,192 @@ def check_response(json_wrapper):
             )
 
 
-def call_sync(request, debug=True):
-    response = None
-    if request.method == "GET":
-        response = requests.get(request.host + request.url, headers=request.header)
-    elif request.method == "POST":
-        response = requests.post(request.host + request.url, headers=request.header)
-    elif request.method == "DELETE":
-        response = requests.delete(request.host + request.url, headers=request.header)
-    elif request.method == "PUT":
-        response = requests.put(request.host + request.url, headers=request.header)
-    if response:
-        json_wrapper = parse_json_from_string(response.text)
-        if debug:
-            print(response.text)
-        check_response(json_wrapper)
-        return request.json_parser(json_wrapper)
-
-
-async def call_async(request: RestApiRequest, debug=True):
-    async with httpx.AsyncClient(base_url=request.host,timeout=20) as client:
-        response = None
-        if request.method == "GET":
-            response = await client.get(request.url, headers=request.header)
-        elif request.method == "POST":
-            response = await client.post(request.url, headers=request.header)
-        elif request.method == "DELETE":
-            response = await client.delete(request.url, headers=request.header)
-        elif request.method == "PUT":
-            response = await client.put(request.url, headers=request.header)
-        if response:
-            json_wrapper = parse_json_from_string(response.text)
-            if debug:
-                print(response.text)
-            check_response(json_wrapper)
-            return request.json_parser(json_wrapper)
+def handle_response(request, text, debug=False, status=200):
+    try:
+        json_wrapper = parse_json_from_string(text)
+    except ValueError:
+        raise BinanceApiException(
+            BinanceApiException.EXEC_ERROR,
+            "[Executing] HTTP " + str(status) + ": " + text[:200],
+        )
+    if debug and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s -> %s", request.method, request.url, text)
+    check_response(json_wrapper)
+    if status >= 400:
+        raise BinanceApiException(
+            BinanceApiException.EXEC_ERROR, "[Executing] HTTP " + str(status) + ": " + text[:200]
+        )
+    return request.json_parser(json_wrapper)
+
+
+RETRY = "retry"
+LOOKUP = "lookup"
+
+
+def next_action(request, policy, attempt, status=None, sent=True):
+    """
+    What to do after a failed attempt: RETRY, LOOKUP (find out whether the order
+    went through before sending it again) or None to give up.
+
+    :param status: HTTP status, None after a timeout or connection error.
+    :param sent: False when the connection was never established.
+    """
+    if attempt >= policy.retries:
+        return None
+    if request.method == "GET" or not sent or status in REJECTED_STATUSES:
+        return RETRY
+    if request.lookup is not None:
+        return LOOKUP
+    return None
+
+
+def is_unknown_order(error):
+    return "-2013" in error.error_message
+
+
+def network_error(request, error):
+    return BinanceApiException(
+        BinanceApiException.RUNTIME_ERROR,
+        "[Network] " + request.method + " " + request.url.partition("?")[0]
+        + " failed: " + repr(error),
+    )
+
+
+def after_response(request, response, send_time, recorder, rate_limiter, policy, path):
+    receive_time = time.time()
+    policy.record(path, receive_time - send_time)
+    if recorder is not None:
+        recorder.record_rest(request, response.status_code, response.text, send_time, receive_time)
+    if rate_limiter is not None:
+        rate_limiter.observe(response.headers.get(USED_WEIGHT_HEADER))
+
+
+def call_sync(request, debug=True, recorder=None, rate_limiter=None, policies=None):
+    # Imported on first use: requests and httpx dominate the package import time.
+    import requests
 
+    path, policy = (policies or DEFAULT_POLICIES).for_request(request)
+    timeout = (policy.connect_timeout, policy.read_timeout)
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire_sync(request.weight)
+        if attempt and request.sign is not None:
+            request.url = request.sign()
+        send_time = time.time()
+        retry_after = None
+        try:
+            response = requests.request(
+                request.method, request.host + request.url, headers=request.header, timeout=timeout
+            )
+        except requests.RequestException as e:
+            action = next_action(
+                request, policy, attempt, sent=not isinstance(e, requests.ConnectTimeout)
+            )
+            if action is None:
+                raise network_error(request, e) from e
+        else:
+            after_response(request, response, send_time, recorder, rate_limiter, policy, path)
+            action = None
+            if response.status_code in RETRY_STATUSES:
+                action = next_action(request, policy, attempt, response.status_code)
+                retry_after = response.headers.get("Retry-After")
+            if action is None:
+                return handle_response(request, response.text, debug, response.status_code)
+        if action == LOOKUP:
+            try:
+                return call_sync(request.lookup(), debug, recorder, rate_limiter, policies)
+            except BinanceApiException as e:
+                if not is_unknown_order(e):
+                    raise
+        logger.warning("%s %s retry %d", request.method, path, attempt + 1)
+        time.sleep(policy.retry_delay(attempt, retry_after))
+        attempt += 1
+
+
+async def first_completed(tasks):
+    """Result of the first task to succeed; the error of the last one if all fail."""
+    import asyncio
+
+    pending = set(tasks)
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def call_async(
+    request: RestApiRequest,
+    debug=True,
+    recorder=None,
+    rate_limiter=None,
+    policies=None,
+    session=None,
+):
+    import asyncio
+    import httpx
+
+    from binance_f.impl.httpsession import DEFAULT_SESSION
+
+    session = session or DEFAULT_SESSION
+    path, policy = (policies or DEFAULT_POLICIES).for_request(request)
+    timeout = httpx.Timeout(policy.read_timeout, connect=policy.connect_timeout)
+
+    async def send(resend):
+        if rate_limiter is not None:
+            await rate_limiter.acquire(request.weight)
+        if resend and request.sign is not None:
+            request.url = request.sign()
+        send_time = time.time()
+        response = await session.request(request, timeout)
+        after_response(request, response, send_time, recorder, rate_limiter, policy, path)
+        return response
+
+    attempt = 0
+    while True:
+        retry_after = None
+        hedge_delay = policy.hedge_delay(path) if request.method == "GET" else None
+        try:
+            if hedge_delay is None:
+                response = await send(attempt > 0)
+            else:
+                first = asyncio.ensure_future(send(attempt > 0))
+                done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+                if done:
+                    response = first.result()
+                else:
+                    logger.debug("%s %s hedged after %.3fs", request.method, path, hedge_delay)
+                    response = await first_completed([first, asyncio.ensure_future(send(True))])
+        except httpx.TransportError as e:
+            action = next_action(
+                request, policy, attempt,
+                sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+            )
+            if action is None:
+                raise network_error(request, e) from e
+        else:
+            action = None
+            if response.status_code in RETRY_STATUSES:
+                action = next_action(request, policy, attempt, response.status_code)
+                retry_after = response.headers.get("Retry-After")
+            if action is None:
+                return handle_response(request, response.text, debug, response.status_code)
+        if action == LOOKUP:
+            try:
+                return await call_async(
+                    request.lookup(), debug, recorder, rate_limiter, policies, session
+                )
+            except BinanceApiException as e:
+                if not is_unknown_order(e):
+                    raise
+        logger.warning("%s %s retry %d", request.method, path, attempt + 1)
+        await asyncio.sleep(policy.retry_delay(attempt, retry_after))
+        attempt += 1
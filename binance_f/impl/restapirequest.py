@@ -7,6 +7,14 @@ class RestApiRequest(object):
         self.header = dict()
         self.json_parser = None
         self.name = name
+        # Request weight counted against the REQUEST_WEIGHT rate limit.
+        self.weight = 1
+        # Returns a request finding this write on the exchange, so it can be retried
+        # without executing it twice. Set for orders carrying a newClientOrderId.
+        self.lookup = None
+        # Returns the url with a fresh timestamp and signature, so a retry is not
+        # rejected as outside recvWindow (-1021). Set for signed endpoints.
+        self.sign = None
 
 
 #        self.header.update({"client_SDK_Version": "binance_futures-1.0.1-py3.7"})
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.parse
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.restapiinvoker import handle_response
+
+REST_RECORD = "r"
+FRAME_RECORD = "w"
+
+# Parameters that change on every signed call and must not take part in matching.
+VOLATILE_PARAMS = ("timestamp", "signature", "recvWindow")
+
+
+def normalize_url(url):
+    path, _, query = url.partition("?")
+    if not query:
+        return path
+    params = [
+        (name, value)
+        for name, value in urllib.parse.parse_qsl(query, keep_blank_values=True)
+        if name not in VOLATILE_PARAMS
+    ]
+    if not params:
+        return path
+    return path + "?" + urllib.parse.urlencode(params)
+
+
+def load_records(path):
+    records = list()
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+class TrafficRecorder(object):
+    def __init__(self, path):
+        """
+        Append REST request/response pairs and raw websocket frames to a JSON lines file.
+
+        Records use one-letter keys to stay compact:
+            k: kind, "r" for REST and "w" for websocket frames
+            t: wall clock time in seconds when the response/frame was received
+            m, u, s, d: method, normalized url, HTTP status and round trip in seconds
+            n: request name of the websocket connection
+            b: raw body or frame
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__file = open(path, "a")
+
+    def __write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.__lock:
+            self.__file.write(line)
+            self.__file.flush()
+
+    def record_rest(self, request, status, text, send_time, receive_time):
+        self.__write(
+            {
+                "k": REST_RECORD,
+                "t": receive_time,
+                "m": request.method,
+                "u": normalize_url(request.url),
+                "s": status,
+                "d": receive_time - send_time,
+                "b": text,
+            }
+        )
+
+    def record_frame(self, name, message, receive_time=None):
+        if isinstance(message, bytes):
+            message = message.decode()
+        self.__write(
+            {
+                "k": FRAME_RECORD,
+                "t": receive_time if receive_time is not None else time.time(),
+                "n": name,
+                "b": message,
+            }
+        )
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
+
+
+class ReplayTransport(object):
+    def __init__(self, path, speed=None, debug=False):
+        """
+        Feed a recording back through the same parsers and callbacks.
+
+        :param path: File written by TrafficRecorder.
+        :param speed: None replays without delay, 1.0 at recorded speed and larger
+            values accelerate, e.g. 10.0 replays ten times faster.
+        """
+        self.speed = speed
+        self.debug = debug
+        self.records = load_records(path)
+        self.__responses = dict()
+        for record in self.records:
+            if record["k"] == REST_RECORD:
+                key = (record["m"], record["u"])
+                self.__responses.setdefault(key, list()).append(record)
+        self.__lock = threading.Lock()
+
+    def __next_response(self, request):
+        key = (request.method, normalize_url(request.url))
+        with self.__lock:
+            responses = self.__responses.get(key)
+            if not responses:
+                raise BinanceApiException(
+                    BinanceApiException.ENV_ERROR,
+                    "[Replay] No recorded response for " + key[0] + " " + key[1],
+                )
+            # Keep the last response so repeated polling keeps working.
+            if len(responses) > 1:
+                return responses.pop(0)
+            return responses[0]
+
+    def __delay(self, seconds):
+        if self.speed is None or seconds <= 0:
+            return 0
+        return seconds / self.speed
+
+    def call_sync(self, request):
+        record = self.__next_response(request)
+        delay = self.__delay(record["d"])
+        if delay:
+            time.sleep(delay)
+        return handle_response(request, record["b"], self.debug, record["s"])
+
+    async def call_async(self, request):
+        record = self.__next_response(request)
+        delay = self.__delay(record["d"])
+        if delay:
+            await asyncio.sleep(delay)
+        return handle_response(request, record["b"], self.debug, record["s"])
+
+    def frames(self, name=None):
+        return [
+            record
+            for record in self.records
+            if record["k"] == FRAME_RECORD and (name is None or record["n"] == name)
+        ]
+
+    def replay_frames(self, connection, name=None):
+        """
+        Push recorded frames into WebsocketConnection.on_message, honouring the
+        recorded gaps scaled by speed. Returns the number of frames delivered.
+
+        :param connection: A WebsocketConnection built with the request to drive; it
+            does not need to be connected.
+        :param name: Only replay frames captured for this request name, defaults to
+            connection.request.name.
+        """
+        if name is None:
+            name = connection.request.name or None
+        count = 0
+        previous = None
+        for record in self.frames(name):
+            if previous is not None:
+                delay = self.__delay(record["t"] - previous)
+                if delay:
+                    time.sleep(delay)
+            previous = record["t"]
+            connection.on_message(record["b"])
+            count += 1
+        return count
@@ -18,6 +18,23 @@ def create_signature(secret_key, builder):
     builder.put_url("signature", signature)
 
 
+class HmacSigner(object):
+    """
+    HMAC SHA256 signer with the key schedule computed once. Each signature
+    clones the keyed state with copy() instead of re-encoding the secret.
+    """
+
+    def __init__(self, secret_key):
+        if secret_key is None or secret_key == "":
+            raise BinanceApiException(BinanceApiException.KEY_MISSING,  "Secret key are required")
+        self.__hmac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, query):
+        mac = self.__hmac.copy()
+        mac.update(query.encode())
+        return mac.hexdigest()
+
+
 def create_signature_with_query(secret_key, query):
     if secret_key is None or secret_key == "":
         raise BinanceApiException(BinanceApiException.KEY_MISSING,  "Secret key are required")
@@ -91,7 +91,7 @@ def symbol_liquidation_channel(symbol):
     channel["method"] = "SUBSCRIBE"
     return json.dumps(channel)
 
-def all_liquidation_channel(symbol):
+def all_liquidation_channel():
     channel = dict()
     channel["params"] = list()
     channel["params"].append("!forceOrder@arr")
@@ -115,6 +115,13 @@ def diff_depth_channel(symbol, update_time):
     channel["method"] = "SUBSCRIBE"
     return json.dumps(channel)
     
+def combined_channel(streams):
+    channel = dict()
+    channel["params"] = list(streams)
+    channel["id"] = get_current_timestamp()
+    channel["method"] = "SUBSCRIBE"
+    return json.dumps(channel)
+
 def user_data_channel(listenKey):
     channel = dict()
     channel["params"] = list()
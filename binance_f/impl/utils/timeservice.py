@@ -1,5 +1,10 @@
+import threading
 import time
 
+from binance_f.base.log import REST, get_logger
+
+logger = get_logger(REST)
+
 
 def get_current_timestamp():
     return int(round(time.time() * 1000))
@@ -18,3 +23,124 @@ def convert_cst_in_millisecond_to_utc(time_in_ms):
     else:
         return 0
 
+
+class ServerTimeSync:
+    def __init__(self, samples=5, refresh_interval=300):
+        """
+        Estimate the offset between the local clock and the Binance server clock.
+
+        Each round takes several serverTime samples and keeps the one with the
+        smallest round trip, since its midpoint is the tightest bound on when the
+        server actually stamped the response.
+
+        :param samples: Number of GET /fapi/v1/time calls per round.
+        :param refresh_interval: Seconds between background rounds.
+        """
+        self.samples = samples
+        self.refresh_interval = refresh_interval
+        self.offset = 0
+        self.rtt = None
+        self.last_sync = 0
+        self.__thread = None
+        self.__stop = threading.Event()
+        # (loop, asyncio.Event) waking run_forever() from stop().
+        self.__wake = None
+
+    def now(self):
+        """Local timestamp in milliseconds corrected to server time."""
+        return get_current_timestamp() + self.offset
+
+    def is_synchronized(self):
+        return self.rtt is not None
+
+    def add_samples(self, samples):
+        """
+        :param samples: List of (local_send_ms, server_time_ms, local_receive_ms).
+        """
+        best = None
+        for send_time, server_time, receive_time in samples:
+            rtt = receive_time - send_time
+            if best is None or rtt < best[0]:
+                best = (rtt, server_time - (send_time + receive_time) // 2)
+        if best is not None:
+            self.rtt, self.offset = best
+            self.last_sync = get_current_timestamp()
+
+    def synchronize(self, fetch_server_time):
+        """
+        :param fetch_server_time: Callable returning the server time in milliseconds,
+            e.g. lambda: request_client.get_servertime().
+        """
+        samples = list()
+        for _ in range(self.samples):
+            send_time = get_current_timestamp()
+            server_time = fetch_server_time()
+            samples.append((send_time, server_time, get_current_timestamp()))
+        self.add_samples(samples)
+        return self.offset
+
+    async def async_synchronize(self, fetch_server_time):
+        """
+        :param fetch_server_time: Coroutine function returning the server time in milliseconds.
+        """
+        samples = list()
+        for _ in range(self.samples):
+            send_time = get_current_timestamp()
+            server_time = await fetch_server_time()
+            samples.append((send_time, server_time, get_current_timestamp()))
+        self.add_samples(samples)
+        return self.offset
+
+    def start(self, fetch_server_time):
+        """Synchronize now, then refresh on a daemon thread every refresh_interval."""
+        self.synchronize(fetch_server_time)
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+
+        def run():
+            while not self.__stop.wait(self.refresh_interval):
+                try:
+                    self.synchronize(fetch_server_time)
+                except Exception as e:
+                    # Keep the previous estimate, the next round will retry.
+                    logger.warning("server time resync failed: %s", e)
+
+        self.__thread = threading.Thread(target=run, name="server-time-sync", daemon=True)
+        self.__thread.start()
+
+    async def run_forever(self, fetch_server_time):
+        """Async counterpart of start(), meant to be wrapped in a task."""
+        import asyncio
+
+        self.__stop.clear()
+        wake = asyncio.Event()
+        self.__wake = (asyncio.get_event_loop(), wake)
+        try:
+            if not self.is_synchronized():
+                await self.async_synchronize(fetch_server_time)
+            while not self.__stop.is_set():
+                try:
+                    await asyncio.wait_for(wake.wait(), self.refresh_interval)
+                except asyncio.TimeoutError:
+                    pass
+                if self.__stop.is_set():
+                    break
+                try:
+                    await self.async_synchronize(fetch_server_time)
+                except Exception as e:
+                    logger.warning("server time resync failed: %s", e)
+        finally:
+            self.__wake = None
+
+    def stop(self):
+        """End the refresh of start() or run_forever() without waiting out refresh_interval."""
+        self.__stop.set()
+        wake = self.__wake
+        if wake is not None:
+            loop, event = wake
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The loop is already closed, so is the task.
+                pass
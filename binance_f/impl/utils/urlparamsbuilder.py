@@ -1,5 +1,20 @@
 import json
 import urllib.parse
+from decimal import Decimal
+
+
+def format_decimal(value):
+    """
+    Plain decimal text for a float with at most 15 significant digits, so 9700.1 is
+    sent as "9700.1" and a computed 0.1 * 3 as "0.3", not "0.30000000000000004",
+    which Binance rejects as too precise.
+    """
+    text = "%.15g" % value
+    if "e" in text:
+        text = format(Decimal(text), "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text
 
 
 class UrlParamsBuilder(object):
@@ -13,7 +28,7 @@ class UrlParamsBuilder(object):
             if isinstance(value, list):
                 self.param_map[name] = json.dumps(value)
             elif isinstance(value, float):
-                self.param_map[name] = ('%.20f' % (value))[slice(0, 16)].rstrip('0').rstrip('.')
+                self.param_map[name] = format_decimal(value)
             else:
                 self.param_map[name] = str(value)
     def put_post(self, name, value):
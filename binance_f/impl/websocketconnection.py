@@ -1,5 +1,4 @@
 import threading
-import websocket
 import gzip
 import ssl
 import logging
@@ -7,7 +6,9 @@ import time
 from urllib import parse
 import urllib.parse
 
+from binance_f.base.log import WEBSOCKET, get_logger
 from binance_f.base.printtime import PrintDate
+from binance_f.impl.eventbatcher import EventBatcher
 from binance_f.impl.utils.timeservice import get_current_timestamp
 from binance_f.impl.utils.urlparamsbuilder import UrlParamsBuilder
 from binance_f.impl.utils.apisignature import create_signature
@@ -27,13 +28,17 @@ def on_message(ws, message):
 
 
 def on_error(ws, error):
-    websocket_connection = websocket_connection_handler[ws]
-    websocket_connection.on_failure(error)
+    # The connection may already be unregistered when close() raced the socket.
+    websocket_connection = websocket_connection_handler.get(ws)
+    if websocket_connection is not None:
+        websocket_connection.on_failure(error)
 
 
-def on_close(ws):
-    websocket_connection = websocket_connection_handler[ws]
-    websocket_connection.on_close()
+def on_close(ws, *args):
+    # websocket-client >= 1.0 passes close_status_code and close_msg.
+    websocket_connection = websocket_connection_handler.get(ws)
+    if websocket_connection is not None:
+        websocket_connection.on_close()
 
 
 def on_open(ws):
@@ -51,6 +56,8 @@ class ConnectionState:
 
 
 def websocket_func(*args):
+    import websocket
+
     connection_instance = args[0]
     connection_instance.ws = websocket.WebSocketApp(
         connection_instance.url,
@@ -73,6 +80,8 @@ def websocket_func(*args):
         connection_instance.state = ConnectionState.IDLE
 
 def simple_websocket_func(*args):
+    import websocket
+
     connection_instance = args[0]
     connection_instance.ws = websocket.WebSocketApp(
         connection_instance.url,
@@ -97,7 +106,7 @@ def simple_websocket_func(*args):
     
 
 class WebsocketConnection:
-    def __init__(self, api_key, secret_key, uri, watch_dog, request,simple=False):
+    def __init__(self, api_key, secret_key, uri, watch_dog, request,simple=False,recorder=None):
         self.__thread = None
         self.url = uri
         self.__api_key = api_key
@@ -107,12 +116,22 @@ class WebsocketConnection:
         self.delay_in_second = -1
         self.ws = None
         self.last_receive_time = 0
-        self.logger = logging.getLogger("binance-futures")
+        self.logger = get_logger(WEBSOCKET)
         self.state = ConnectionState.IDLE
         global connection_id
         connection_id += 1
         self.id = connection_id
         self.simple = simple
+        self.recorder = recorder
+        self.batcher = None
+        if request.update_callback is not None and (request.batch_size or request.batch_interval_us):
+            self.batcher = EventBatcher(
+                request.update_callback,
+                self.on_error,
+                request.batch_size,
+                request.batch_interval_us,
+                request.batch_columns,
+            )
 
     def in_delay_connection(self):
         return self.delay_in_second != -1
@@ -152,10 +171,15 @@ class WebsocketConnection:
         self.ws.send(data)
 
     def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
         self.ws.close()
         del websocket_connection_handler[self.ws]
         self.__watch_dog.on_connection_closed(self)
-        self.logger.error("[Sub][" + str(self.id) + "] Closing normally")
+        self.logger.info("[Sub][" + str(self.id) + "] Closing normally")
+
+    def on_close(self):
+        self.logger.info("[Sub][" + str(self.id) + "] Connection closed by peer or client")
 
     def on_open(self, ws):
         self.logger.info("[Sub][" + str(self.id) + "] Connected to server")
@@ -169,8 +193,6 @@ class WebsocketConnection:
 
     def on_error(self, error_message):
         if self.request.error_handler is not None:
-            print(self.request.error_handler)
-            print("error")
             exception = BinanceApiException(
                 BinanceApiException.SUBSCRIPTION_ERROR, error_message
             )
@@ -178,12 +200,13 @@ class WebsocketConnection:
         self.logger.error("[Sub][" + str(self.id) + "] " + str(error_message))
 
     def on_failure(self, error):
-        print("on_failure")
         self.on_error("Unexpected error: " + str(error))
         self.close_on_error()
 
     def on_message(self, message):
         self.last_receive_time = get_current_timestamp()
+        if self.recorder is not None:
+            self.recorder.record_frame(self.request.name, message)
         json_wrapper = parse_json_from_string(message)
         if not self.simple:
             if (
@@ -214,6 +237,9 @@ class WebsocketConnection:
         except Exception as e:
             self.on_error("Failed to parse server's response: " + str(e))
 
+        if self.batcher is not None:
+            # Events received before the response are delivered first.
+            self.batcher.flush()
         try:
             if self.request.update_callback is not None:
                 self.request.update_callback(SubscribeMessageType.RESPONSE, res)
@@ -232,15 +258,18 @@ class WebsocketConnection:
         except Exception as e:
             self.on_error("Failed to parse server's response: " + str(e))
 
-        try:
-            if self.request.update_callback is not None:
-                self.request.update_callback(SubscribeMessageType.PAYLOAD, res)
-        except Exception as e:
-            self.on_error(
-                "Process error: "
-                + str(e)
-                + " You should capture the exception in your error handler"
-            )
+        if self.batcher is not None:
+            self.batcher.add(res)
+        else:
+            try:
+                if self.request.update_callback is not None:
+                    self.request.update_callback(SubscribeMessageType.PAYLOAD, res)
+            except Exception as e:
+                self.on_error(
+                    "Process error: "
+                    + str(e)
+                    + " You should capture the exception in your error handler"
+                )
 
         if self.request.auto_close:
             self.close()
@@ -263,9 +292,9 @@ class WebsocketConnection:
 
     def shutdown_gracefully(self):
         self.__thread.join()
-        print("Closed websocket connection")
+        self.logger.info("[Sub][" + str(self.id) + "] Closed websocket connection")
         self.__watch_dog.graceful_shutdown()
-        print("Closed scheduler")
+        self.logger.info("[Sub][" + str(self.id) + "] Closed scheduler")
 
     def thread_safe(self, callback=None):
         try:
@@ -8,3 +8,7 @@ class WebsocketRequest(object):
         self.json_parser = None
         self.update_callback = None
         self.name = name
+        # Batch delivery, see EventBatcher: off unless batch_size or batch_interval_us is set.
+        self.batch_size = None
+        self.batch_interval_us = None
+        self.batch_columns = False
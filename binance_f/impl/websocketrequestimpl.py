@@ -1,5 +1,7 @@
+import logging
 import time
 
+from binance_f.base.log import USER_DATA, get_logger
 from binance_f.base.printobject import *
 from binance_f.impl.utils.channelparser import ChannelParser
 from binance_f.impl.utils.channels import *
@@ -9,6 +11,22 @@ from binance_f.impl.utils.timeservice import *
 from binance_f.impl.websocketrequest import WebsocketRequest
 from binance_f.model import *
 
+user_data_logger = get_logger(USER_DATA)
+
+
+def parse_user_data_event(json_wrapper):
+    event_type = json_wrapper.get_string("e")
+    if user_data_logger.isEnabledFor(logging.DEBUG):
+        user_data_logger.debug("event %s %s", event_type, json_wrapper.json_object)
+    if event_type == "ACCOUNT_UPDATE":
+        return AccountUpdate.json_parse(json_wrapper)
+    elif event_type == "ORDER_TRADE_UPDATE":
+        return OrderUpdate.json_parse(json_wrapper)
+    elif event_type == "listenKeyExpired":
+        return ListenKeyExpired.json_parse(json_wrapper)
+    return None
+
+
 class SimpleSocketImpl(object):
     def subscribe_backend(self, callback,error_handler=None):
         check_should_not_none(callback, "callback")
@@ -137,7 +155,7 @@ class WebsocketRequestImpl(object):
             data_list = json_wrapper.convert_2_array()
             for item in data_list.get_items():
                 element = SymbolMiniTickerEvent.json_parse(item)
-            result.append(element)
+                result.append(element)
             return result
 
         request = WebsocketRequest()
@@ -184,7 +202,7 @@ class WebsocketRequestImpl(object):
             data_list = json_wrapper.convert_2_array()
             for item in data_list.get_items():
                 ticker_event_obj = SymbolTickerEvent.json_parse(item)
-            result.append(ticker_event_obj)
+                result.append(ticker_event_obj)
             return result
 
         request = WebsocketRequest()
@@ -336,16 +354,34 @@ class WebsocketRequestImpl(object):
             connection.send(user_data_channel(listenKey))
             time.sleep(0.01)
 
+        request = WebsocketRequest()
+        request.subscription_handler = subscription_handler
+        request.json_parser = parse_user_data_event
+        request.update_callback = callback
+        request.error_handler = error_handler
+
+        return request
+
+    def subscribe_market_data_event(
+        self, symbols, streams, callback, error_handler=None
+    ) -> WebsocketRequest:
+        check_should_not_none(symbols, "symbols")
+        check_should_not_none(callback, "callback")
+        params = [symbol.lower() + "@" + stream for symbol in symbols for stream in streams]
+
+        def subscription_handler(connection):
+            connection.send(combined_channel(params))
+            time.sleep(0.01)
+
         def json_parse(json_wrapper):
-            print("event type: ", json_wrapper.get_string("e"))
-            print(json_wrapper)
-            if json_wrapper.get_string("e") == "ACCOUNT_UPDATE":
-                result = AccountUpdate.json_parse(json_wrapper)
-            elif json_wrapper.get_string("e") == "ORDER_TRADE_UPDATE":
-                result = OrderUpdate.json_parse(json_wrapper)
-            elif json_wrapper.get_string("e") == "listenKeyExpired":
-                result = ListenKeyExpired.json_parse(json_wrapper)
-            return result
+            event_type = json_wrapper.get_string_or_default("e", "")
+            if event_type == "bookTicker":
+                return SymbolBookTickerEvent.json_parse(json_wrapper)
+            elif event_type == "markPriceUpdate":
+                return MarkPriceEvent.json_parse(json_wrapper)
+            elif event_type == "aggTrade":
+                return AggregateTradeEvent.json_parse(json_wrapper)
+            return None
 
         request = WebsocketRequest()
         request.subscription_handler = subscription_handler
@@ -354,3 +390,56 @@ class WebsocketRequestImpl(object):
         request.error_handler = error_handler
 
         return request
+
+    def subscribe_tick_buffer_event(
+        self, symbols, stream, buffer, error_handler=None
+    ) -> WebsocketRequest:
+        check_should_not_none(symbols, "symbols")
+        check_should_not_none(buffer, "buffer")
+        params = [symbol.lower() + "@" + stream for symbol in symbols]
+
+        def subscription_handler(connection):
+            connection.send(combined_channel(params))
+            time.sleep(0.01)
+
+        request = WebsocketRequest()
+        request.subscription_handler = subscription_handler
+        request.json_parser = buffer.parse
+        request.update_callback = buffer.callback
+        request.error_handler = error_handler
+
+        return request
+
+    def subscribe_liquidation_flow_event(
+        self, streams, flow, error_handler=None
+    ) -> WebsocketRequest:
+        check_should_not_none(flow, "flow")
+
+        def subscription_handler(connection):
+            connection.send(combined_channel(streams))
+            time.sleep(0.01)
+
+        request = WebsocketRequest()
+        request.subscription_handler = subscription_handler
+        request.json_parser = flow.parse
+        request.update_callback = flow.callback
+        request.error_handler = error_handler
+
+        return request
+
+    def subscribe_funding_scanner_event(
+        self, stream, scanner, error_handler=None
+    ) -> WebsocketRequest:
+        check_should_not_none(scanner, "scanner")
+
+        def subscription_handler(connection):
+            connection.send(combined_channel([stream]))
+            time.sleep(0.01)
+
+        request = WebsocketRequest()
+        request.subscription_handler = subscription_handler
+        request.json_parser = scanner.parse
+        request.update_callback = scanner.callback
+        request.error_handler = error_handler
+
+        return request
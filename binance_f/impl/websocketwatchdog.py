@@ -1,10 +1,8 @@
 import threading
 import logging
 import time
-from apscheduler.schedulers.blocking import BlockingScheduler
 from binance_f.impl.websocketconnection import ConnectionState
 from binance_f.impl.utils.timeservice import get_current_timestamp
-from websocket import WebSocketException
 
 
 def watch_dog_job(*args):
@@ -49,6 +47,8 @@ class WebSocketWatchDog(threading.Thread):
         self.receive_limit_ms = receive_limit_ms
         self.connection_delay_failure = connection_delay_failure
         self.logger = logging.getLogger("binance-client")
+        from apscheduler.schedulers.blocking import BlockingScheduler
+
         self.scheduler = BlockingScheduler()
         self.scheduler.add_job(
             watch_dog_job, "interval", max_instances=10, seconds=1, args=[self]
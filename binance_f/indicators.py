@@ -0,0 +1,510 @@
+import time
+
+from binance_f.model.constant import SubscribeMessageType
+
+DAY = 24 * 60 * 60 * 1000
+
+
+def numpy_or_none():
+    """numpy when installed; seeding falls back to plain Python loops without it."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class Bar(object):
+    __slots__ = ("start", "high", "low", "close", "volume", "closed")
+
+    def __init__(self, start, high, low, close, volume, closed):
+        self.start = start
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.closed = closed
+
+    @staticmethod
+    def from_candlestick(candlestick):
+        """From a stream Candlestick or a get_candlestick_data row (string prices)."""
+        start = getattr(candlestick, "startTime", None)
+        if start is None:
+            start = candlestick.openTime
+        return Bar(
+            int(start),
+            float(candlestick.high),
+            float(candlestick.low),
+            float(candlestick.close),
+            float(candlestick.volume),
+            getattr(candlestick, "isClosed", True),
+        )
+
+
+class RingBuffer(object):
+    def __init__(self, capacity):
+        """The last capacity values; append() returns the value pushed out, if any."""
+        self.capacity = capacity
+        self.values = [0.0] * capacity
+        self.size = 0
+        self.index = 0
+
+    def append(self, value):
+        evicted = self.values[self.index] if self.size == self.capacity else None
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        return evicted
+
+    def oldest(self):
+        """The value the next append() evicts, None until full."""
+        if self.size < self.capacity:
+            return None
+        return self.values[self.index]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        start = self.index if self.size == self.capacity else 0
+        for i in range(self.size):
+            yield self.values[(start + i) % self.capacity]
+
+
+def columns(bars):
+    """Bars as per-field arrays (numpy when available, lists otherwise)."""
+    result = {
+        "start": [bar.start for bar in bars],
+        "high": [bar.high for bar in bars],
+        "low": [bar.low for bar in bars],
+        "close": [bar.close for bar in bars],
+        "volume": [bar.volume for bar in bars],
+    }
+    numpy = numpy_or_none()
+    if numpy is not None:
+        for name in ("high", "low", "close", "volume"):
+            result[name] = numpy.asarray(result[name], dtype=float)
+    return result
+
+
+def smooth(values, alpha, initial):
+    """
+    Final value of s = s + alpha * (x - s) over values, starting at initial.
+
+    It is a weighted sum, (1 - alpha) ** n * initial + sum(alpha * (1 - alpha) **
+    (n - 1 - k) * x[k]), so with numpy the whole history is one dot product.
+    """
+    n = len(values)
+    if n == 0:
+        return initial
+    numpy = numpy_or_none()
+    if numpy is None or not hasattr(values, "dtype"):
+        result = initial
+        for value in values:
+            result += alpha * (value - result)
+        return result
+    weights = alpha * (1.0 - alpha) ** numpy.arange(n - 1, -1, -1, dtype=float)
+    return (1.0 - alpha) ** n * initial + float(numpy.dot(weights, values))
+
+
+def true_ranges(high, low, close):
+    """True range per bar; the first bar has no previous close and uses high - low."""
+    numpy = numpy_or_none()
+    if numpy is not None and hasattr(high, "dtype"):
+        result = high - low
+        if len(result) > 1:
+            previous = close[:-1]
+            result[1:] = numpy.maximum(
+                result[1:],
+                numpy.maximum(numpy.abs(high[1:] - previous), numpy.abs(low[1:] - previous)),
+            )
+        return result
+    result = list()
+    for i in range(len(high)):
+        value = high[i] - low[i]
+        if i:
+            value = max(value, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        result.append(value)
+    return result
+
+
+class Indicator(object):
+    """
+    Incremental indicator: update() costs O(1) whatever the history length.
+
+    An in-progress bar (closed=False) is evaluated against the committed state and
+    discarded; a closed bar is committed. seed() loads history in one pass.
+    """
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def seed(self, data):
+        """Commit closed history given as columns(); returns the last value."""
+        raise NotImplementedError
+
+
+class SMA(Indicator):
+    def __init__(self, period, source="close"):
+        self.period = period
+        self.source = source
+        self.window = RingBuffer(period)
+        self.total = 0.0
+        self.commits = 0
+        self.value = None
+
+    def update(self, bar):
+        x = getattr(bar, self.source)
+        window = self.window
+        if len(window) + 1 < self.period:
+            if bar.closed:
+                window.append(x)
+                self.total += x
+            return None
+        oldest = window.oldest()
+        total = self.total + x - (oldest or 0.0)
+        value = total / self.period
+        if bar.closed:
+            window.append(x)
+            self.total = total
+            self.commits += 1
+            if self.commits % self.period == 0:
+                # Re-sum once per window so float error does not accumulate.
+                self.total = sum(window)
+            self.value = value
+        return value
+
+    def seed(self, data):
+        for x in list(data[self.source])[-self.period:]:
+            self.window.append(float(x))
+        self.total = sum(self.window)
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class EMA(Indicator):
+    def __init__(self, period, source="close"):
+        self.period = period
+        self.source = source
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def update(self, bar):
+        x = getattr(bar, self.source)
+        if self.count + 1 < self.period:
+            if bar.closed:
+                self.count += 1
+                self.total += x
+            return None
+        if self.value is None:
+            # The first value is the SMA of the first period closes.
+            value = (self.total + x) / self.period
+        else:
+            value = self.value + self.alpha * (x - self.value)
+        if bar.closed:
+            self.count += 1
+            self.value = value
+        return value
+
+    def seed(self, data):
+        values = data[self.source]
+        if len(values) < self.period:
+            self.count = len(values)
+            self.total = float(sum(values))
+            return None
+        initial = float(sum(values[: self.period])) / self.period
+        self.value = smooth(values[self.period:], self.alpha, initial)
+        self.count = len(values)
+        return self.value
+
+
+class RSI(Indicator):
+    def __init__(self, period=14):
+        """Wilder's relative strength index."""
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.gain = 0.0
+        self.loss = 0.0
+        self.ready = False
+        self.value = None
+
+    @staticmethod
+    def rsi(gain, loss):
+        if loss == 0:
+            return 100.0 if gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def update(self, bar):
+        if self.previous is None:
+            if bar.closed:
+                self.previous = bar.close
+            return None
+        change = bar.close - self.previous
+        up = change if change > 0 else 0.0
+        down = -change if change < 0 else 0.0
+        if not self.ready:
+            if self.count + 1 < self.period:
+                if bar.closed:
+                    self.count += 1
+                    self.gain += up
+                    self.loss += down
+                    self.previous = bar.close
+                return None
+            gain = (self.gain + up) / self.period
+            loss = (self.loss + down) / self.period
+        else:
+            gain = self.gain + (up - self.gain) / self.period
+            loss = self.loss + (down - self.loss) / self.period
+        value = self.rsi(gain, loss)
+        if bar.closed:
+            self.count += 1
+            self.gain = gain
+            self.loss = loss
+            self.ready = True
+            self.previous = bar.close
+            self.value = value
+        return value
+
+    def seed(self, data):
+        close = data["close"]
+        if len(close) == 0:
+            return None
+        self.previous = float(close[-1])
+        numpy = numpy_or_none()
+        if numpy is not None and hasattr(close, "dtype"):
+            changes = numpy.diff(close)
+            ups = numpy.maximum(changes, 0.0)
+            downs = numpy.maximum(-changes, 0.0)
+        else:
+            changes = [close[i] - close[i - 1] for i in range(1, len(close))]
+            ups = [max(change, 0.0) for change in changes]
+            downs = [max(-change, 0.0) for change in changes]
+        self.count = len(changes)
+        if self.count < self.period:
+            self.gain = float(sum(ups))
+            self.loss = float(sum(downs))
+            return None
+        alpha = 1.0 / self.period
+        self.gain = smooth(ups[self.period:], alpha, float(sum(ups[: self.period])) / self.period)
+        self.loss = smooth(downs[self.period:], alpha, float(sum(downs[: self.period])) / self.period)
+        self.ready = True
+        self.value = self.rsi(self.gain, self.loss)
+        return self.value
+
+
+class ATR(Indicator):
+    def __init__(self, period=14):
+        """Wilder's average true range."""
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def update(self, bar):
+        true_range = bar.high - bar.low
+        if self.previous is not None:
+            true_range = max(
+                true_range, abs(bar.high - self.previous), abs(bar.low - self.previous)
+            )
+        if self.count + 1 < self.period:
+            if bar.closed:
+                self.count += 1
+                self.total += true_range
+                self.previous = bar.close
+            return None
+        if self.value is None:
+            value = (self.total + true_range) / self.period
+        else:
+            value = self.value + (true_range - self.value) / self.period
+        if bar.closed:
+            self.count += 1
+            self.previous = bar.close
+            self.value = value
+        return value
+
+    def seed(self, data):
+        close = data["close"]
+        if len(close) == 0:
+            return None
+        ranges = true_ranges(data["high"], data["low"], close)
+        self.previous = float(close[-1])
+        self.count = len(ranges)
+        if self.count < self.period:
+            self.total = float(sum(ranges))
+            return None
+        initial = float(sum(ranges[: self.period])) / self.period
+        self.value = smooth(ranges[self.period:], 1.0 / self.period, initial)
+        return self.value
+
+
+class VWAP(Indicator):
+    def __init__(self, window=None, session=DAY):
+        """
+        Volume weighted average of the typical price (high + low + close) / 3.
+
+        :param window: Average over the last window bars (ring buffer), or
+        :param session: reset at every session boundary in ms, UTC midnight by default.
+        """
+        self.window = window
+        self.session = session
+        self.price_volumes = RingBuffer(window) if window else None
+        self.volumes = RingBuffer(window) if window else None
+        self.session_start = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+        self.value = None
+
+    def update(self, bar):
+        price_volume = (bar.high + bar.low + bar.close) / 3.0 * bar.volume
+        volume = bar.volume
+        if self.window:
+            total_pv = self.price_volume + price_volume - (self.price_volumes.oldest() or 0.0)
+            total_volume = self.volume + volume - (self.volumes.oldest() or 0.0)
+        else:
+            start = bar.start - bar.start % self.session
+            if start != self.session_start:
+                total_pv, total_volume = price_volume, volume
+            else:
+                total_pv = self.price_volume + price_volume
+                total_volume = self.volume + volume
+        value = total_pv / total_volume if total_volume > 0 else self.value
+        if bar.closed:
+            if self.window:
+                self.price_volumes.append(price_volume)
+                self.volumes.append(volume)
+            else:
+                self.session_start = bar.start - bar.start % self.session
+            self.price_volume = total_pv
+            self.volume = total_volume
+            self.value = value
+        return value
+
+    def seed(self, data):
+        count = len(data["close"])
+        if count == 0:
+            return None
+        if self.window:
+            first = max(0, count - self.window)
+        else:
+            last_start = data["start"][-1]
+            self.session_start = last_start - last_start % self.session
+            first = count
+            while first > 0 and data["start"][first - 1] >= self.session_start:
+                first -= 1
+        high = data["high"][first:]
+        low = data["low"][first:]
+        close = data["close"][first:]
+        volume = data["volume"][first:]
+        if hasattr(close, "dtype"):
+            price_volumes = (high + low + close) / 3.0 * volume
+        else:
+            price_volumes = [(high[i] + low[i] + close[i]) / 3.0 * volume[i] for i in range(len(close))]
+        if self.window:
+            for i in range(len(close)):
+                self.price_volumes.append(float(price_volumes[i]))
+                self.volumes.append(float(volume[i]))
+        self.price_volume = float(sum(price_volumes))
+        self.volume = float(sum(volume))
+        if self.volume > 0:
+            self.value = self.price_volume / self.volume
+        return self.value
+
+
+class IndicatorSet(object):
+    def __init__(self, symbol=None, interval=None, on_update=None, **indicators):
+        """
+        Named indicators fed by one symbol/interval kline stream:
+
+            indicators = IndicatorSet("BTCUSDT", "1m", ema=EMA(21), rsi=RSI(14), atr=ATR(14))
+            indicators.load(request_client)
+            indicators.attach(sub_client)
+            indicators.values["rsi"]
+
+        Replayed closed bars (open time not after the last committed one) are skipped,
+        so the seed history and the live stream can overlap.
+
+        :param symbol: Only candlesticks of this symbol are used; None accepts all.
+        :param interval: Only candlesticks of this interval are used; None accepts all.
+        :param on_update: Called with (candlestick, values) after every update.
+        """
+        self.symbol = symbol.upper() if symbol else None
+        self.interval = interval
+        self.on_update = on_update
+        self.indicators = indicators
+        self.values = dict.fromkeys(indicators)
+        self.last_start = None
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def seed(self, candlesticks, now=None):
+        """
+        Commit get_candlestick_data history. The bar still open at now (ms, default
+        the local clock) is left to the stream. Once seeded, only newer closed bars
+        are committed, one by one, on top of the existing state.
+        """
+        if now is None:
+            now = int(time.time() * 1000)
+        bars = [
+            Bar.from_candlestick(candlestick)
+            for candlestick in candlesticks
+            if int(candlestick.closeTime) < now
+        ]
+        if self.last_start is not None:
+            bars = [bar for bar in bars if bar.start > self.last_start]
+        if not bars:
+            return self.values
+        if self.last_start is None:
+            data = columns(bars)
+            for name, indicator in self.indicators.items():
+                self.values[name] = indicator.seed(data)
+        else:
+            # Indicator.seed() starts over, so a later seed only extends the history.
+            for bar in bars:
+                for name, indicator in self.indicators.items():
+                    self.values[name] = indicator.update(bar)
+        self.last_start = bars[-1].start
+        return self.values
+
+    def load(self, request_client, limit=500):
+        """Seed from request_client.get_candlestick_data (RequestClient)."""
+        return self.seed(
+            request_client.get_candlestick_data(
+                symbol=self.symbol, interval=self.interval, limit=limit
+            )
+        )
+
+    def on_candlestick(self, candlestick):
+        """Update with a stream Candlestick (or a CandlestickEvent) and return the values."""
+        candlestick = getattr(candlestick, "data", candlestick)
+        if self.symbol is not None and candlestick.symbol != self.symbol:
+            return self.values
+        if self.interval is not None and candlestick.interval != self.interval:
+            return self.values
+        bar = Bar.from_candlestick(candlestick)
+        if self.last_start is not None and bar.start <= self.last_start:
+            return self.values
+        for name, indicator in self.indicators.items():
+            self.values[name] = indicator.update(bar)
+        if bar.closed:
+            self.last_start = bar.start
+        if self.on_update is not None:
+            self.on_update(candlestick, self.values)
+        return self.values
+
+    def callback(self, data_type, event):
+        """Subscription callback for subscribe_candlestick_event."""
+        if data_type == SubscribeMessageType.PAYLOAD:
+            self.on_candlestick(event)
+
+    def attach(self, sub_client, error_handler=None):
+        """Subscribe to the symbol/interval kline stream of this set."""
+        sub_client.subscribe_candlestick_event(
+            self.symbol.lower(), self.interval, self.callback, error_handler
+        )
@@ -0,0 +1,312 @@
+import calendar
+import time
+
+from binance_f.base.log import WEBSOCKET, get_logger
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model.aggregatetradeevent import AggregateTradeEvent
+from binance_f.model.candlestickevent import Candlestick, CandlestickEvent
+from binance_f.model.constant import CandlestickInterval, SubscribeMessageType
+
+logger = get_logger(WEBSOCKET)
+
+MINUTE = 60 * 1000
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+# 1970-01-01 was a Thursday; Binance weeks start on Monday 00:00 UTC.
+WEEK_OFFSET = 4 * DAY
+
+INTERVAL_MS = {
+    CandlestickInterval.MIN1: MINUTE,
+    CandlestickInterval.MIN3: 3 * MINUTE,
+    CandlestickInterval.MIN5: 5 * MINUTE,
+    CandlestickInterval.MIN15: 15 * MINUTE,
+    CandlestickInterval.MIN30: 30 * MINUTE,
+    CandlestickInterval.HOUR1: HOUR,
+    CandlestickInterval.HOUR2: 2 * HOUR,
+    CandlestickInterval.HOUR4: 4 * HOUR,
+    CandlestickInterval.HOUR6: 6 * HOUR,
+    CandlestickInterval.HOUR8: 8 * HOUR,
+    CandlestickInterval.HOUR12: 12 * HOUR,
+    CandlestickInterval.DAY1: DAY,
+    CandlestickInterval.DAY3: 3 * DAY,
+    CandlestickInterval.WEEK1: WEEK,
+}
+
+# Every interval of CandlestickInterval, shortest first. Months have no fixed length.
+INTERVALS = sorted(INTERVAL_MS, key=INTERVAL_MS.get) + [CandlestickInterval.MON1]
+
+
+def interval_start(interval, timestamp):
+    """Open time in ms of the interval bar containing timestamp."""
+    if interval == CandlestickInterval.MON1:
+        year, month = time.gmtime(timestamp // 1000)[:2]
+        return calendar.timegm((year, month, 1, 0, 0, 0)) * 1000
+    length = INTERVAL_MS[interval]
+    if interval == CandlestickInterval.WEEK1:
+        return timestamp - (timestamp - WEEK_OFFSET) % length
+    return timestamp - timestamp % length
+
+
+def interval_close(interval, start):
+    """Close time in ms (the last millisecond) of the bar opened at start."""
+    if interval == CandlestickInterval.MON1:
+        year, month = time.gmtime(start // 1000)[:2]
+        if month == 12:
+            year, month = year + 1, 1
+        else:
+            month += 1
+        return calendar.timegm((year, month, 1, 0, 0, 0)) * 1000 - 1
+    return start + INTERVAL_MS[interval] - 1
+
+
+def divides(base, interval):
+    """Whether bars of base tile bars of interval exactly."""
+    if interval == CandlestickInterval.MON1:
+        return DAY % INTERVAL_MS[base] == 0
+    if interval not in INTERVAL_MS or INTERVAL_MS[interval] < INTERVAL_MS[base]:
+        return False
+    if interval == CandlestickInterval.WEEK1:
+        return DAY % INTERVAL_MS[base] == 0
+    return INTERVAL_MS[interval] % INTERVAL_MS[base] == 0
+
+
+class _Window(object):
+    __slots__ = (
+        "start", "close_time", "open", "high", "low", "close", "volume",
+        "quote_volume", "taker_base", "taker_quote", "num_trades",
+        "first_id", "last_id", "last_start",
+    )
+
+    def __init__(self, start, close_time):
+        self.start = start
+        self.close_time = close_time
+        self.open = None
+        self.high = float("-inf")
+        self.low = float("inf")
+        self.close = 0.0
+        self.volume = 0.0
+        self.quote_volume = 0.0
+        self.taker_base = 0.0
+        self.taker_quote = 0.0
+        self.num_trades = 0
+        self.first_id = None
+        self.last_id = None
+        # Open time of the last closed lower-timeframe bar folded in.
+        self.last_start = -1
+
+    def add_bar(self, bar):
+        if self.open is None:
+            self.open = bar.open
+            self.first_id = bar.firstTradeId
+        if bar.high > self.high:
+            self.high = bar.high
+        if bar.low < self.low:
+            self.low = bar.low
+        self.close = bar.close
+        self.volume += bar.volume
+        self.quote_volume += bar.quoteAssetVolume
+        self.taker_base += bar.takerBuyBaseAssetVolume
+        self.taker_quote += bar.takerBuyQuoteAssetVolume
+        self.num_trades += bar.numTrades
+        self.last_id = bar.lastTradeId
+        self.last_start = bar.startTime
+
+    def add_trade(self, trade):
+        price = trade.price
+        if self.open is None:
+            self.open = price
+            self.first_id = trade.firstId
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        quote = price * trade.qty
+        self.volume += trade.qty
+        self.quote_volume += quote
+        if not trade.isBuyerMaker:
+            self.taker_base += trade.qty
+            self.taker_quote += quote
+        self.num_trades += trade.lastId - trade.firstId + 1
+        self.last_id = trade.lastId
+
+    def candlestick(self, symbol, interval, partial=None, closed=False):
+        """The bar so far, with the running lower-timeframe bar folded in if given."""
+        result = Candlestick()
+        result.startTime = self.start
+        result.closeTime = self.close_time
+        result.symbol = symbol
+        result.interval = interval
+        result.isClosed = closed
+        if self.open is None:
+            result.open = partial.open
+            result.firstTradeId = partial.firstTradeId
+            result.high = partial.high
+            result.low = partial.low
+        else:
+            result.open = self.open
+            result.firstTradeId = self.first_id
+            result.high = self.high
+            result.low = self.low
+        result.close = self.close
+        result.volume = self.volume
+        result.quoteAssetVolume = self.quote_volume
+        result.takerBuyBaseAssetVolume = self.taker_base
+        result.takerBuyQuoteAssetVolume = self.taker_quote
+        result.numTrades = self.num_trades
+        result.lastTradeId = self.last_id
+        if partial is not None:
+            result.high = max(result.high, partial.high)
+            result.low = min(result.low, partial.low)
+            result.close = partial.close
+            result.volume += partial.volume
+            result.quoteAssetVolume += partial.quoteAssetVolume
+            result.takerBuyBaseAssetVolume += partial.takerBuyBaseAssetVolume
+            result.takerBuyQuoteAssetVolume += partial.takerBuyQuoteAssetVolume
+            result.numTrades += partial.numTrades
+            result.lastTradeId = partial.lastTradeId
+        return result
+
+
+class KlineAggregator(object):
+    def __init__(self, on_close, intervals=None, base=CandlestickInterval.MIN1, on_update=None):
+        """
+        Build higher timeframe candlesticks from one kline or aggregate trade stream,
+        instead of one subscribe_candlestick_event socket per interval.
+
+        Feed it CandlestickEvent of the base interval or AggregateTradeEvent, for any
+        number of symbols; callback() can be passed to the subscription directly:
+
+            aggregator = KlineAggregator(on_close=print)
+            sub_client.subscribe_candlestick_event("btcusdt", "1m", aggregator.callback)
+
+        Each update costs a constant amount of work per interval. A bar built from
+        klines closes when the base bar ending its window closes (isClosed). A bar
+        built from trades closes when the first trade past its window arrives, or on
+        flush() from a timer for quiet markets.
+
+        :param on_close: Called with each closed Candlestick, isClosed=True.
+        :param intervals: CandlestickInterval values to build, by default every
+            interval above base. Each must be a multiple of base.
+        :param base: Interval of the kline stream fed in. Trades also build it.
+        :param on_update: Called with the running Candlestick after every update.
+        """
+        if base not in INTERVAL_MS:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR, "[Input] Unsupported base interval: " + str(base)
+            )
+        if intervals is None:
+            intervals = [interval for interval in INTERVALS
+                         if divides(base, interval) and interval != base]
+        for interval in intervals:
+            if not divides(base, interval):
+                raise BinanceApiException(
+                    BinanceApiException.INPUT_ERROR,
+                    "[Input] " + str(interval) + " bars cannot be built from " + str(base),
+                )
+        self.base = base
+        self.intervals = [interval for interval in intervals if interval != base]
+        self.on_close = on_close
+        self.on_update = on_update
+        # symbol -> interval -> _Window of the bar being built.
+        self.__windows = dict()
+        # symbol -> interval -> close time of the last bar emitted.
+        self.__closed_until = dict()
+        # symbol -> running (not yet closed) base bar.
+        self.__partials = dict()
+
+    def __state(self, symbol):
+        windows = self.__windows.get(symbol)
+        if windows is None:
+            windows = self.__windows[symbol] = dict()
+            self.__closed_until[symbol] = dict()
+        return windows, self.__closed_until[symbol]
+
+    def __emit(self, symbol, interval, window, windows, closed_until):
+        del windows[interval]
+        closed_until[interval] = window.close_time
+        if window.open is not None:
+            self.on_close(window.candlestick(symbol, interval, closed=True))
+
+    def __window(self, symbol, interval, timestamp, windows, closed_until):
+        """The window containing timestamp, closing the one before it; None if already emitted."""
+        window = windows.get(interval)
+        if window is not None:
+            if timestamp <= window.close_time:
+                return window
+            self.__emit(symbol, interval, window, windows, closed_until)
+        if timestamp <= closed_until.get(interval, -1):
+            return None
+        start = interval_start(interval, timestamp)
+        window = windows[interval] = _Window(start, interval_close(interval, start))
+        return window
+
+    def on_candlestick(self, event):
+        """Update every interval with a CandlestickEvent (or Candlestick) of the base interval."""
+        bar = event.data if isinstance(event, CandlestickEvent) else event
+        if bar.interval != self.base:
+            logger.debug("ignoring %s kline, aggregating from %s", bar.interval, self.base)
+            return
+        symbol = bar.symbol
+        windows, closed_until = self.__state(symbol)
+        for interval in self.intervals:
+            window = self.__window(symbol, interval, bar.startTime, windows, closed_until)
+            if window is None or bar.startTime <= window.last_start:
+                # Replayed or duplicate bar already folded in.
+                continue
+            if bar.isClosed:
+                window.add_bar(bar)
+                if bar.closeTime >= window.close_time:
+                    self.__emit(symbol, interval, window, windows, closed_until)
+                elif self.on_update is not None:
+                    self.on_update(window.candlestick(symbol, interval))
+            elif self.on_update is not None:
+                self.on_update(window.candlestick(symbol, interval, partial=bar))
+        if not bar.isClosed:
+            self.__partials[symbol] = bar
+
+    def on_aggregate_trade(self, event):
+        """Update the base interval and every higher one with an AggregateTradeEvent."""
+        symbol = event.symbol
+        windows, closed_until = self.__state(symbol)
+        for interval in [self.base] + self.intervals:
+            window = self.__window(symbol, interval, event.time, windows, closed_until)
+            if window is None:
+                continue
+            window.add_trade(event)
+            if self.on_update is not None:
+                self.on_update(window.candlestick(symbol, interval))
+
+    def flush(self, now=None):
+        """Close every bar whose window ended before now (ms, default the local clock)."""
+        if now is None:
+            now = int(time.time() * 1000)
+        for symbol, windows in self.__windows.items():
+            closed_until = self.__closed_until[symbol]
+            for interval, window in list(windows.items()):
+                if window.close_time < now:
+                    self.__emit(symbol, interval, window, windows, closed_until)
+
+    def current(self, symbol, interval):
+        """The running bar of symbol, None before the first update."""
+        window = self.__windows.get(symbol, dict()).get(interval)
+        if window is None:
+            return None
+        partial = self.__partials.get(symbol)
+        if partial is not None and not (
+            window.last_start < partial.startTime <= window.close_time
+        ):
+            partial = None
+        if window.open is None and partial is None:
+            return None
+        return window.candlestick(symbol, interval, partial=partial)
+
+    def callback(self, data_type, event):
+        """Subscription callback for subscribe_candlestick_event or subscribe_aggregate_trade_event."""
+        if data_type != SubscribeMessageType.PAYLOAD:
+            return
+        if isinstance(event, AggregateTradeEvent):
+            self.on_aggregate_trade(event)
+        else:
+            self.on_candlestick(event)
@@ -0,0 +1,241 @@
+import time
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model.constant import SubscribeMessageType
+from binance_f.tickbuffer import load_numpy
+
+class LiquidationAlert(object):
+    def __init__(self, symbol, side, window, notional, qty, count, threshold, above, event_time):
+        self.symbol = symbol
+        # SELL liquidates longs, BUY liquidates shorts.
+        self.side = side
+        # Window length in seconds.
+        self.window = window
+        self.notional = notional
+        self.qty = qty
+        self.count = count
+        self.threshold = threshold
+        # True when the window rose to the threshold, False when it fell back below.
+        self.above = above
+        self.eventTime = event_time
+
+    def as_json(self):
+        return dict(self.__dict__)
+
+
+class LiquidationRing(object):
+    def __init__(self, symbol, side, windows, capacity, numpy):
+        """
+        The last capacity liquidations of one symbol and side in NumPy columns, with a
+        running notional, quantity and count per window. Each window keeps the
+        sequence number of its oldest liquidation, so sliding it forward subtracts
+        only what left it: O(1) per liquidation and window.
+        """
+        self.symbol = symbol
+        self.side = side
+        self.windows = windows
+        self.capacity = capacity
+        self.time = numpy.zeros(capacity, dtype=numpy.int64)
+        self.qty = numpy.zeros(capacity, dtype=numpy.float64)
+        self.notional = numpy.zeros(capacity, dtype=numpy.float64)
+        self.count = 0
+        self.tails = [0] * len(windows)
+        self.notionals = [0.0] * len(windows)
+        self.qtys = [0.0] * len(windows)
+        # Whether each window was at or above its threshold after the last update.
+        self.above = [False] * len(windows)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __pop(self, index):
+        slot = self.tails[index] % self.capacity
+        self.notionals[index] -= float(self.notional[slot])
+        self.qtys[index] -= float(self.qty[slot])
+        self.tails[index] += 1
+        if self.tails[index] == self.count:
+            # Nothing left: reset the sums so float error does not accumulate.
+            self.notionals[index] = self.qtys[index] = 0.0
+
+    def append(self, event_time, qty, notional):
+        slot = self.count % self.capacity
+        if self.count >= self.capacity:
+            # The slot is overwritten: windows still holding it let it go first.
+            for index in range(len(self.windows)):
+                if self.tails[index] == self.count - self.capacity:
+                    self.__pop(index)
+        self.time[slot] = event_time
+        self.qty[slot] = qty
+        self.notional[slot] = notional
+        self.count += 1
+        for index in range(len(self.windows)):
+            self.notionals[index] += notional
+            self.qtys[index] += qty
+
+    def expire(self, now):
+        """Drop what is older than each window as of now (ms)."""
+        for index, seconds in enumerate(self.windows):
+            until = now - int(seconds * 1000)
+            while self.tails[index] < self.count and self.time[self.tails[index] % self.capacity] < until:
+                self.__pop(index)
+
+    def totals(self, index):
+        """(notional, qty, count) in window index as of the last expire()."""
+        return max(self.notionals[index], 0.0), max(self.qtys[index], 0.0), self.count - self.tails[index]
+
+
+class LiquidationFlow(object):
+    def __init__(self, windows=(1, 10, 60), thresholds=None, symbol_thresholds=None,
+                 capacity=4096, on_alert=None):
+        """
+        Rolling liquidation notional per symbol and side over fixed time windows,
+        fed from forceOrder streams, alerting only when a window crosses its
+        threshold, in either direction:
+
+            flow = LiquidationFlow(thresholds={10: 1e6, 60: 5e6}, on_alert=print)
+            sub_client.subscribe_liquidation_flow_event(flow)
+            flow.totals("BTCUSDT", "SELL", 10)
+
+        Windows slide on exchange trade times as liquidations arrive; call expire()
+        from a timer to also see windows fall back below their thresholds while
+        no liquidation arrives. Needs numpy (pip install binance-futures[numpy]).
+
+        :param windows: Window lengths in seconds.
+        :param thresholds: Window seconds to notional (quote asset) alerting for every
+            symbol; windows without one are tracked but never alert.
+        :param symbol_thresholds: Symbol to a thresholds mapping replacing the default
+            for that symbol.
+        :param capacity: Liquidations kept per symbol and side; the windows only count
+            what is still in the ring.
+        :param on_alert: Called with each LiquidationAlert.
+        """
+        self.numpy = load_numpy("The liquidation flow")
+        self.windows = tuple(sorted(windows))
+        self.thresholds = dict(thresholds or {})
+        self.symbol_thresholds = {
+            symbol: dict(values) for symbol, values in (symbol_thresholds or {}).items()
+        }
+        for values in [self.thresholds] + list(self.symbol_thresholds.values()):
+            for seconds in values:
+                self.__window_index(seconds)
+        self.capacity = capacity
+        self.on_alert = on_alert
+        self.rings = dict()
+        self.last_time = 0
+
+    def __window_index(self, seconds):
+        try:
+            return self.windows.index(seconds)
+        except ValueError:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] Unknown window " + str(seconds) + "s, windows are "
+                + ", ".join(str(window) for window in self.windows),
+            )
+
+    def ring(self, symbol, side):
+        ring = self.rings.get((symbol, side))
+        if ring is None:
+            ring = self.rings[(symbol, side)] = LiquidationRing(
+                symbol, side, self.windows, self.capacity, self.numpy
+            )
+        return ring
+
+    def __check(self, ring, now, alerts):
+        thresholds = self.symbol_thresholds.get(ring.symbol, self.thresholds)
+        if not thresholds:
+            return
+        for index, seconds in enumerate(self.windows):
+            threshold = thresholds.get(seconds)
+            if threshold is None:
+                continue
+            notional, qty, count = ring.totals(index)
+            above = notional >= threshold
+            if above != ring.above[index]:
+                ring.above[index] = above
+                alerts.append(LiquidationAlert(
+                    ring.symbol, ring.side, seconds, notional, qty, count, threshold,
+                    above, now,
+                ))
+
+    def add(self, symbol, side, event_time, qty, price):
+        """Record one liquidation; returns the alerts it caused."""
+        ring = self.ring(symbol, side)
+        ring.append(event_time, qty, qty * price)
+        self.last_time = max(self.last_time, event_time)
+        ring.expire(self.last_time)
+        alerts = list()
+        self.__check(ring, self.last_time, alerts)
+        return alerts
+
+    def add_order(self, order):
+        """Record a forceOrder "o" object; filled quantity at the average price."""
+        qty = float(order.get("z") or 0) or float(order["q"])
+        price = float(order.get("ap") or 0) or float(order["p"])
+        return self.add(order["s"], order["S"], order["T"], qty, price)
+
+    def expire(self, now=None):
+        """
+        Slide every window to now (ms, local clock if None) and return the alerts of
+        windows falling below their thresholds.
+        """
+        if now is None:
+            now = int(time.time() * 1000)
+        alerts = list()
+        for ring in self.rings.values():
+            ring.expire(now)
+            self.__check(ring, now, alerts)
+        self.__emit(alerts)
+        return alerts
+
+    def parse(self, json_wrapper):
+        """json_parser for forceOrder streams: records the frame and returns its alerts."""
+        data = json_wrapper.json_object
+        if isinstance(data, dict) and "data" in data:
+            data = data["data"]
+        alerts = list()
+        for item in data if isinstance(data, list) else [data]:
+            if item.get("e") == "forceOrder":
+                alerts.extend(self.add_order(item["o"]))
+        return alerts
+
+    def on_event(self, event):
+        """Record a LiquidationOrderEvent from subscribe_all_liquidation_event."""
+        order = event.data
+        qty = order.lastFilledAccumulatedQty or order.origQty
+        price = order.averagePrice or order.price
+        return self.add(order.symbol, order.side, order.time, qty, price)
+
+    def __emit(self, alerts):
+        if self.on_alert is not None:
+            for alert in alerts:
+                self.on_alert(alert)
+
+    def callback(self, data_type, event):
+        """
+        Subscription callback. Frames parsed by parse() arrive as their list of
+        alerts; LiquidationOrderEvent from the liquidation subscriptions is recorded here.
+        """
+        if data_type != SubscribeMessageType.PAYLOAD or event is None:
+            return
+        if not isinstance(event, list):
+            event = self.on_event(event)
+        self.__emit(event)
+
+    def totals(self, symbol, side, seconds):
+        """(notional, qty, count) of one symbol and side in a window, as of the last liquidation or expire()."""
+        ring = self.rings.get((symbol, side))
+        if ring is None:
+            return 0.0, 0.0, 0
+        return ring.totals(self.__window_index(seconds))
+
+    def top(self, seconds, n=10, side=None):
+        """The n (symbol, side, notional) with the most liquidated notional in a window."""
+        index = self.__window_index(seconds)
+        rows = [
+            (ring.symbol, ring.side, ring.totals(index)[0])
+            for ring in self.rings.values()
+            if side is None or ring.side == side
+        ]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return [row for row in rows[:n] if row[2] > 0]
@@ -0,0 +1,195 @@
+import asyncio
+
+from binance_f.base.log import USER_DATA, get_logger
+from binance_f.constant.system import WebSocketDefine
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.utils.channels import combined_channel
+from binance_f.impl.utils.jsonwrapper import JsonWrapper
+from binance_f.impl.websocketconnection import WebsocketConnection
+from binance_f.impl.websocketrequest import WebsocketRequest
+from binance_f.impl.websocketrequestimpl import parse_user_data_event
+from binance_f.impl.websocketwatchdog import WebSocketWatchDog
+from binance_f.model.constant import SubscribeMessageType
+
+logger = get_logger(USER_DATA)
+
+# Binance closes a listen key after 60 minutes without a keepalive.
+KEEPALIVE_INTERVAL = 30 * 60
+
+
+def combined_uri(uri):
+    """wss://host/ws -> wss://host/stream, where frames carry the stream name."""
+    if uri.endswith("/ws"):
+        return uri[: -len("/ws")] + "/stream"
+    return uri.rstrip("/") + "/stream"
+
+
+def unsubscribe_channel(streams):
+    return combined_channel(streams).replace('"SUBSCRIBE"', '"UNSUBSCRIBE"')
+
+
+def user_data_watch_dog(keepalive_interval=KEEPALIVE_INTERVAL):
+    """
+    A watchdog that tolerates user data streams staying silent between keepalives;
+    the server's ping frames do not count as received messages.
+    """
+    return WebSocketWatchDog(receive_limit_ms=max(2 * keepalive_interval, 60 * 60) * 1000)
+
+
+def send_or_defer(connection, data):
+    """Send on an open connection; a closed one resubscribes on reconnect instead."""
+    try:
+        connection.send(data)
+    except Exception as e:
+        logger.warning("[Sub][%s] not sent, left to the reconnect: %s", connection.id, e)
+
+
+class ListenKeyManager(object):
+    def __init__(
+        self,
+        client,
+        callback,
+        error_handler=None,
+        uri=None,
+        keepalive_interval=KEEPALIVE_INTERVAL,
+        retry_interval=5,
+        watch_dog=None,
+    ):
+        """
+        Keep one account's user data stream alive from timers on an asyncio loop.
+
+        The listen key is refreshed every keepalive_interval seconds. When a keepalive
+        fails or a listenKeyExpired event arrives, a new key is requested and the open
+        connection subscribes to it, so the callback and whatever state it holds keep
+        running. Nothing sleeps: refreshes are loop.call_later timers and the socket
+        runs on the usual websocket thread.
+
+            manager = ListenKeyManager(async_request_client, on_user_data)
+            await manager.start()
+
+        :param client: AsyncRequestClient of the account.
+        :param callback: Subscription callback (data_type, event) with OrderUpdate,
+            AccountUpdate and ListenKeyExpired, called on the loop; may be a coroutine
+            function.
+        :param error_handler: Called with BinanceApiException from the socket or a failed
+            renewal.
+        :param uri: Websocket base uri, defaults to WebSocketDefine.Uri.
+        :param retry_interval: Seconds before retrying a failed renewal.
+        :param watch_dog: WebSocketWatchDog to share, by default one tolerating quiet streams.
+        """
+        self.client = client
+        self.callback = callback
+        self.error_handler = error_handler
+        self.uri = combined_uri(uri or WebSocketDefine.Uri)
+        self.keepalive_interval = keepalive_interval
+        self.retry_interval = retry_interval
+        self.listen_key = None
+        self.renewals = 0
+        self.loop = None
+        self.connected = False
+        self.__watch_dog = watch_dog
+        self.__own_watch_dog = watch_dog is None
+        self.__connection = None
+        self.__timer = None
+        self.__renewing = None
+
+    async def start(self):
+        """Request a listen key, connect and schedule the first keepalive."""
+        self.loop = asyncio.get_event_loop()
+        self.listen_key = await self.client.start_user_data_stream()
+        if self.__watch_dog is None:
+            self.__watch_dog = user_data_watch_dog(self.keepalive_interval)
+        request = WebsocketRequest()
+        request.name = "listen_key_manager"
+        request.subscription_handler = self.__subscription_handler
+        request.json_parser = self.__json_parse
+        request.update_callback = self.__update_callback
+        request.error_handler = self.error_handler
+        self.__connection = WebsocketConnection(None, None, self.uri, self.__watch_dog, request)
+        self.__connection.connect()
+        self.__schedule(self.keepalive_interval)
+        return self
+
+    def __subscription_handler(self, connection):
+        # Runs again after a watchdog reconnect, with whatever key is current.
+        self.connected = True
+        connection.send(combined_channel([self.listen_key]))
+
+    def __json_parse(self, json_wrapper):
+        if json_wrapper.get_string_or_default("stream", None) != self.listen_key:
+            # Late frame of a replaced key.
+            return None
+        return parse_user_data_event(JsonWrapper(json_wrapper.json_object["data"]))
+
+    def __update_callback(self, data_type, event):
+        if data_type == SubscribeMessageType.PAYLOAD and event is not None:
+            self.loop.call_soon_threadsafe(self.__dispatch, event)
+
+    def __dispatch(self, event):
+        if getattr(event, "eventType", None) == "listenKeyExpired":
+            logger.warning("listen key expired at %s, renewing", event.eventTime)
+            self.renew()
+        try:
+            result = self.callback(SubscribeMessageType.PAYLOAD, event)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception:
+            logger.exception("user data callback failed")
+
+    def __schedule(self, delay):
+        if self.__timer is not None:
+            self.__timer.cancel()
+        self.__timer = self.loop.call_later(delay, self.__on_timer)
+
+    def __on_timer(self):
+        self.__timer = None
+        asyncio.ensure_future(self.keepalive())
+
+    async def keepalive(self):
+        """Refresh the key now; a key the server no longer knows is replaced."""
+        try:
+            await self.client.keep_user_data_stream()
+        except BinanceApiException as e:
+            logger.warning("listen key keepalive failed, renewing: %s", e.error_message)
+            await self.renew()
+            return
+        self.__schedule(self.keepalive_interval)
+
+    def renew(self):
+        """Replace the listen key; concurrent calls share one renewal."""
+        if self.__renewing is None or self.__renewing.done():
+            self.__renewing = asyncio.ensure_future(self.__renew())
+        return self.__renewing
+
+    async def __renew(self):
+        old_key = self.listen_key
+        try:
+            self.listen_key = await self.client.start_user_data_stream()
+        except BinanceApiException as e:
+            logger.error("listen key renewal failed, retrying in %ss: %s",
+                         self.retry_interval, e.error_message)
+            if self.error_handler is not None:
+                self.error_handler(e)
+            self.__schedule(self.retry_interval)
+            return
+        self.renewals += 1
+        if self.connected and self.listen_key != old_key:
+            send_or_defer(self.__connection, combined_channel([self.listen_key]))
+            send_or_defer(self.__connection, unsubscribe_channel([old_key]))
+        self.__schedule(self.keepalive_interval)
+
+    async def close(self, close_stream=True):
+        """
+        Cancel the timer and the socket.
+
+        :param close_stream: Also DELETE the listen key.
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if close_stream and self.listen_key is not None:
+            await self.client.close_user_data_stream()
+        if self.__connection is not None and self.__connection.ws is not None:
+            self.__connection.close()
+        if self.__own_watch_dog and self.__watch_dog is not None:
+            self.__watch_dog.graceful_shutdown()
@@ -0,0 +1,335 @@
+import struct
+import time
+
+from binance_f.base.log import WEBSOCKET, get_logger
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model.aggregatetradeevent import AggregateTradeEvent
+from binance_f.model.constant import SubscribeMessageType
+from binance_f.model.markpriceevent import MarkPriceEvent
+from binance_f.model.symbolbooktickerevent import SymbolBookTickerEvent
+
+logger = get_logger(WEBSOCKET)
+
+DEFAULT_NAME = "binance_f_market_data"
+MAGIC = b"BNFBUS01"
+
+# magic, symbol count, trade ring capacity
+HEADER = struct.Struct("<8sII")
+# trades published so far, rewritten after every ring record
+TRADE_HEAD = struct.Struct("<Q")
+HEAD_OFFSET = HEADER.size
+SYMBOL_NAME = struct.Struct("<16s")
+SEQUENCE = struct.Struct("<Q")
+# seq, orderBookUpdateId, bid, bid qty, ask, ask qty, publish time (us)
+BOOK_TICKER = struct.Struct("<Qqddddq")
+# seq, eventTime, markPrice, fundingRate, nextFundingTime, publish time (us)
+MARK_PRICE = struct.Struct("<Qqddqq")
+# seq, symbol index, isBuyerMaker, id, price, qty, firstId, lastId, time, eventTime
+TRADE = struct.Struct("<QIIqddqqqq")
+
+SPIN_LIMIT = 1000
+
+
+def shared_memory(name, create=False, size=0):
+    """
+    multiprocessing.shared_memory (Python 3.8+). Attached segments are not handed
+    to the resource tracker, which would otherwise unlink the publisher's segment
+    when the first consumer exits.
+    """
+    try:
+        from multiprocessing import shared_memory as module
+    except ImportError:
+        raise BinanceApiException(
+            BinanceApiException.ENV_ERROR,
+            "[Environment] The market data bus needs multiprocessing.shared_memory (Python 3.8+)",
+        )
+    if create:
+        return module.SharedMemory(name=name, create=True, size=size)
+    try:
+        return module.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching always registers; skip it rather than unregister
+    # afterwards, which breaks the publisher's registration in forked consumers.
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return module.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def layout(symbol_count, ring_capacity):
+    """Offsets of the symbol table, per-symbol records and trade ring, and the total size."""
+    symbols = HEAD_OFFSET + TRADE_HEAD.size
+    books = symbols + symbol_count * SYMBOL_NAME.size
+    marks = books + symbol_count * BOOK_TICKER.size
+    ring = marks + symbol_count * MARK_PRICE.size
+    return symbols, books, marks, ring, ring + ring_capacity * TRADE.size
+
+
+def now_us():
+    return int(time.time() * 1000000)
+
+
+class MarketDataPublisher(object):
+    def __init__(self, symbols, name=DEFAULT_NAME, ring_capacity=65536, replace=False):
+        """
+        Feed-handler side of the bus: one process owns the websocket subscription and
+        writes decoded updates into shared memory, where any number of local
+        MarketDataBus readers pick them up without sockets or JSON parsing.
+
+        The latest bookTicker and markPrice of each symbol live in fixed-width
+        records; aggregate trades go to a ring of ring_capacity records. Every record
+        is guarded by a seqlock: its sequence is odd while being written, so readers
+        retry instead of seeing a torn record. There must be a single publisher.
+
+        :param symbols: Symbols carried by the bus, e.g. ["BTCUSDT", "ETHUSDT"].
+        :param name: Shared memory segment name consumers attach to.
+        :param ring_capacity: Trades kept for readers that fall behind.
+        :param replace: Unlink a segment left by a previous publisher with this name.
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.name = name
+        self.ring_capacity = ring_capacity
+        self.__index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        offsets = layout(len(self.symbols), ring_capacity)
+        symbol_offset, self.__books, self.__marks, self.__ring, size = offsets
+        try:
+            self.segment = shared_memory(name, create=True, size=size)
+        except FileExistsError:
+            if not replace:
+                raise BinanceApiException(
+                    BinanceApiException.ENV_ERROR,
+                    "[Environment] Market data bus " + name + " already exists, "
+                    "another publisher is running or pass replace=True",
+                )
+            shared_memory(name).unlink()
+            self.segment = shared_memory(name, create=True, size=size)
+        self.buffer = self.segment.buf
+        self.buffer[:size] = bytes(size)
+        HEADER.pack_into(self.buffer, 0, MAGIC, len(self.symbols), ring_capacity)
+        for i, symbol in enumerate(self.symbols):
+            SYMBOL_NAME.pack_into(self.buffer, symbol_offset + i * SYMBOL_NAME.size, symbol.encode())
+        self.trades = 0
+
+    def __begin(self, offset):
+        sequence = SEQUENCE.unpack_from(self.buffer, offset)[0] + 1
+        SEQUENCE.pack_into(self.buffer, offset, sequence)
+        return sequence + 1
+
+    def publish_book_ticker(self, event):
+        index = self.__index.get(event.symbol)
+        if index is None:
+            return
+        offset = self.__books + index * BOOK_TICKER.size
+        sequence = self.__begin(offset)
+        BOOK_TICKER.pack_into(
+            self.buffer, offset, sequence - 1, event.orderBookUpdateId or 0,
+            event.bestBidPrice, event.bestBidQty, event.bestAskPrice, event.bestAskQty,
+            now_us(),
+        )
+        SEQUENCE.pack_into(self.buffer, offset, sequence)
+
+    def publish_mark_price(self, event):
+        index = self.__index.get(event.symbol)
+        if index is None:
+            return
+        offset = self.__marks + index * MARK_PRICE.size
+        sequence = self.__begin(offset)
+        MARK_PRICE.pack_into(
+            self.buffer, offset, sequence - 1, event.eventTime, event.markPrice,
+            event.fundingRate, event.nextFundingTime, now_us(),
+        )
+        SEQUENCE.pack_into(self.buffer, offset, sequence)
+
+    def publish_trade(self, event):
+        index = self.__index.get(event.symbol)
+        if index is None:
+            return
+        number = self.trades
+        offset = self.__ring + (number % self.ring_capacity) * TRADE.size
+        # Trade n is complete when its record sequence is 2n + 2, so a reader can
+        # tell an unwritten slot from one already overwritten by a later lap.
+        SEQUENCE.pack_into(self.buffer, offset, 2 * number + 1)
+        TRADE.pack_into(
+            self.buffer, offset, 2 * number + 1, index, 1 if event.isBuyerMaker else 0,
+            event.id, event.price, event.qty, event.firstId, event.lastId, event.time,
+            event.eventTime,
+        )
+        SEQUENCE.pack_into(self.buffer, offset, 2 * number + 2)
+        self.trades = number + 1
+        TRADE_HEAD.pack_into(self.buffer, HEAD_OFFSET, self.trades)
+
+    def publish(self, event):
+        if isinstance(event, SymbolBookTickerEvent):
+            self.publish_book_ticker(event)
+        elif isinstance(event, MarkPriceEvent):
+            self.publish_mark_price(event)
+        elif isinstance(event, AggregateTradeEvent):
+            self.publish_trade(event)
+
+    def callback(self, data_type, event):
+        """Subscription callback for SubscriptionClient.subscribe_market_data_event."""
+        if data_type == SubscribeMessageType.PAYLOAD and event is not None:
+            self.publish(event)
+
+    def subscribe(self, sub_client, error_handler=None, running_callback=None):
+        """Subscribe every symbol of the bus over one connection and publish its updates."""
+        sub_client.subscribe_market_data_event(
+            self.symbols, self.callback, error_handler, running_callback=running_callback
+        )
+
+    def close(self, unlink=True):
+        self.buffer = None
+        self.segment.close()
+        if unlink:
+            self.segment.unlink()
+
+
+class MarketDataBus(object):
+    def __init__(self, name=DEFAULT_NAME):
+        """
+        Consumer side: attach to the segment of a running MarketDataPublisher.
+
+        Reads decode straight from shared memory with struct.unpack_from; nothing is
+        copied besides the returned values. The trade cursor starts at the newest
+        trade, so a new consumer only sees trades published after it attached.
+        """
+        try:
+            self.segment = shared_memory(name)
+        except FileNotFoundError:
+            raise BinanceApiException(
+                BinanceApiException.ENV_ERROR,
+                "[Environment] No market data bus named " + name + ", start the publisher first",
+            )
+        self.name = name
+        self.buffer = self.segment.buf
+        magic, count, self.ring_capacity = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise BinanceApiException(
+                BinanceApiException.ENV_ERROR,
+                "[Environment] " + name + " is not a market data bus",
+            )
+        symbol_offset, self.__books, self.__marks, self.__ring, _ = layout(
+            count, self.ring_capacity
+        )
+        self.symbols = [
+            SYMBOL_NAME.unpack_from(self.buffer, symbol_offset + i * SYMBOL_NAME.size)[0]
+            .rstrip(b"\0").decode()
+            for i in range(count)
+        ]
+        self.__index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.cursor = self.head()
+        self.lost = 0
+
+    def __read(self, record, offset):
+        """Seqlock read: retry while the record is being written or changed meanwhile."""
+        buffer = self.buffer
+        for attempt in range(SPIN_LIMIT):
+            before = SEQUENCE.unpack_from(buffer, offset)[0]
+            if not before & 1:
+                values = record.unpack_from(buffer, offset)
+                if SEQUENCE.unpack_from(buffer, offset)[0] == before:
+                    return values
+            if attempt > 10:
+                time.sleep(0)
+        raise BinanceApiException(
+            BinanceApiException.RUNTIME_ERROR,
+            "[Executing] Market data bus record kept changing while being read",
+        )
+
+    def __offset(self, symbol, base, record):
+        index = self.__index.get(symbol.upper())
+        if index is None:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] " + symbol + " is not carried by market data bus " + self.name,
+            )
+        return base + index * record.size
+
+    def sequence(self, symbol, kind="bookTicker"):
+        """Change counter of the bookTicker or markPrice record, cheap to poll."""
+        if kind == "markPrice":
+            return SEQUENCE.unpack_from(self.buffer, self.__offset(symbol, self.__marks, MARK_PRICE))[0]
+        return SEQUENCE.unpack_from(self.buffer, self.__offset(symbol, self.__books, BOOK_TICKER))[0]
+
+    def book_ticker_values(self, symbol):
+        """(orderBookUpdateId, bid, bid qty, ask, ask qty, publish time us), None before the first update."""
+        values = self.__read(BOOK_TICKER, self.__offset(symbol, self.__books, BOOK_TICKER))
+        if values[0] == 0:
+            return None
+        return values[1:]
+
+    def book_ticker(self, symbol):
+        values = self.book_ticker_values(symbol)
+        if values is None:
+            return None
+        result = SymbolBookTickerEvent()
+        result.symbol = symbol.upper()
+        result.orderBookUpdateId = values[0]
+        result.bestBidPrice = values[1]
+        result.bestBidQty = values[2]
+        result.bestAskPrice = values[3]
+        result.bestAskQty = values[4]
+        return result
+
+    def mark_price_values(self, symbol):
+        """(eventTime, markPrice, fundingRate, nextFundingTime, publish time us), None before the first update."""
+        values = self.__read(MARK_PRICE, self.__offset(symbol, self.__marks, MARK_PRICE))
+        if values[0] == 0:
+            return None
+        return values[1:]
+
+    def mark_price(self, symbol):
+        values = self.mark_price_values(symbol)
+        if values is None:
+            return None
+        result = MarkPriceEvent()
+        result.eventType = "markPriceUpdate"
+        result.symbol = symbol.upper()
+        result.eventTime = values[0]
+        result.markPrice = values[1]
+        result.fundingRate = values[2]
+        result.nextFundingTime = values[3]
+        return result
+
+    def head(self):
+        """Number of trades published so far."""
+        return TRADE_HEAD.unpack_from(self.buffer, HEAD_OFFSET)[0]
+
+    def read_trades(self, limit=None):
+        """
+        AggregateTradeEvent published since the previous call, oldest first. Trades
+        overwritten before they were read are counted in self.lost.
+        """
+        head = self.head()
+        if head - self.cursor > self.ring_capacity:
+            self.lost += head - self.ring_capacity - self.cursor
+            self.cursor = head - self.ring_capacity
+        if limit is not None:
+            head = min(head, self.cursor + limit)
+        result = list()
+        while self.cursor < head:
+            number = self.cursor
+            offset = self.__ring + (number % self.ring_capacity) * TRADE.size
+            values = self.__read(TRADE, offset)
+            self.cursor += 1
+            if values[0] != 2 * number + 2:
+                # Lapped by the publisher while reading.
+                self.lost += 1
+                continue
+            trade = AggregateTradeEvent()
+            trade.eventType = "aggTrade"
+            (_, index, maker, trade.id, trade.price, trade.qty, trade.firstId,
+             trade.lastId, trade.time, trade.eventTime) = values
+            trade.symbol = self.symbols[index]
+            trade.isBuyerMaker = maker == 1
+            result.append(trade)
+        return result
+
+    def close(self):
+        self.buffer = None
+        self.segment.close()
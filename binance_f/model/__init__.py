@@ -1,36 +1,67 @@
+"""
+Models are imported on first attribute access (PEP 562), so importing the package
+does not load every model module. "from binance_f.model import *" still works and
+loads them all through __all__.
+"""
+import importlib
+
 from binance_f.model.constant import *
-from binance_f.model.message import Msg
-from binance_f.model.exchangeinformation import ExchangeInformation
-from binance_f.model.orderbook import OrderBook
-from binance_f.model.trade import Trade
-from binance_f.model.aggregatetrade import AggregateTrade
-from binance_f.model.candlestick import Candlestick
-from binance_f.model.markprice import MarkPrice
-from binance_f.model.openinterest import OpenInterest
-from binance_f.model.fundingrate import FundingRate
-from binance_f.model.tickerpricechangestatistics import TickerPriceChangeStatistics
-from binance_f.model.symbolprice import SymbolPrice
-from binance_f.model.symbolorderbook import SymbolOrderBook
-from binance_f.model.liquidationorder import LiquidationOrder
-from binance_f.model.aggregatetradeevent import AggregateTradeEvent
-from binance_f.model.markpriceevent import MarkPriceEvent
-from binance_f.model.candlestickevent import CandlestickEvent
-from binance_f.model.symbolminitickerevent import SymbolMiniTickerEvent
-from binance_f.model.symboltickerevent import SymbolTickerEvent
-from binance_f.model.symbolbooktickerevent import SymbolBookTickerEvent
-from binance_f.model.liquidationorderevent import LiquidationOrderEvent
-from binance_f.model.orderbookevent import OrderBookEvent
-from binance_f.model.diffdepthevent import DiffDepthEvent
-from binance_f.model.order import Order
-from binance_f.model.balance import Balance
-from binance_f.model.accountinformation import AccountInformation
-from binance_f.model.leverage import Leverage
-from binance_f.model.changemargintype import ChangeMarginType
-from binance_f.model.positionmargin import PositionMargin
-from binance_f.model.positionmarginhistory import PositionMarginHist
-from binance_f.model.position import Position
-from binance_f.model.mytrade import MyTrade
-from binance_f.model.income import Income
-from binance_f.model.accountupdate import AccountUpdate
-from binance_f.model.orderupdate import OrderUpdate
-from binance_f.model.listenkeyexpired import ListenKeyExpired
+
+_MODELS = {
+    "Msg": "message",
+    "ExchangeInformation": "exchangeinformation",
+    "OrderBook": "orderbook",
+    "Trade": "trade",
+    "AggregateTrade": "aggregatetrade",
+    "Candlestick": "candlestick",
+    "MarkPrice": "markprice",
+    "OpenInterest": "openinterest",
+    "FundingRate": "fundingrate",
+    "TickerPriceChangeStatistics": "tickerpricechangestatistics",
+    "SymbolPrice": "symbolprice",
+    "SymbolOrderBook": "symbolorderbook",
+    "LiquidationOrder": "liquidationorder",
+    "AggregateTradeEvent": "aggregatetradeevent",
+    "MarkPriceEvent": "markpriceevent",
+    "CandlestickEvent": "candlestickevent",
+    "SymbolMiniTickerEvent": "symbolminitickerevent",
+    "SymbolTickerEvent": "symboltickerevent",
+    "SymbolBookTickerEvent": "symbolbooktickerevent",
+    "LiquidationOrderEvent": "liquidationorderevent",
+    "OrderBookEvent": "orderbookevent",
+    "DiffDepthEvent": "diffdepthevent",
+    "Order": "order",
+    "Balance": "balance",
+    "AccountInformation": "accountinformation",
+    "Leverage": "leverage",
+    "ChangeMarginType": "changemargintype",
+    "PositionMargin": "positionmargin",
+    "PositionMarginHist": "positionmarginhistory",
+    "Position": "position",
+    "MyTrade": "mytrade",
+    "Income": "income",
+    "AccountUpdate": "accountupdate",
+    "OrderUpdate": "orderupdate",
+    "ListenKeyExpired": "listenkeyexpired",
+}
+
+_SUBMODULES = frozenset(_MODELS.values())
+
+__all__ = [name for name in dir() if not name.startswith("_") and name != "importlib"]
+__all__ += list(_MODELS) + sorted(_SUBMODULES)
+
+
+def __getattr__(name):
+    module = _MODELS.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module("binance_f.model." + module), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("binance_f.model." + name)
+    else:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODELS) | _SUBMODULES)
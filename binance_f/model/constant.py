@@ -13,7 +13,7 @@ class CandlestickInterval:
     DAY1 = "1d"
     DAY3 = "3d"
     WEEK1 = "1w"
-    MON1 = "1m"
+    MON1 = "1M"
     INVALID = None
 
 
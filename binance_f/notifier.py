@@ -0,0 +1,220 @@
+import collections
+import json
+import select
+import threading
+
+from binance_f.base.log import TRADER, get_logger
+from binance_f.exception.binanceapiexception import BinanceApiException
+
+logger = get_logger(TRADER)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class PublisherStats(object):
+    def __init__(self):
+        self.published = 0
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+        self.connects = 0
+        self.failures = 0
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class WebsocketPublisher(object):
+    def __init__(
+        self,
+        url,
+        max_queue=10000,
+        batch_size=100,
+        overflow=DROP_OLDEST,
+        block_timeout=1.0,
+        reconnect_delay=1.0,
+        max_reconnect_delay=30.0,
+        ping_interval=20.0,
+        encoder=json.dumps,
+        connect_timeout=10,
+    ):
+        """
+        One persistent outbound websocket for notifications, fed from any thread.
+
+        publish() only appends to a bounded queue, so it can be called from a
+        SubscriptionClient callback without holding up the socket reader. A sender
+        thread owns the connection: it writes every queued message in one socket
+        write per batch (each still its own websocket frame), reconnects with
+        exponential backoff and keeps messages queued while disconnected.
+
+            publisher = WebsocketPublisher("ws://controller:5020/config")
+            publisher.publish({"action": "cancelled"})
+
+        :param max_queue: Messages kept while the connection is slow or down.
+        :param batch_size: Most messages written in one socket write.
+        :param overflow: What publish() does with a full queue: drop_oldest (default)
+            evicts the oldest message, drop_newest rejects the new one, block waits up
+            to block_timeout seconds for room and then rejects it.
+        :param ping_interval: Seconds of idleness before sending a ping to keep the
+            connection open, None to never ping.
+        :param encoder: Turns a published object into the frame text; str and bytes are
+            sent as they are.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] overflow must be one of " + ", ".join(OVERFLOW_POLICIES),
+            )
+        self.url = url
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+        self.encoder = encoder
+        self.connect_timeout = connect_timeout
+        self.stats = PublisherStats()
+        self.__queue = collections.deque()
+        # Messages at the head of the queue being written by the sender.
+        self.__inflight = 0
+        self.__condition = threading.Condition()
+        self.__ws = None
+        self.__closing = False
+        self.__thread = threading.Thread(target=self.__run, name="ws-publisher", daemon=True)
+        self.__thread.start()
+
+    def __len__(self):
+        return len(self.__queue)
+
+    @property
+    def connected(self):
+        return self.__ws is not None
+
+    def publish(self, message):
+        """Queue a message for sending; False when the overflow policy rejected it."""
+        with self.__condition:
+            if self.__closing:
+                return False
+            if len(self.__queue) >= self.max_queue:
+                if self.overflow == DROP_OLDEST:
+                    self.__queue.popleft()
+                    if self.__inflight:
+                        # Already being written, it leaves the queue without a loss.
+                        self.__inflight -= 1
+                    else:
+                        self.stats.dropped += 1
+                elif self.overflow == BLOCK:
+                    # The sender notifies after taking a batch off the queue.
+                    self.__condition.wait_for(
+                        lambda: len(self.__queue) < self.max_queue or self.__closing,
+                        self.block_timeout,
+                    )
+                if len(self.__queue) >= self.max_queue or self.__closing:
+                    self.stats.dropped += 1
+                    return False
+            self.__queue.append(message)
+            self.stats.published += 1
+            self.__condition.notify_all()
+        return True
+
+    def __encode(self, message):
+        if isinstance(message, (str, bytes)):
+            return message
+        return self.encoder(message)
+
+    def __connect(self):
+        from websocket import create_connection
+
+        self.__ws = create_connection(self.url, timeout=self.connect_timeout)
+        self.stats.connects += 1
+        logger.info("publisher connected to %s", self.url)
+
+    def __disconnect(self):
+        ws, self.__ws = self.__ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def __drain(self):
+        """Read what the peer sent, so a close is noticed before writing into it."""
+        from websocket import ABNF
+
+        ws = self.__ws
+        while select.select([ws.sock], [], [], 0)[0]:
+            opcode, _ = ws.recv_data(control_frame=True)
+            if opcode == ABNF.OPCODE_CLOSE:
+                raise ConnectionError("closed by the server")
+
+    def __write(self, batch):
+        from websocket import ABNF
+
+        self.__drain()
+        frames = list()
+        for message in batch:
+            data = self.__encode(message)
+            opcode = ABNF.OPCODE_BINARY if isinstance(data, bytes) else ABNF.OPCODE_TEXT
+            frames.append(ABNF.create_frame(data, opcode).format())
+        self.__ws.sock.sendall(b"".join(frames))
+
+    def __next_batch(self):
+        """Wait for messages; an empty batch means the idle ping is due."""
+        with self.__condition:
+            if not self.__queue and not self.__closing:
+                self.__condition.wait(self.ping_interval)
+            self.__inflight = min(len(self.__queue), self.batch_size)
+            return [self.__queue[i] for i in range(self.__inflight)]
+
+    def __sent(self, count):
+        with self.__condition:
+            for _ in range(self.__inflight):
+                self.__queue.popleft()
+            self.__inflight = 0
+            self.stats.sent += count
+            self.stats.batches += 1
+            self.__condition.notify_all()
+
+    def __run(self):
+        delay = self.reconnect_delay
+        while True:
+            if self.__closing and not self.__queue:
+                break
+            try:
+                if self.__ws is None:
+                    self.__connect()
+                    delay = self.reconnect_delay
+                batch = self.__next_batch()
+                if batch:
+                    self.__write(batch)
+                    # Removed only once written, so a failed batch is retried in order.
+                    self.__sent(len(batch))
+                elif not self.__closing:
+                    self.__drain()
+                    self.__ws.ping()
+            except Exception as e:
+                with self.__condition:
+                    self.__inflight = 0
+                self.stats.failures += 1
+                self.__disconnect()
+                if self.__closing:
+                    break
+                logger.warning("publisher to %s failed, reconnecting in %ss: %s", self.url, delay, e)
+                with self.__condition:
+                    self.__condition.wait_for(lambda: self.__closing, delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        self.__disconnect()
+
+    def close(self, timeout=5.0):
+        """Send what is queued, waiting at most timeout seconds, and close the connection."""
+        with self.__condition:
+            self.__closing = True
+            self.__condition.notify_all()
+        self.__thread.join(timeout)
+        if self.__thread.is_alive():
+            logger.warning("publisher closed with %d messages unsent", len(self.__queue))
@@ -0,0 +1,311 @@
+import bisect
+import collections
+import itertools
+import os
+import threading
+import time
+
+from binance_f.base.log import TRADER, get_logger
+from binance_f.model.constant import SubscribeMessageType
+
+logger = get_logger(TRADER)
+
+# Segments timed for every order, in milliseconds. "local" is our clock corrected to
+# server time when a ServerTimeSync is given; E and T are the exchange's event and
+# transaction times of ORDER_TRADE_UPDATE, updateTime the one of the REST answer.
+SEGMENTS = collections.OrderedDict((
+    ("submit_to_ack", "REST round trip of post_order, local clock"),
+    ("submit_to_engine", "our send to the engine accepting the order (updateTime or NEW T)"),
+    ("engine_to_ack", "engine acceptance to the REST answer arriving"),
+    ("engine_to_event", "engine transaction time T to event time E"),
+    ("event_to_receive", "event time E to the update arriving on the stream"),
+    ("submit_to_new_event", "our send to the NEW update arriving"),
+    ("ack_to_new_event", "REST answer to the NEW update arriving; negative if the stream won"),
+    ("submit_to_fill", "our send to the first fill arriving"),
+    ("submit_to_done", "our send to FILLED, CANCELED, EXPIRED or REJECTED arriving"),
+))
+
+FINAL_STATUSES = ("FILLED", "CANCELED", "EXPIRED", "REJECTED")
+
+
+def histogram_bounds(lowest=0.05, highest=120000.0, per_doubling=4):
+    """Upper bucket bounds in ms growing by 2 ** (1 / per_doubling), about 9% apart."""
+    bounds = list()
+    bound = lowest
+    while bound < highest:
+        bounds.append(bound)
+        bound *= 2 ** (1.0 / per_doubling)
+    bounds.append(highest)
+    return bounds
+
+
+BOUNDS = histogram_bounds()
+
+
+class LatencyHistogram(object):
+    def __init__(self, bounds=BOUNDS):
+        """Log-bucketed latencies in ms; negative samples (clock skew) land in the first bucket."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, clamped to min/max."""
+        if not self.count:
+            return None
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class OrderTrace(object):
+    __slots__ = (
+        "client_order_id", "symbol", "submit", "submit_clock", "ack", "ack_clock",
+        "engine_time", "new_event", "fill_event", "done_event", "status", "order_id", "error",
+    )
+
+    def __init__(self, client_order_id, symbol, submit, submit_clock):
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        # Local times in ms: submit/ack/..._event on the (corrected) wall clock and
+        # *_clock on the monotonic clock for purely local durations.
+        self.submit = submit
+        self.submit_clock = submit_clock
+        self.ack = None
+        self.ack_clock = None
+        self.engine_time = None
+        self.new_event = None
+        self.fill_event = None
+        self.done_event = None
+        self.status = None
+        self.order_id = None
+        self.error = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class OrderTracer(object):
+    def __init__(self, time_sync=None, max_orders=10000, prefix="tr"):
+        """
+        Time every order from our send through the REST answer to its
+        ORDER_TRADE_UPDATE events, keyed by newClientOrderId, with one
+        LatencyHistogram per symbol and segment (see SEGMENTS).
+
+            tracer = OrderTracer(time_sync=client.sync_time())
+            sub_client.subscribe_user_data_event(listen_key, tracer.callback)
+            tracer.post_order(client, "BTCUSDT", OrderSide.BUY, OrderType.MARKET, quantity=0.001)
+            print(tracer.report())
+
+        Orders placed elsewhere can be traced with on_submit() and on_ack() around the
+        call. Segments crossing the exchange clock are only as good as the clock
+        offset; without a time_sync they include the local clock error.
+
+        :param time_sync: ServerTimeSync whose offset maps local times to server time.
+        :param max_orders: Traces kept for lookup, oldest evicted first.
+        :param prefix: Start of the generated client order ids.
+        """
+        self.time_sync = time_sync
+        self.max_orders = max_orders
+        # Unique per process and start, within the 36 characters Binance allows.
+        self.prefix = prefix + os.urandom(3).hex()
+        self.__ids = itertools.count(1)
+        self.__orders = collections.OrderedDict()
+        self.__histograms = dict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__orders)
+
+    def __getitem__(self, client_order_id):
+        return self.__orders[client_order_id]
+
+    def now(self):
+        if self.time_sync is not None:
+            return time.time() * 1000 + self.time_sync.offset
+        return time.time() * 1000
+
+    def new_client_order_id(self):
+        return self.prefix + "-" + str(next(self.__ids))
+
+    def __observe(self, symbol, segment, value):
+        histograms = self.__histograms.get(symbol)
+        if histograms is None:
+            histograms = self.__histograms[symbol] = {name: LatencyHistogram() for name in SEGMENTS}
+        histograms[segment].add(value)
+
+    def on_submit(self, symbol, client_order_id=None):
+        """Stamp an order about to be sent; returns its client order id, generated if None."""
+        if client_order_id is None:
+            client_order_id = self.new_client_order_id()
+        trace = OrderTrace(client_order_id, symbol, self.now(), time.perf_counter() * 1000)
+        with self.__lock:
+            self.__orders[client_order_id] = trace
+            while len(self.__orders) > self.max_orders:
+                self.__orders.popitem(last=False)
+        return client_order_id
+
+    def on_ack(self, order):
+        """Record the Order returned by post_order."""
+        received, clock = self.now(), time.perf_counter() * 1000
+        with self.__lock:
+            trace = self.__orders.get(order.clientOrderId)
+            if trace is None or trace.ack is not None:
+                return
+            trace.ack, trace.ack_clock = received, clock
+            trace.order_id = order.orderId
+            self.__observe(trace.symbol, "submit_to_ack", clock - trace.submit_clock)
+            if order.updateTime:
+                self.__engine(trace, order.updateTime)
+                self.__observe(trace.symbol, "engine_to_ack", received - order.updateTime)
+            if trace.new_event is not None:
+                self.__observe(trace.symbol, "ack_to_new_event", trace.new_event - received)
+
+    def on_error(self, client_order_id, error):
+        with self.__lock:
+            trace = self.__orders.get(client_order_id)
+            if trace is not None:
+                trace.error = error
+
+    def __engine(self, trace, engine_time):
+        if trace.engine_time is None:
+            trace.engine_time = engine_time
+            self.__observe(trace.symbol, "submit_to_engine", engine_time - trace.submit)
+
+    def on_order_update(self, event):
+        """Record an ORDER_TRADE_UPDATE; updates of untraced orders are ignored."""
+        received = self.now()
+        with self.__lock:
+            trace = self.__orders.get(event.clientOrderId)
+            if trace is None:
+                return
+            symbol = trace.symbol
+            trace.status = event.orderStatus
+            self.__observe(symbol, "engine_to_event", event.eventTime - event.transactionTime)
+            self.__observe(symbol, "event_to_receive", received - event.eventTime)
+            if event.executionType == "NEW" and trace.new_event is None:
+                trace.new_event = received
+                self.__engine(trace, event.transactionTime)
+                self.__observe(symbol, "submit_to_new_event", received - trace.submit)
+                if trace.ack is not None:
+                    self.__observe(symbol, "ack_to_new_event", received - trace.ack)
+            if event.executionType == "TRADE" and trace.fill_event is None:
+                trace.fill_event = received
+                # A taker order fills without a NEW update.
+                self.__engine(trace, event.transactionTime)
+                self.__observe(symbol, "submit_to_fill", received - trace.submit)
+            if event.orderStatus in FINAL_STATUSES and trace.done_event is None:
+                trace.done_event = received
+                self.__observe(symbol, "submit_to_done", received - trace.submit)
+
+    def callback(self, data_type, event):
+        """Subscription callback for subscribe_user_data_event or ListenKeyManager."""
+        if data_type == SubscribeMessageType.PAYLOAD and getattr(event, "eventType", None) == "ORDER_TRADE_UPDATE":
+            self.on_order_update(event)
+
+    def post_order(self, client, symbol, side, ordertype, newClientOrderId=None, **kwargs):
+        """RequestClient.post_order, traced."""
+        client_order_id = self.on_submit(symbol, newClientOrderId)
+        try:
+            order = client.post_order(
+                symbol=symbol, side=side, ordertype=ordertype,
+                newClientOrderId=client_order_id, **kwargs
+            )
+        except Exception as e:
+            self.on_error(client_order_id, e)
+            raise
+        self.on_ack(order)
+        return order
+
+    async def async_post_order(self, client, symbol, side, ordertype, newClientOrderId=None, **kwargs):
+        """AsyncRequestClient.post_order, traced."""
+        client_order_id = self.on_submit(symbol, newClientOrderId)
+        try:
+            order = await client.post_order(
+                symbol=symbol, side=side, ordertype=ordertype,
+                newClientOrderId=client_order_id, **kwargs
+            )
+        except Exception as e:
+            self.on_error(client_order_id, e)
+            raise
+        self.on_ack(order)
+        return order
+
+    def histograms(self, symbol=None):
+        """segment -> LatencyHistogram of one symbol, or merged over all symbols."""
+        with self.__lock:
+            if symbol is not None:
+                return dict(self.__histograms.get(symbol, dict()))
+            merged = {name: LatencyHistogram() for name in SEGMENTS}
+            for histograms in self.__histograms.values():
+                for name, histogram in histograms.items():
+                    merged[name].merge(histogram)
+            return merged
+
+    def summary(self):
+        """{symbol: {segment: {count, mean, min, p50, p90, p99, max}}}, plus "ALL"."""
+        with self.__lock:
+            symbols = list(self.__histograms)
+        result = {"ALL": self.histograms()}
+        for symbol in symbols:
+            result[symbol] = self.histograms(symbol)
+        return {
+            symbol: {name: histogram.as_dict() for name, histogram in histograms.items() if histogram.count}
+            for symbol, histograms in result.items()
+        }
+
+    def report(self, symbol=None):
+        """Text table of where order latency goes, in ms."""
+        histograms = self.histograms(symbol)
+        lines = ["%-20s %7s %9s %9s %9s %9s" % ("segment", "count", "p50", "p90", "p99", "max")]
+        for name in SEGMENTS:
+            histogram = histograms.get(name)
+            if histogram is None or not histogram.count:
+                continue
+            lines.append("%-20s %7d %9.2f %9.2f %9.2f %9.2f" % (
+                name, histogram.count, histogram.percentile(50), histogram.percentile(90),
+                histogram.percentile(99), histogram.max,
+            ))
+        return "\n".join(lines)
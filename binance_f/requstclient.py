@@ -1,6 +1,7 @@
 from binance_f.constant.system import RestApiDefine
 from binance_f.impl.restapirequestimpl import RestApiRequestImpl
 from binance_f.impl.restapiinvoker import call_sync
+from binance_f.impl.utils.timeservice import ServerTimeSync
 from binance_f.model.constant import *
 
 
@@ -8,30 +9,82 @@ class RequestClient(object):
     def __init__(self, debug=True, **kwargs):
         """
         Create the request client instance.
+        :param debug: Log requests and responses on the "binance-futures.rest" logger
+            at DEBUG level; nothing is formatted unless that level is enabled.
         :param kwargs: The option of request connection.
             api_key: The public key applied from Binance.
             secret_key: The private key applied from Binance.
             server_url: The URL name like "https://api.binance.com".
+            time_sync: A ServerTimeSync used to timestamp signed requests, see sync_time().
+            recv_window: recvWindow sent with signed requests in milliseconds. Once the
+                clock offset is measured this can be tightened well below 60000.
+            recorder: A TrafficRecorder capturing every request/response pair.
+            transport: A ReplayTransport answering requests from a recording instead
+                of the network.
+            rate_limiter: A WeightRateLimiter shared by the clients of one IP; requests
+                wait for the next weight window instead of getting HTTP 429.
+            policies: A PolicySet with the timeouts, retries and hedging per endpoint,
+                defaults to binance_f.impl.requestpolicy.DEFAULT_POLICIES.
         """
         api_key = None
         secret_key = None
         url = RestApiDefine.Url
+        time_sync = None
+        recv_window = 60000
         if "api_key" in kwargs:
             api_key = kwargs["api_key"]
         if "secret_key" in kwargs:
             secret_key = kwargs["secret_key"]
         if "url" in kwargs:
             url = kwargs["url"]
+        if "time_sync" in kwargs:
+            time_sync = kwargs["time_sync"]
+        if "recv_window" in kwargs:
+            recv_window = kwargs["recv_window"]
+        self.recorder = kwargs.get("recorder")
+        self.transport = kwargs.get("transport")
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.policies = kwargs.get("policies")
         self.debug = debug
         try:
             self.request_impl = RestApiRequestImpl(
-                api_key, secret_key, url, develop=debug
+                api_key,
+                secret_key,
+                url,
+                develop=debug,
+                time_sync=time_sync,
+                recv_window=recv_window,
             )
         except Exception:
             pass
 
     def call_sync(self,func):
-        return call_sync(func,debug=self.debug)
+        if self.transport is not None:
+            return self.transport.call_sync(func)
+        return call_sync(
+            func,
+            debug=self.debug,
+            recorder=self.recorder,
+            rate_limiter=self.rate_limiter,
+            policies=self.policies,
+        )
+
+    def sync_time(self, background=True, **kwargs) -> "ServerTimeSync":
+        """
+        Measure the local/server clock offset and use it for every signed request.
+
+        :param background: Keep refreshing the offset on a daemon thread.
+        :param kwargs: samples and refresh_interval forwarded to ServerTimeSync.
+        """
+        time_sync = self.request_impl.time_sync
+        if time_sync is None:
+            time_sync = ServerTimeSync(**kwargs)
+            self.request_impl.time_sync = time_sync
+        if background:
+            time_sync.start(self.get_servertime)
+        else:
+            time_sync.synchronize(self.get_servertime)
+        return time_sync
 
     def get_servertime(self) -> any:
         """
@@ -4,9 +4,11 @@ import typing
 import urllib.parse
 
 from binance_f import autotrade
+from binance_f.base.log import TRADER, get_logger
 from binance_f.base.printobject import *
 from binance_f.constant.system import WebSocketDefine
 from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.eventbatcher import DEFAULT_BATCH_SIZE
 from binance_f.impl.restapirequestimpl import RestApiRequestImpl
 from binance_f.impl.websocketconnection import WebsocketConnection
 from binance_f.impl.websocketrequestimpl import SimpleSocketImpl, WebsocketRequestImpl
@@ -15,6 +17,8 @@ from binance_f.model import *
 from binance_f.model import constant, order, position
 from binance_f.model.constant import *
 
+trader_logger = get_logger(TRADER)
+
 
 class ConnectionsKlass:
     def __init__(self):
@@ -111,6 +115,14 @@ class SubscriptionClient(object):
             receive_limit_ms: Set the receive limit in millisecond. If no message is received within this limit time,
                             the connection will be disconnected.
             connection_delay_failure: If auto reconnect is enabled, specify the delay time before reconnect.
+            recorder: A TrafficRecorder capturing every raw frame received.
+            batch_size: Market stream subscriptions made with batch=True deliver their events
+                            in batches of up to this many messages (default 100), as
+                            callback(SubscribeMessageType.PAYLOAD, [event, ...]); array streams
+                            are flattened into the batch, see EventBatcher.
+            batch_interval_us: Deliver a batch at the latest this many microseconds after
+                            its first message (default 1000).
+            batch_columns: Deliver a batch as a dict of attribute name to list of values.
         """
         api_key = None
         secret_key = None
@@ -120,6 +132,10 @@ class SubscriptionClient(object):
             secret_key = kwargs["secret_key"]
         self.__api_key = api_key
         self.__secret_key = secret_key
+        self.recorder = kwargs.get("recorder")
+        self.batch_size = kwargs.get("batch_size")
+        self.batch_interval_us = kwargs.get("batch_interval_us")
+        self.batch_columns = kwargs.get("batch_columns", False)
         self.websocket_request_impl = WebsocketRequestImpl(self.__api_key)
         self.connections = ConnectionsKlass()
         # self.connections = list()
@@ -146,9 +162,18 @@ class SubscriptionClient(object):
         except KeyboardInterrupt:
             connection.shutdown_gracefully()
 
-    def __create_connection(self, request, running_callback=None):
+    def __create_connection(self, request, running_callback=None, batch=False):
+        if batch:
+            request.batch_size = self.batch_size or DEFAULT_BATCH_SIZE
+            request.batch_interval_us = self.batch_interval_us
+            request.batch_columns = self.batch_columns
         connection = WebsocketConnection(
-            self.__api_key, self.__secret_key, self.uri, self.__watch_dog, request
+            self.__api_key,
+            self.__secret_key,
+            self.uri,
+            self.__watch_dog,
+            request,
+            recorder=self.recorder,
         )
         self.connections.append(connection)
         connection.connect()
@@ -172,7 +197,7 @@ class SubscriptionClient(object):
         self.thread_safe_shutdown(request.name, callback=running_callback)
 
     def subscribe_aggregate_trade_event(
-        self, symbol: "str", callback, error_handler=None
+        self, symbol: "str", callback, error_handler=None, batch=False
     ):
         """
         Aggregate Trade Streams
@@ -185,10 +210,10 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_aggregate_trade_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_mark_price_event(
-        self, symbol: "str", callback, error_handler=None, running_callback=None
+        self, symbol: "str", callback, error_handler=None, running_callback=None, batch=False
     ):
         """
         Mark Price Stream
@@ -201,7 +226,7 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_mark_price_event"
-        self.__create_connection(request, running_callback=running_callback)
+        self.__create_connection(request, running_callback=running_callback, batch=batch)
 
     def subscribe_candlestick_event(
         self,
@@ -210,6 +235,7 @@ class SubscriptionClient(object):
         callback,
         error_handler=None,
         running_callback=None,
+        batch=False,
     ):
         """
         Kline/Candlestick Streams
@@ -222,10 +248,10 @@ class SubscriptionClient(object):
             symbol, interval, callback, error_handler
         )
         request.name = "subscribe_candlestick_event"
-        self.__create_connection(request, running_callback=running_callback)
+        self.__create_connection(request, running_callback=running_callback, batch=batch)
 
     def subscribe_symbol_miniticker_event(
-        self, symbol: "str", callback, error_handler=None
+        self, symbol: "str", callback, error_handler=None, batch=False
     ):
         """
         Individual Symbol Mini Ticker Stream
@@ -239,9 +265,9 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_symbol_miniticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
-    def subscribe_all_miniticker_event(self, callback, error_handler=None):
+    def subscribe_all_miniticker_event(self, callback, error_handler=None, batch=False):
         """
         All Market Mini Tickers Stream
 
@@ -255,10 +281,10 @@ class SubscriptionClient(object):
             callback, error_handler
         )
         request.name = "subscribe_all_miniticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_symbol_ticker_event(
-        self, symbol: "str", callback, error_handler=None
+        self, symbol: "str", callback, error_handler=None, batch=False
     ):
         """
         Individual Symbol Ticker Streams
@@ -272,9 +298,9 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_symbol_ticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
-    def subscribe_all_ticker_event(self, callback, error_handler=None):
+    def subscribe_all_ticker_event(self, callback, error_handler=None, batch=False):
         """
         All Market Tickers Stream
 
@@ -287,10 +313,10 @@ class SubscriptionClient(object):
             callback, error_handler
         )
         request.name = "subscribe_all_ticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_symbol_bookticker_event(
-        self, symbol: "str", callback, error_handler=None
+        self, symbol: "str", callback, error_handler=None, batch=False
     ):
         """
         Individual Symbol Book Ticker Streams
@@ -303,9 +329,9 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_symbol_bookticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
-    def subscribe_all_bookticker_event(self, callback, error_handler=None):
+    def subscribe_all_bookticker_event(self, callback, error_handler=None, batch=False):
         """
         All Book Tickers Stream
 
@@ -317,10 +343,10 @@ class SubscriptionClient(object):
             callback, error_handler
         )
         request.name = "subscribe_all_bookticker_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_symbol_liquidation_event(
-        self, symbol: "str", callback, error_handler=None
+        self, symbol: "str", callback, error_handler=None, batch=False
     ):
         """
         Liquidation Order Streams
@@ -333,9 +359,9 @@ class SubscriptionClient(object):
             symbol, callback, error_handler
         )
         request.name = "subscribe_symbol_liquidation_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
-    def subscribe_all_liquidation_event(self, callback, error_handler=None):
+    def subscribe_all_liquidation_event(self, callback, error_handler=None, batch=False):
         """
         All Market Liquidation Order Streams
 
@@ -347,7 +373,7 @@ class SubscriptionClient(object):
             callback, error_handler
         )
         request.name = "subscribe_all_liquidation_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_book_depth_event(
         self,
@@ -356,6 +382,7 @@ class SubscriptionClient(object):
         callback,
         error_handler=None,
         update_time: "UpdateTime" = UpdateTime.INVALID,
+        batch=False,
     ):
         """
         Partial Book Depth Streams
@@ -364,12 +391,11 @@ class SubscriptionClient(object):
 
         Stream Names: <symbol>@depth<levels> OR <symbol>@depth<levels>@100ms.
         """
-        print(update_time)
         request = self.websocket_request_impl.subscribe_book_depth_event(
             symbol, limit, update_time, callback, error_handler
         )
         request.name = "subscribe_book_depth_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_diff_depth_event(
         self,
@@ -377,6 +403,7 @@ class SubscriptionClient(object):
         callback,
         error_handler=None,
         update_time: "UpdateTime" = UpdateTime.INVALID,
+        batch=False,
     ):
         """
         Diff. Depth Stream
@@ -389,7 +416,7 @@ class SubscriptionClient(object):
             symbol, update_time, callback, error_handler
         )
         request.name = "subscribe_diff_depth_event"
-        self.__create_connection(request)
+        self.__create_connection(request, batch=batch)
 
     def subscribe_user_data_event(
         self, listenKey: "str", callback, error_handler=None, running_callback=None
@@ -403,19 +430,141 @@ class SubscriptionClient(object):
         request.name = "subscribe_user_data_event"
         self.__create_connection(request, running_callback=running_callback)
 
+    def subscribe_market_data_event(
+        self,
+        symbols: "list",
+        callback,
+        error_handler=None,
+        running_callback=None,
+        streams=("bookTicker", "markPrice", "aggTrade"),
+    ):
+        """
+        Book ticker, mark price and aggregate trade streams of several symbols over
+        one connection. The callback receives SymbolBookTickerEvent, MarkPriceEvent
+        and AggregateTradeEvent; Binance allows up to 200 streams per connection.
+
+        Stream Names: <symbol>@bookTicker, <symbol>@markPrice, <symbol>@aggTrade
+        """
+        request = self.websocket_request_impl.subscribe_market_data_event(
+            symbols, streams, callback, error_handler
+        )
+        request.name = "subscribe_market_data_event"
+        self.__create_connection(request, running_callback=running_callback)
+
+    def subscribe_tick_buffer_event(
+        self,
+        symbols: "list",
+        buffer: "TickBuffer",
+        error_handler=None,
+        running_callback=None,
+        stream: "str" = "aggTrade",
+    ):
+        """
+        Trade streams of several symbols written straight into a TickBuffer.
+
+        Frames are parsed into the buffer's NumPy columns without an event object per
+        trade; buffer.on_trade is called with the symbol's TickRing after each one.
+
+        Stream Name: <symbol>@aggTrade or <symbol>@trade
+        """
+        request = self.websocket_request_impl.subscribe_tick_buffer_event(
+            symbols, stream, buffer, error_handler
+        )
+        request.name = "subscribe_tick_buffer_event"
+        self.__create_connection(request, running_callback=running_callback)
+
+    def subscribe_liquidation_flow_event(
+        self,
+        flow: "LiquidationFlow",
+        symbols: "list" = None,
+        error_handler=None,
+        running_callback=None,
+    ):
+        """
+        Liquidations of all symbols, or of the given ones, aggregated by a
+        LiquidationFlow into rolling windows; flow.on_alert is called only when a
+        window crosses its threshold.
+
+        Stream Name: !forceOrder@arr or <symbol>@forceOrder
+        """
+        if symbols is None:
+            streams = ["!forceOrder@arr"]
+        else:
+            streams = [symbol.lower() + "@forceOrder" for symbol in symbols]
+        request = self.websocket_request_impl.subscribe_liquidation_flow_event(
+            streams, flow, error_handler
+        )
+        request.name = "subscribe_liquidation_flow_event"
+        self.__create_connection(request, running_callback=running_callback)
+
+    def subscribe_funding_scanner_event(
+        self,
+        scanner: "FundingScanner",
+        error_handler=None,
+        running_callback=None,
+        update_speed: "str" = None,
+    ):
+        """
+        Mark price, index price and funding rate of every symbol written straight into
+        a FundingScanner's NumPy columns, one array frame per update.
+
+        scanner.on_update is called with the scanner after each frame.
+
+        Stream Name: !markPrice@arr or !markPrice@arr@1s
+        """
+        stream = "!markPrice@arr"
+        if update_speed is not None:
+            stream += "@" + update_speed
+        request = self.websocket_request_impl.subscribe_funding_scanner_event(
+            stream, scanner, error_handler
+        )
+        request.name = "subscribe_funding_scanner_event"
+        self.__create_connection(request, running_callback=running_callback)
+
 
 class HelperMixin:
+    async def _get_symbol_rules(self):
+        rules_cache = getattr(self, "rules_cache", None)
+        if rules_cache is None:
+            return None
+        buy_symbol = getattr(self, "buy_symbol")
+        client = getattr(self, "client")
+        return await rules_cache.async_load(client, buy_symbol)
+
+    async def _order_values(self, quantity, price=None, stop_price=None, market=False):
+        """
+        Round and validate quantity/price/stopPrice against the symbol filters when a
+        rules_cache is configured, otherwise fall back to the places/price_places formats.
+        """
+        rules = await self._get_symbol_rules()
+        if rules is None:
+            places = getattr(self, "places")
+            price_places = getattr(self, "price_places", None)
+            return (
+                format(places % quantity),
+                None if price is None else format(price_places % price),
+                None if stop_price is None else format(price_places % stop_price),
+            )
+        _quantity = rules.round_quantity(quantity)
+        _price = None if price is None else rules.round_price(price)
+        _stop_price = None if stop_price is None else rules.round_price(stop_price)
+        rules.validate(_quantity, _price if _price is not None else _stop_price, market)
+        return (
+            rules.quantity_format % _quantity,
+            None if _price is None else rules.price_format % _price,
+            None if _stop_price is None else rules.price_format % _stop_price,
+        )
+
     async def _limit(self, price, quantity, kind="sell") -> order.Order:
         buy_symbol = getattr(self, "buy_symbol")
-        places = getattr(self, "places")
-        price_places = getattr(self, "price_places")
         client = getattr(self, "client")
+        _quantity, _price, _ = await self._order_values(quantity, price)
         kwargs = dict(
             symbol=buy_symbol,
             side=constant.OrderSide.SELL,
             ordertype=constant.OrderType.LIMIT,
-            quantity=format(places % quantity),
-            price=format(price_places % price),
+            quantity=_quantity,
+            price=_price,
             timeInForce=constant.TimeInForce.GTC,
         )
         if kind == "buy":
@@ -424,13 +573,13 @@ class HelperMixin:
 
     async def _market(self, quantity, kind="sell"):
         buy_symbol = getattr(self, "buy_symbol")
-        places = getattr(self, "places")
         client = getattr(self, "client")
+        _quantity, _, _ = await self._order_values(quantity, market=True)
         kwargs = dict(
             symbol=buy_symbol,
             side=constant.OrderSide.SELL,
             ordertype=constant.OrderType.MARKET,
-            quantity=format(places % quantity),
+            quantity=_quantity,
         )
         if kind == "buy":
             kwargs["side"] = constant.OrderSide.BUY
@@ -440,22 +589,23 @@ class HelperMixin:
         self, quantity, price, orderType, kind="long", reduceOnly=None
     ) -> order.Order:
         buy_symbol = getattr(self, "buy_symbol")
-        places = getattr(self, "places")
-        price_places = getattr(self, "price_places")
         client = getattr(self, "client")
+        stop_price = price - 1 if kind == "short" else price + 1
+        _quantity, _, _stop_price = await self._order_values(
+            quantity, stop_price=stop_price, market=True
+        )
         kwargs = {
             "symbol": buy_symbol,
             "ordertype": orderType,
-            "quantity": format(places % quantity),
+            "quantity": _quantity,
             "side": constant.OrderSide.SELL,
-            "stopPrice": format(price_places % (price + 1)),
+            "stopPrice": _stop_price,
             "reduceOnly": reduceOnly,
             # "workingType": constant.WorkingType.MARK_PRICE if kind=="long" else constant.WorkingType.CONTRACT_PRICE,
         }
         if kind == "short":
             kwargs["ordertype"] = orderType
             kwargs["side"] = constant.OrderSide.BUY
-            kwargs["stopPrice"] = format(price_places % (price - 1))
         return await client.post_order(**kwargs)
 
     async def _stop_limit(
@@ -469,17 +619,19 @@ class HelperMixin:
         workingType=WorkingType.INVALID,
     ) -> order.Order:
         buy_symbol = getattr(self, "buy_symbol")
-        places = getattr(self, "places")
-        price_places = getattr(self, "price_places")
         client = getattr(self, "client")
+        stop_price = price - 1 if kind == "short" else price + 1
+        _quantity, _price, _stop_price = await self._order_values(
+            quantity, price, stop_price
+        )
         kwargs = {
             "symbol": buy_symbol,
             "ordertype": orderType,
             "timeInForce": "GTC",
-            "quantity": format(places % quantity),
-            "price": format(price_places % price),
+            "quantity": _quantity,
+            "price": _price,
             "side": constant.OrderSide.SELL,
-            "stopPrice": format(price_places % (price + 1)),
+            "stopPrice": _stop_price,
             "reduceOnly": reduceOnly,
             "timeInForce": timeInForce,
             # "workingType": constant.WorkingType.MARK_PRICE if kind=="long" else constant.WorkingType.CONTRACT_PRICE,
@@ -488,7 +640,6 @@ class HelperMixin:
         if kind == "short":
             kwargs["ordertype"] = orderType
             kwargs["side"] = constant.OrderSide.BUY
-            kwargs["stopPrice"] = format(price_places % (price - 1))
         return await client.post_order(**kwargs)
 
     async def get_price(self) -> typing.Optional[float]:
@@ -563,7 +714,7 @@ class HelperMixin:
                 symbol=buy_symbol.upper(), amount=amount, type=1
             )
         except Exception as e:
-            print(e)
+            trader_logger.warning("update_position_margin(%s) failed: %s", amount, e)
 
     async def filter_out_existing_trades(self, open_trades, currentPrice, position):
         interval = getattr(self, "no_of_trades", 4)
@@ -855,14 +1006,13 @@ class HelperMixin:
                 _balance -= position.unrealizedProfit
             else:
                 _balance += position.unrealizedProfit
-        print(
-            {
-                "balance": _balance,
-                "entry": position.entryPrice,
-                "quantity": _quantity,
-                "kind": position.kind,
-                "pnl": position.unrealizedProfit,
-            }
+        trader_logger.debug(
+            "liquidation balance=%s entry=%s quantity=%s kind=%s pnl=%s",
+            _balance,
+            position.entryPrice,
+            _quantity,
+            position.kind,
+            position.unrealizedProfit,
         )
         return liquidation(
             _balance,
@@ -880,7 +1030,7 @@ class HelperMixin:
         if not _kind:
             position = await self._get_position()
             _kind = position.kind
-        print("kind is ", _kind)
+        trader_logger.debug("largest order price for %s", _kind)
         if _kind == "long":
             result = min([x.price for x in trades["open"]])
         else:
@@ -917,7 +1067,6 @@ class HelperMixin:
     ):
         budget = getattr(self, "budget")
         q = quantity or budget
-        print(q)
         l = leverage
         e = entry
         if not entry:
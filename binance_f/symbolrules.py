@@ -0,0 +1,201 @@
+import asyncio
+import math
+import time
+import typing
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+
+
+def decimal_places(step):
+    """Number of decimals carried by a filter step such as "0.00100000"."""
+    text = str(step)
+    if "e" in text or "E" in text:
+        text = "%.20f" % float(step)
+    if "." not in text:
+        return 0
+    return len(text.rstrip("0").split(".")[1])
+
+
+class SymbolRules:
+    def __init__(self):
+        self.symbol = ""
+        self.status = ""
+        self.tick_size = 0.0
+        self.min_price = 0.0
+        self.max_price = 0.0
+        self.step_size = 0.0
+        self.min_qty = 0.0
+        self.max_qty = 0.0
+        self.market_step_size = 0.0
+        self.market_min_qty = 0.0
+        self.market_max_qty = 0.0
+        self.min_notional = 0.0
+        self.price_format = "%.2f"
+        self.quantity_format = "%.3f"
+
+    @staticmethod
+    def from_symbol(symbol):
+        """
+        Build the rules from an exchangeinformation.Symbol, precomputing the
+        format strings so rounding is a couple of float ops and one '%'.
+        """
+        result = SymbolRules()
+        result.symbol = symbol.symbol
+        result.status = symbol.status
+        if symbol.pricePrecision is not None:
+            result.price_format = "%." + str(symbol.pricePrecision) + "f"
+        if symbol.quantityPrecision is not None:
+            result.quantity_format = "%." + str(symbol.quantityPrecision) + "f"
+        for item in symbol.filters:
+            filter_type = item.get("filterType")
+            if filter_type == "PRICE_FILTER":
+                result.tick_size = float(item.get("tickSize", 0))
+                result.min_price = float(item.get("minPrice", 0))
+                result.max_price = float(item.get("maxPrice", 0))
+                if result.tick_size > 0:
+                    result.price_format = (
+                        "%." + str(decimal_places(item["tickSize"])) + "f"
+                    )
+            elif filter_type == "LOT_SIZE":
+                result.step_size = float(item.get("stepSize", 0))
+                result.min_qty = float(item.get("minQty", 0))
+                result.max_qty = float(item.get("maxQty", 0))
+                if result.step_size > 0:
+                    result.quantity_format = (
+                        "%." + str(decimal_places(item["stepSize"])) + "f"
+                    )
+            elif filter_type == "MARKET_LOT_SIZE":
+                result.market_step_size = float(item.get("stepSize", 0))
+                result.market_min_qty = float(item.get("minQty", 0))
+                result.market_max_qty = float(item.get("maxQty", 0))
+            elif filter_type == "MIN_NOTIONAL":
+                result.min_notional = float(
+                    item.get("notional", item.get("minNotional", 0))
+                )
+        return result
+
+    def round_price(self, price):
+        """Round to the nearest tick."""
+        if self.tick_size > 0:
+            price = round(price / self.tick_size) * self.tick_size
+        return float(self.price_format % price)
+
+    def round_quantity(self, quantity):
+        """Round down to the lot step so the order never exceeds the requested size."""
+        if self.step_size > 0:
+            quantity = math.floor(quantity / self.step_size + 1e-9) * self.step_size
+        return float(self.quantity_format % quantity)
+
+    def format_price(self, price):
+        return self.price_format % self.round_price(price)
+
+    def format_quantity(self, quantity):
+        return self.quantity_format % self.round_quantity(quantity)
+
+    def validate(self, quantity, price=None, market=False):
+        """
+        Check an already rounded order against the symbol filters and raise
+        BinanceApiException(INPUT_ERROR) instead of letting the exchange reject it.
+        """
+        if self.status and self.status != "TRADING":
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] " + self.symbol + " is not trading (" + self.status + ")",
+            )
+        min_qty = self.market_min_qty if market and self.market_min_qty else self.min_qty
+        max_qty = self.market_max_qty if market and self.market_max_qty else self.max_qty
+        if quantity is None or quantity <= 0 or quantity < min_qty:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] quantity " + str(quantity) + " is below the minimum "
+                + str(min_qty) + " for " + self.symbol,
+            )
+        if max_qty and quantity > max_qty:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] quantity " + str(quantity) + " is above the maximum "
+                + str(max_qty) + " for " + self.symbol,
+            )
+        if price is None:
+            return
+        if price <= 0 or price < self.min_price or (
+            self.max_price and price > self.max_price
+        ):
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] price " + str(price) + " is not in [" + str(self.min_price)
+                + "," + str(self.max_price) + "] for " + self.symbol,
+            )
+        if self.min_notional and price * quantity < self.min_notional:
+            raise BinanceApiException(
+                BinanceApiException.INPUT_ERROR,
+                "[Input] notional " + str(price * quantity) + " is below the minimum "
+                + str(self.min_notional) + " for " + self.symbol,
+            )
+
+
+class SymbolRulesCache:
+    def __init__(self, ttl=3600, min_refresh_interval=60):
+        """
+        Exchange information cache indexed by symbol.
+
+        :param ttl: Seconds after which the rules are reloaded on next access.
+        :param min_refresh_interval: Minimum seconds between two reloads caused by
+            an unknown symbol, so a typo cannot hammer exchangeInfo.
+        """
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.rules: typing.Dict[str, SymbolRules] = {}
+        self.server_time = 0
+        self.last_refresh = 0.0
+        # The exchangeInfo download in flight, awaited by every concurrent async_load().
+        self.__refresh = None
+
+    def update(self, exchange_information):
+        rules = {}
+        for symbol in exchange_information.symbols:
+            rules[symbol.symbol] = SymbolRules.from_symbol(symbol)
+        self.rules = rules
+        self.server_time = exchange_information.serverTime
+        self.last_refresh = time.monotonic()
+
+    def is_stale(self):
+        return not self.rules or time.monotonic() - self.last_refresh > self.ttl
+
+    def needs_refresh(self, symbol=None):
+        if self.is_stale():
+            return True
+        if symbol is not None and symbol.upper() not in self.rules:
+            return time.monotonic() - self.last_refresh > self.min_refresh_interval
+        return False
+
+    def get(self, symbol) -> typing.Optional[SymbolRules]:
+        return self.rules.get(symbol.upper())
+
+    def load(self, client, symbol=None) -> typing.Optional[SymbolRules]:
+        """Refresh through a sync RequestClient only when needed, then look up."""
+        if self.needs_refresh(symbol):
+            self.update(client.get_exchange_information())
+        if symbol is None:
+            return None
+        return self.get(symbol)
+
+    async def async_load(self, client, symbol=None) -> typing.Optional[SymbolRules]:
+        """
+        Refresh through an AsyncRequestClient only when needed, then look up.
+        Concurrent callers share one exchangeInfo download.
+        """
+        if self.needs_refresh(symbol):
+            if self.__refresh is None:
+                self.__refresh = asyncio.ensure_future(self.__async_refresh(client))
+            # Shielded: a cancelled caller must not cancel the download of the others.
+            await asyncio.shield(self.__refresh)
+        if symbol is None:
+            return None
+        return self.get(symbol)
+
+    async def __async_refresh(self, client):
+        try:
+            self.update(await client.get_exchange_information())
+        finally:
+            self.__refresh = None
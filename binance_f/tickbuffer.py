@@ -0,0 +1,187 @@
+import time
+
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.model.constant import SubscribeMessageType
+
+
+def load_numpy(feature="The tick buffer"):
+    try:
+        import numpy
+    except ImportError:
+        raise BinanceApiException(
+            BinanceApiException.ENV_ERROR,
+            "[Environment] " + feature + " needs numpy: pip install binance-futures[numpy]",
+        )
+    return numpy
+
+
+class TickRing(object):
+    def __init__(self, capacity, numpy=None):
+        """
+        The last capacity trades of one symbol in fixed NumPy columns: time (ms),
+        price, qty, is_buyer_maker and id. Appending overwrites the oldest trade;
+        window queries work on views of the columns without copying them.
+        """
+        numpy = numpy or load_numpy()
+        self.numpy = numpy
+        self.capacity = capacity
+        self.time = numpy.zeros(capacity, dtype=numpy.int64)
+        self.price = numpy.zeros(capacity, dtype=numpy.float64)
+        self.qty = numpy.zeros(capacity, dtype=numpy.float64)
+        self.is_buyer_maker = numpy.zeros(capacity, dtype=numpy.bool_)
+        self.id = numpy.zeros(capacity, dtype=numpy.int64)
+        self.index = 0
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, trade_time, price, qty, is_buyer_maker, trade_id):
+        i = self.index
+        self.time[i] = trade_time
+        self.price[i] = price
+        self.qty[i] = qty
+        self.is_buyer_maker[i] = is_buyer_maker
+        self.id[i] = trade_id
+        self.index = i + 1 if i + 1 < self.capacity else 0
+        self.count += 1
+
+    def segments(self):
+        """Physical (start, end) ranges in chronological order, at most two."""
+        if self.count <= self.capacity:
+            return [(0, self.count)]
+        return [(self.index, self.capacity), (0, self.index)]
+
+    def window(self, seconds=None, now=None):
+        """Slices of the trades within the last seconds (all trades if None), oldest first."""
+        if seconds is None:
+            return [slice(start, end) for start, end in self.segments() if end > start]
+        if now is None:
+            now = int(time.time() * 1000)
+        since = now - int(seconds * 1000)
+        result = list()
+        for start, end in self.segments():
+            if end <= start:
+                continue
+            # Times are ascending within each segment.
+            first = start + int(self.numpy.searchsorted(self.time[start:end], since, side="left"))
+            if first < end:
+                result.append(slice(first, end))
+        return result
+
+    def column(self, name, seconds=None, now=None):
+        """One column of the window; a view when it does not wrap, a copy otherwise."""
+        values = getattr(self, name)
+        parts = [values[part] for part in self.window(seconds, now)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return values[:0]
+        return self.numpy.concatenate(parts)
+
+    def trade_count(self, seconds=None, now=None):
+        return sum(part.stop - part.start for part in self.window(seconds, now))
+
+    def volume(self, seconds=None, now=None):
+        return float(sum(self.qty[part].sum() for part in self.window(seconds, now)))
+
+    def notional(self, seconds=None, now=None):
+        numpy = self.numpy
+        return float(sum(
+            numpy.dot(self.price[part], self.qty[part]) for part in self.window(seconds, now)
+        ))
+
+    def vwap(self, seconds=None, now=None):
+        """Volume weighted average price of the window, None without trades."""
+        parts = self.window(seconds, now)
+        volume = sum(self.qty[part].sum() for part in parts)
+        if not volume:
+            return None
+        numpy = self.numpy
+        return float(sum(numpy.dot(self.price[part], self.qty[part]) for part in parts) / volume)
+
+    def buy_sell_volume(self, seconds=None, now=None):
+        """(taker buy volume, taker sell volume); a buyer maker trade is a taker sell."""
+        buy = sell = 0.0
+        for part in self.window(seconds, now):
+            qty = self.qty[part]
+            sells = self.is_buyer_maker[part]
+            sold = qty[sells].sum()
+            sell += sold
+            buy += qty.sum() - sold
+        return float(buy), float(sell)
+
+    def imbalance(self, seconds=None, now=None):
+        """(buy - sell) / (buy + sell) of taker volume, in [-1, 1]; None without trades."""
+        buy, sell = self.buy_sell_volume(seconds, now)
+        if buy + sell == 0:
+            return None
+        return (buy - sell) / (buy + sell)
+
+    def last_price(self):
+        if self.count == 0:
+            return None
+        return float(self.price[self.index - 1])
+
+
+class TickBuffer(object):
+    def __init__(self, capacity=100000, on_trade=None):
+        """
+        One TickRing per symbol, filled from aggTrade or trade stream frames by
+        parse() without building an event object per trade:
+
+            ticks = TickBuffer()
+            sub_client.subscribe_tick_buffer_event(["btcusdt"], ticks)
+            ticks["BTCUSDT"].vwap(5), ticks["BTCUSDT"].imbalance(5)
+
+        Needs numpy (pip install binance-futures[numpy]).
+
+        :param capacity: Trades kept per symbol.
+        :param on_trade: Called with the symbol's TickRing after each trade.
+        """
+        self.numpy = load_numpy()
+        self.capacity = capacity
+        self.on_trade = on_trade
+        self.rings = dict()
+
+    def __getitem__(self, symbol):
+        return self.ring(symbol)
+
+    def ring(self, symbol):
+        ring = self.rings.get(symbol)
+        if ring is None:
+            ring = self.rings[symbol] = TickRing(self.capacity, self.numpy)
+        return ring
+
+    def parse(self, json_wrapper):
+        """json_parser for a trade stream: append the frame and return the symbol's TickRing."""
+        data = json_wrapper.json_object
+        event_type = data.get("e")
+        if event_type == "aggTrade":
+            trade_id = data["a"]
+        elif event_type == "trade":
+            trade_id = data["t"]
+        else:
+            return None
+        ring = self.ring(data["s"])
+        ring.append(data["T"], float(data["p"]), float(data["q"]), data["m"], trade_id)
+        return ring
+
+    def on_event(self, event):
+        """Append an AggregateTradeEvent from an existing subscription."""
+        ring = self.ring(event.symbol)
+        ring.append(event.time, event.price, event.qty, event.isBuyerMaker, event.id)
+        return ring
+
+    def callback(self, data_type, event):
+        """
+        Subscription callback. Frames parsed by parse() arrive as the TickRing already
+        holding the trade; AggregateTradeEvent from subscribe_aggregate_trade_event
+        is appended here.
+        """
+        if data_type != SubscribeMessageType.PAYLOAD or event is None:
+            return
+        if not isinstance(event, TickRing):
+            event = self.on_event(event)
+        if self.on_trade is not None:
+            self.on_trade(event)
@@ -0,0 +1,43 @@
+import logging
+from binance_f import SubscriptionClient
+from binance_f.constant.test import *
+from binance_f.model import *
+from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.klineaggregator import KlineAggregator
+
+logger = logging.getLogger("binance-futures")
+logger.setLevel(level=logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+logger.addHandler(handler)
+
+sub_client = SubscriptionClient(api_key=g_api_key, secret_key=g_secret_key)
+
+
+def on_close(candlestick: "Candlestick"):
+    print("Closed", candlestick.symbol, candlestick.interval, candlestick.startTime)
+    print(candlestick.__dict__)
+    print()
+
+
+def error(e: "BinanceApiException"):
+    print(e.error_code + e.error_message)
+
+
+# One 1m socket instead of one per interval: 5m, 15m, 1h, 4h and 1d are built locally.
+aggregator = KlineAggregator(
+    on_close=on_close,
+    intervals=[
+        CandlestickInterval.MIN5,
+        CandlestickInterval.MIN15,
+        CandlestickInterval.HOUR1,
+        CandlestickInterval.HOUR4,
+        CandlestickInterval.DAY1,
+    ],
+)
+
+sub_client.subscribe_candlestick_event(
+    "btcusdt", CandlestickInterval.MIN1, aggregator.callback, error
+)
@@ -0,0 +1,21 @@
+"""
+Funding rate and premium of every perpetual from one all-market stream, screened
+with vectorized queries after each update.
+"""
+from binance_f import SubscriptionClient
+from binance_f.constant.test import *
+from binance_f.fundingscanner import FundingScanner
+
+
+def on_update(scanner: "FundingScanner"):
+    print("highest funding:", scanner.top(5, "annualized_funding", absolute=True, max_age=10))
+    print("premium above 0.1%:", scanner.where("premium", above=0.001, max_age=10))
+    print()
+
+
+def error(e: "BinanceApiException"):
+    print(e.error_code + e.error_message)
+
+
+sub_client = SubscriptionClient(api_key=g_api_key, secret_key=g_secret_key)
+sub_client.subscribe_funding_scanner_event(FundingScanner(on_update=on_update), error, update_speed="1s")
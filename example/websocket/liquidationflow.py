@@ -0,0 +1,23 @@
+"""
+Liquidations of every symbol in rolling 1s/10s/1m windows, printed only when a
+window crosses its notional threshold.
+"""
+from binance_f import SubscriptionClient
+from binance_f.constant.test import *
+from binance_f.liquidationflow import LiquidationFlow, LiquidationAlert
+
+
+def on_alert(alert: "LiquidationAlert"):
+    state = "above" if alert.above else "back below"
+    print("%s %s liquidations %s %.0f in %ss: %.0f over %d orders" % (
+        alert.symbol, alert.side, state, alert.threshold, alert.window, alert.notional, alert.count
+    ))
+
+
+def error(e: "BinanceApiException"):
+    print(e.error_code + e.error_message)
+
+
+flow = LiquidationFlow(thresholds={1: 250000, 10: 1000000, 60: 5000000}, on_alert=on_alert)
+sub_client = SubscriptionClient(api_key=g_api_key, secret_key=g_secret_key)
+sub_client.subscribe_liquidation_flow_event(flow, error_handler=error)
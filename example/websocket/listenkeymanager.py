@@ -0,0 +1,32 @@
+"""
+User data stream kept alive from timers on the event loop: the listen key is
+refreshed every 30 minutes and replaced in place when it expires.
+"""
+import asyncio
+
+from binance_f import AsyncRequestClient
+from binance_f.constant.test import *
+from binance_f.listenkey import ListenKeyManager
+from binance_f.model.constant import SubscribeMessageType
+
+
+def callback(data_type: "SubscribeMessageType", event: "any"):
+    if data_type == SubscribeMessageType.PAYLOAD:
+        print(event.eventType, event.__dict__)
+
+
+def error(e: "BinanceApiException"):
+    print(e.error_code + e.error_message)
+
+
+async def main():
+    client = AsyncRequestClient(api_key=g_api_key, secret_key=g_secret_key)
+    manager = ListenKeyManager(client, callback, error)
+    await manager.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await manager.close()
+
+
+asyncio.run(main())
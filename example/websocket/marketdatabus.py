@@ -0,0 +1,47 @@
+"""
+One feed-handler process owns the websocket and publishes into shared memory;
+strategy processes attach by name and read without opening sockets.
+
+    python marketdatabus.py publish
+    python marketdatabus.py consume      # in as many processes as needed
+"""
+import sys
+import time
+
+from binance_f import SubscriptionClient
+from binance_f.constant.test import *
+from binance_f.marketdatabus import MarketDataBus, MarketDataPublisher
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+
+
+def error(e: "BinanceApiException"):
+    print(e.error_code + e.error_message)
+
+
+def publish():
+    publisher = MarketDataPublisher(SYMBOLS, replace=True)
+    sub_client = SubscriptionClient(api_key=g_api_key, secret_key=g_secret_key)
+    try:
+        publisher.subscribe(sub_client, error)
+    finally:
+        publisher.close()
+
+
+def consume():
+    bus = MarketDataBus()
+    while True:
+        for symbol in bus.symbols:
+            ticker = bus.book_ticker(symbol)
+            if ticker is not None:
+                print(symbol, "bid", ticker.bestBidPrice, "ask", ticker.bestAskPrice)
+        for trade in bus.read_trades():
+            print(trade.symbol, "trade", trade.price, trade.qty)
+        time.sleep(1)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["publish"]:
+        publish()
+    else:
+        consume()
@@ -5,6 +5,7 @@ setup(
     name="binance-futures",
     version="1.0.1",
     packages=['binance_f', 'binance_f.impl', 'binance_f.impl.utils', 'binance_f.exception', 'binance_f.model', 'binance_f.base', 'binance_f.constant'],
-    install_requires=['requests', 'apscheduler', 'websocket-client','httpx>=0.10.0', 'urllib3']
+    install_requires=['requests', 'apscheduler', 'websocket-client','httpx>=0.10.0', 'urllib3'],
+    extras_require={'http2': ['h2>=3,<5'], 'numpy': ['numpy']}
 )
 
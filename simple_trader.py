@@ -2,16 +2,19 @@ import asyncio
 import functools
 import logging
 import os
+import threading
 import typing
-import json
 
 import binance_f
 from binance_f.model import constant, order, orderupdate, position
 from binance_f.subscriptionclient import HelperMixin
 from binance_f.exception.binanceapiexception import BinanceApiException
+from binance_f.impl.responsecache import ResponseCache
+from binance_f.listenkey import ListenKeyManager
+from binance_f.notifier import WebsocketPublisher
+from binance_f.symbolrules import SymbolRulesCache
 from bot import ThreadLogic
 from socket_client import ServerSocketManager
-from websocket import create_connection
 
 logger = logging.getLogger("binance-futures")
 logger.setLevel(level=logging.INFO)
@@ -23,6 +26,11 @@ handler.setFormatter(
 )
 logger.addHandler(handler)
 
+# Shared by every TradeHelper so exchangeInfo is downloaded once per ttl.
+symbol_rules_cache = SymbolRulesCache()
+# Lets the gathered calls of one update cycle share identical market data requests.
+market_data_cache = ResponseCache()
+
 
 class BotController:
     def __init__(
@@ -41,20 +49,29 @@ class BotController:
         )
         self.params = dict(api_key=api_key, api_secret=api_secret, **kwargs)
         self.last_action = None
-        self.listen_key = self.client.start_user_data_stream()
-        self.counter = 0
+        # Refreshed and replaced on the background loop, see start_account_servers.
+        self.listen_keys = ListenKeyManager(
+            binance_f.AsyncRequestClient(
+                api_key=api_key, secret_key=api_secret, debug=False
+            ),
+            self.callback,
+            self.error,
+        )
         self.interval = interval
         self.url = url
+        # One connection to the controller for every notification.
+        self.publisher = WebsocketPublisher(url + "config")
         self.thread_logic = ThreadLogic()
+        self.event_loop = None
+        # Set by stop(); start() blocks on it instead of spinning.
+        self.stopped = threading.Event()
 
     @property
     def helper(self):
         return TradeHelper(**self.params)
 
     def notify_controller(self, data):
-        ws = create_connection(self.url + "config")
-        ws.send(json.dumps(data))
-        ws.close()
+        self.publisher.publish(data)
 
     def callback(
         self, data_type: "SubscribeMessageType", event: orderupdate.OrderUpdate
@@ -73,11 +90,8 @@ class BotController:
                     self.notify_controller({"action": "cancelled"})
 
             elif event.eventType == "listenKeyExpired":
-                logger.info("Event: %s" % event.eventType)
-                logger.info("Event time: %s" % event.eventTime)
-                logger.info("CAUTION: YOUR LISTEN-KEY HAS BEEN EXPIRED!!!")
-                logger.info("CAUTION: YOUR LISTEN-KEY HAS BEEN EXPIRED!!!")
-                logger.info("CAUTION: YOUR LISTEN-KEY HAS BEEN EXPIRED!!!")
+                # The manager has already requested a new key and resubscribed.
+                logger.info("Listen key expired at %s, renewed" % event.eventTime)
 
         else:
             logger.info("Unknown Data:")
@@ -90,26 +104,22 @@ class BotController:
     def queue(self):
         return self.thread_logic.queue
 
-    def running_callback(self):
-        self.counter += self.interval
-        logger.info("Counter current count %s" % self.counter)
-        time.sleep(1 * self.interval)
-        # while not self.queue.empty():
-        #     item = self.queue.get()
-        #     self.notify_controller(item)
-
-        time.sleep(1 * self.interval)
-        if self.counter == 60 * 50:
-            logger.info("Update listen_key after 50 minutes")
-            self.client.keep_user_data_stream()
-            self.counter = 0
-
     def start_account_servers(self, loop, **kwargs):
         self.event_loop = loop
         asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.start_listen_keys())
         loop.run_until_complete(self.start_server_socket(loop, self.thread_logic.queue))
         loop.run_forever()
 
+    async def start_listen_keys(self):
+        while True:
+            try:
+                return await self.listen_keys.start()
+            except BinanceApiException as e:
+                self.error(e)
+                logger.info("Sleeping for 60 seconds")
+                await asyncio.sleep(60 * 1)
+
     async def start_server_socket(self, loop, server_queue):
         self.manager = ServerSocketManager(url=self.url, loop=loop)
         logger.info("Application websocket server started")
@@ -119,30 +129,30 @@ class BotController:
         # await self.manager.start_socket("config", new_server_response)
 
     def start(self):
-        try:
-            self.thread_logic.start(self.start_account_servers, "background_thread")
-            self.sub_client.subscribe_user_data_event(
-                self.listen_key,
-                self.callback,
-                self.error,
-                running_callback=self.running_callback,
-            )
-        except BinanceApiException as e:
-            logger.info("Sleeping for 10 seconds")
-            time.sleep(60 * 1)
-            self.listen_key = self.client.start_user_data_stream()
-            self.start()
+        self.thread_logic.start(self.start_account_servers, "background_thread")
         # self.sub_client.subscribe_mark_price_event(
         #     "btcusdt", self.callback, self.error, running_callback=self.long_callback
         # )
-        while True:
+        try:
+            self.stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self.stopped.set()
+
+    def shutdown(self):
+        loop = self.event_loop
+        if loop is not None and loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.listen_keys.close(), loop)
             try:
-                pass
-            except KeyboardInterrupt:
-                break
-                pass
-            except Exception:
-                break
+                future.result(timeout=10)
+            except Exception as e:
+                logger.warning("listen key close failed: %s", e)
+            loop.call_soon_threadsafe(loop.stop)
+        self.publisher.close()
 
     async def on_server_response(self, data):
         logger.info(data)
@@ -207,9 +217,12 @@ class TradeHelper(HelperMixin):
         maximum_quantity=5,
         slow_market_multiplier=1,
         owner=None,
+        rules_cache=symbol_rules_cache,
+        response_cache=market_data_cache,
         **kwargs,
     ):
         self.mark_price = mark_price
+        self.rules_cache = rules_cache
         self.owner = owner
         self.maximum_quantity = maximum_quantity
         self.places = places
@@ -221,7 +234,10 @@ class TradeHelper(HelperMixin):
         self.market = buy_market
         self.budget = budget
         self.client = binance_f.AsyncRequestClient(
-            api_key=api_key, secret_key=api_secret, debug=True
+            api_key=api_key,
+            secret_key=api_secret,
+            debug=True,
+            response_cache=response_cache,
         )
         self.trades: typing.Dict[str, typing.List[order.Order]] = {
             "open": [],